@@ -2,10 +2,15 @@
 
 # Register your models here.
 from django.contrib import admin
-from .models import Designation, Employee, FeedbackQuestion, FeedbackSubmission, FeedbackAnswer
+from .models import Department, Designation, Employee, FeedbackQuestion, FeedbackSubmission, FeedbackAnswer, FeedbackRatingRollup, BackgroundJob, FeedbackArchive, FeedbackChange
 
 admin.site.register(Designation)
+admin.site.register(Department)
 admin.site.register(Employee)
 admin.site.register(FeedbackQuestion)
 admin.site.register(FeedbackSubmission)
 admin.site.register(FeedbackAnswer)
+admin.site.register(FeedbackRatingRollup)
+admin.site.register(BackgroundJob)
+admin.site.register(FeedbackArchive)
+admin.site.register(FeedbackChange)
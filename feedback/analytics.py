@@ -0,0 +1,124 @@
+import math
+
+from django.db.models import Count, Sum
+
+from .archive import archive_watermark
+from .filters import filter_feedback_submissions
+from .models import Employee, FeedbackAnswer, FeedbackQuestion, FeedbackRatingRollup
+from .rollups import HISTOGRAM_FIELDS, RATING_VALUES
+
+PERCENTILES = (10, 25, 75, 90)
+
+# group_by -> (lookup from FeedbackAnswer, lookup from FeedbackRatingRollup)
+GROUP_LOOKUPS = {
+    'employee': ('submission__target_employee_id', 'target_employee_id'),
+    'designation': ('submission__target_employee__designation__name', 'target_employee__designation__name'),
+    'department': ('submission__target_employee__department_ref__name', 'target_employee__department_ref__name'),
+    'question': ('question_id', 'question_id'),
+}
+
+FILTER_KEYS = ('designation', 'department', 'start_date', 'end_date', 'max_average_rating', 'max_rating')
+
+
+def rating_histograms(group_by, params):
+    """
+    Return ({group_key: [n1, n2, n3, n4, n5]}, source).
+
+    Histograms cover live feedback only: submissions moved to the archive
+    by archive_feedback are not counted, whichever source is used. With no
+    filters they come from the rollup table, skipping the rollup days
+    before the archive watermark; otherwise a single GROUP BY (group,
+    rating) over the filtered answers is used. Either way the database
+    returns at most five rows per group.
+    """
+    answer_lookup, rollup_lookup = GROUP_LOOKUPS[group_by]
+
+    if not any(params.get(key) for key in FILTER_KEYS):
+        rollups = FeedbackRatingRollup.objects.all()
+        watermark = archive_watermark()
+        if watermark:
+            rollups = rollups.filter(day__gte=watermark)
+        rows = (
+            rollups
+            .values(rollup_lookup)
+            .annotate(**{field: Sum(field) for field in HISTOGRAM_FIELDS})
+            .order_by()
+        )
+        histograms = {
+            row[rollup_lookup]: [row[field] or 0 for field in HISTOGRAM_FIELDS]
+            for row in rows
+        }
+        return histograms, 'rollups'
+
+    qs = filter_feedback_submissions(FeedbackAnswer.objects.all(), params, prefix='submission__')
+    rows = qs.values_list(answer_lookup, 'rating').annotate(n=Count('id')).order_by()
+    histograms = {}
+    for key, rating, n in rows:
+        if rating in RATING_VALUES:
+            histograms.setdefault(key, [0] * len(RATING_VALUES))[rating - 1] += n
+    return histograms, 'answers'
+
+
+def _value_at_rank(histogram, rank):
+    """Rating at 1-based position `rank` of the sorted ratings."""
+    seen = 0
+    for value, n in zip(RATING_VALUES, histogram):
+        seen += n
+        if seen >= rank:
+            return value
+    return RATING_VALUES[-1]
+
+
+def histogram_stats(histogram):
+    """Exact summary statistics of a 1-5 rating histogram."""
+    n = sum(histogram)
+    if not n:
+        return None
+
+    mean = sum(value * count for value, count in zip(RATING_VALUES, histogram)) / n
+    variance = sum(count * (value - mean) ** 2 for value, count in zip(RATING_VALUES, histogram)) / n
+    if n % 2:
+        median = _value_at_rank(histogram, (n + 1) // 2)
+    else:
+        median = (_value_at_rank(histogram, n // 2) + _value_at_rank(histogram, n // 2 + 1)) / 2
+
+    return {
+        'count': n,
+        'mean': round(mean, 4),
+        'median': median,
+        'std_dev': round(math.sqrt(variance), 4),
+        'percentiles': {
+            f'p{p}': _value_at_rank(histogram, max(1, math.ceil(p / 100 * n)))
+            for p in PERCENTILES
+        },
+        'histogram': {str(value): count for value, count in zip(RATING_VALUES, histogram)},
+    }
+
+
+def _group_labels(group_by, keys):
+    if group_by == 'employee':
+        employees = Employee.objects.filter(id__in=[k for k in keys if k is not None]).values_list(
+            'id', 'employee_code', 'user__username', 'user__first_name', 'user__last_name'
+        )
+        return {
+            pk: f"{' '.join(filter(None, (first, last))) or username} ({code})"
+            for pk, code, username, first, last in employees
+        }
+    if group_by == 'question':
+        return dict(FeedbackQuestion.objects.filter(id__in=keys).values_list('id', 'text'))
+    return {key: key for key in keys}
+
+
+def build_scorecard(group_by, params):
+    histograms, source = rating_histograms(group_by, params)
+    labels = _group_labels(group_by, list(histograms))
+
+    results = []
+    for key, histogram in histograms.items():
+        stats = histogram_stats(histogram)
+        if stats is None:
+            continue
+        results.append({'key': key, 'label': labels.get(key, key), **stats})
+    results.sort(key=lambda row: (row['key'] is None, str(row['label'])))
+
+    return {'group_by': group_by, 'source': source, 'results': results}
@@ -6,3 +6,5 @@ class FeedbackConfig(AppConfig):
 
     def ready(self):
         import feedback.signals
+        # Hooks the SQL execute wrapper into connections opened from now on.
+        import feedback.metrics
@@ -0,0 +1,300 @@
+"""
+Columnar cold storage for old feedback.
+
+An archive is a directory of flat column files, one value per row in
+native byte order, plus a manifest:
+
+- Submission columns: submission_id, created_at (microseconds since the
+  epoch, UTC), submitted_by_id and target_employee_id (-1 for none), all
+  int64. answer_start (int64, one extra entry) gives each submission's
+  slice of the answer columns.
+- Answer columns: question_id (int64), rating (uint8) and comment_length
+  (uint32).
+- comments.z: the UTF-8 comments, zlib-compressed in blocks of
+  COMMENT_BLOCK answers. comment_blocks (int64) holds each block's byte
+  offset.
+
+Rows are in (created_at, id) order, so the reader memory-maps the columns
+and finds a time range with two binary searches, decompressing only the
+comment blocks it returns.
+"""
+import array
+import json
+import os
+import sys
+import threading
+import zlib
+from bisect import bisect_left
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from itertools import accumulate
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import FeedbackAnswer, FeedbackArchive
+
+ARCHIVE_FORMAT_VERSION = 1
+COMMENT_BLOCK = 1024
+NO_TARGET = -1
+
+COLUMNS = {
+    'submission_id': 'q',
+    'created_at': 'q',
+    'submitted_by_id': 'q',
+    'target_employee_id': 'q',
+    'answer_start': 'q',
+    'question_id': 'q',
+    'rating': 'B',
+    'comment_length': 'I',
+    'comment_blocks': 'q',
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def archive_dir():
+    return Path(settings.FEEDBACK_ARCHIVE_DIR)
+
+
+def start_of_day(day):
+    """Aware local midnight at the start of `day`, matching the rollups' TruncDate days."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def archive_watermark():
+    """Every submission created before this date has been archived (None if nothing has)."""
+    archives = FeedbackArchive.objects.filter(state__in=FeedbackArchive.READABLE_STATES)
+    return archives.aggregate(before=Max('before'))['before']
+
+
+def _to_micros(value):
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value):
+    return _EPOCH + value * _MICROSECOND
+
+
+class _ColumnWriter:
+    def __init__(self, path, typecode):
+        self.handle = open(path, 'wb')
+        self.values = array.array(typecode)
+
+    def append(self, value):
+        self.values.append(value)
+        if len(self.values) >= 65536:
+            self.flush()
+
+    def flush(self):
+        self.values.tofile(self.handle)
+        del self.values[:]
+
+    def close(self):
+        self.flush()
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+        self.handle.close()
+
+
+class ArchiveWriter:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True)
+        self.columns = {name: _ColumnWriter(self.path / f'{name}.col', code) for name, code in COLUMNS.items()}
+        self.comments = open(self.path / 'comments.z', 'wb')
+        self.comment_bytes = 0
+        self.pending_comments = []
+        self.submissions = 0
+        self.answers = 0
+        self.first_created_at = None
+        self.last_created_at = None
+        self.columns['answer_start'].append(0)
+        self.columns['comment_blocks'].append(0)
+
+    def add(self, submission_id, created_at, submitted_by_id, target_employee_id, answers):
+        """Append one submission; `answers` are (question_id, rating, comment) tuples."""
+        columns = self.columns
+        columns['submission_id'].append(submission_id)
+        columns['created_at'].append(_to_micros(created_at))
+        columns['submitted_by_id'].append(submitted_by_id)
+        columns['target_employee_id'].append(NO_TARGET if target_employee_id is None else target_employee_id)
+        for question_id, rating, comment in answers:
+            encoded = comment.encode('utf-8')
+            columns['question_id'].append(question_id)
+            columns['rating'].append(rating)
+            columns['comment_length'].append(len(encoded))
+            self.pending_comments.append(encoded)
+            self.answers += 1
+            if len(self.pending_comments) == COMMENT_BLOCK:
+                self._flush_comments()
+        columns['answer_start'].append(self.answers)
+
+        self.submissions += 1
+        if self.first_created_at is None:
+            self.first_created_at = created_at
+        self.last_created_at = created_at
+
+    def _flush_comments(self):
+        block = zlib.compress(b''.join(self.pending_comments), 6)
+        self.comments.write(block)
+        self.comment_bytes += len(block)
+        self.columns['comment_blocks'].append(self.comment_bytes)
+        self.pending_comments = []
+
+    def close(self, **manifest):
+        if self.pending_comments:
+            self._flush_comments()
+        for column in self.columns.values():
+            column.close()
+        self.comments.flush()
+        os.fsync(self.comments.fileno())
+        self.comments.close()
+
+        manifest.update({
+            'format_version': ARCHIVE_FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'columns': {name: [code, array.array(code).itemsize] for name, code in COLUMNS.items()},
+            'comment_block': COMMENT_BLOCK,
+            'submissions': self.submissions,
+            'answers': self.answers,
+            'first_created_at': self.first_created_at.isoformat() if self.first_created_at else None,
+            'last_created_at': self.last_created_at.isoformat() if self.last_created_at else None,
+        })
+        with open(self.path / 'manifest.json', 'w') as handle:
+            json.dump(manifest, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+def write_archive(submissions, path, chunk_size=2000, **manifest):
+    """
+    Write the FeedbackSubmission queryset `submissions`, with answers, to a
+    new archive directory at `path`. Returns the closed ArchiveWriter.
+    """
+    writer = ArchiveWriter(path)
+    rows = (
+        submissions.order_by('created_at', 'id')
+        .values_list('id', 'created_at', 'submitted_by_id', 'target_employee_id')
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            _write_chunk(writer, chunk)
+            chunk = []
+    if chunk:
+        _write_chunk(writer, chunk)
+    writer.close(**manifest)
+    return writer
+
+
+def _write_chunk(writer, chunk):
+    answers = {row[0]: [] for row in chunk}
+    for submission_id, *answer in (
+        FeedbackAnswer.objects.filter(submission_id__in=list(answers))
+        .order_by('submission_id', 'id')
+        .values_list('submission_id', 'question_id', 'rating', 'comment')
+    ):
+        answers[submission_id].append(answer)
+    for submission_id, created_at, submitted_by_id, target_employee_id in chunk:
+        writer.add(submission_id, created_at, submitted_by_id, target_employee_id, answers[submission_id])
+
+
+class ArchiveReader:
+    """Read-only, memory-mapped view of one archive directory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / 'manifest.json') as handle:
+            self.manifest = json.load(handle)
+        if self.manifest['format_version'] != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f"{self.path}: unsupported archive format {self.manifest['format_version']}")
+        if self.manifest['byteorder'] != sys.byteorder:
+            raise ValueError(f"{self.path}: archive was written on a {self.manifest['byteorder']}-endian machine")
+
+        self.columns = {name: self._map(self.path / f'{name}.col', code) for name, code in COLUMNS.items()}
+        self.comments = self._map(self.path / 'comments.z', 'B')
+        self._comment_block = lru_cache(maxsize=64)(self._read_comment_block)
+
+    @staticmethod
+    def _map(path, typecode):
+        with open(path, 'rb') as handle:
+            if not os.fstat(handle.fileno()).st_size:
+                return memoryview(b'').cast(typecode)
+            # The mapping stays valid after the file is closed.
+            return memoryview(mmap(handle.fileno(), 0, access=ACCESS_READ)).cast(typecode)
+
+    def __len__(self):
+        return len(self.columns['submission_id'])
+
+    def _read_comment_block(self, block):
+        """The decompressed block and the offset of each of its comments in it."""
+        offsets = self.columns['comment_blocks']
+        lengths = self.columns['comment_length'][block * COMMENT_BLOCK:(block + 1) * COMMENT_BLOCK]
+        return zlib.decompress(self.comments[offsets[block]:offsets[block + 1]]), [0, *accumulate(lengths)]
+
+    def comment(self, index):
+        if not self.columns['comment_length'][index]:
+            return ''
+        block, position = divmod(index, COMMENT_BLOCK)
+        text, offsets = self._comment_block(block)
+        return text[offsets[position]:offsets[position + 1]].decode('utf-8')
+
+    def submission_range(self, start=None, end=None):
+        """Row positions of submissions with start <= created_at < end."""
+        created = self.columns['created_at']
+        low = bisect_left(created, _to_micros(start)) if start else 0
+        high = bisect_left(created, _to_micros(end)) if end else len(created)
+        return range(low, max(low, high))
+
+    def iter_submissions(self, start=None, end=None, submitted_by=None, target_employee=None, question=None):
+        """
+        Yield submissions in created_at order as dicts shaped like the export
+        rows. With `question`, only answers to that question are included and
+        submissions without one are skipped.
+        """
+        columns = self.columns
+        answer_start = columns['answer_start']
+        for row in self.submission_range(start, end):
+            if submitted_by is not None and columns['submitted_by_id'][row] != submitted_by:
+                continue
+            target = columns['target_employee_id'][row]
+            if target_employee is not None and target != target_employee:
+                continue
+            answers = [
+                {
+                    'question_id': columns['question_id'][index],
+                    'rating': columns['rating'][index],
+                    'comment': self.comment(index),
+                }
+                for index in range(answer_start[row], answer_start[row + 1])
+                if question is None or columns['question_id'][index] == question
+            ]
+            if question is not None and not answers:
+                continue
+            yield {
+                'id': columns['submission_id'][row],
+                'created_at': _from_micros(columns['created_at'][row]),
+                'submitted_by_id': columns['submitted_by_id'][row],
+                'target_employee_id': None if target == NO_TARGET else target,
+                'answers': answers,
+            }
+
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+
+def open_archive(label):
+    """Process-wide cached reader for the archive called `label`."""
+    with _readers_lock:
+        reader = _readers.get(label)
+        if reader is None:
+            reader = _readers[label] = ArchiveReader(archive_dir() / label)
+        return reader
@@ -0,0 +1,131 @@
+"""
+Async (ASGI) variants of the read-only endpoints.
+
+DRF views are synchronous, so under ASGI each request holds a worker thread
+for its whole lifetime, including time spent waiting on slow clients. These
+plain Django async views authenticate the JWT themselves and use the async
+ORM, so a waiting request costs a coroutine instead of a thread. They return
+the same payloads as their DRF counterparts.
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .authentication import CachedJWTAuthentication
+from .listings import abuild_submission_listing, listing_rows
+from .live import LiveFilter, stream_events
+from .models import Designation, Employee, FeedbackQuestion, FeedbackSubmission
+from .pagination import SubmissionCursorPagination
+from .serializers import (
+    DesignationSerializer, EmployeeSerializer, FeedbackLiveFilterSerializer, FeedbackQuestionSerializer,
+)
+
+_jwt = CachedJWTAuthentication()
+
+
+class _NotAuthenticated(Exception):
+    pass
+
+
+async def _authenticate(request):
+    """
+    Resolve the bearer token to an active User, or raise _NotAuthenticated.
+    Runs the DRF authenticator, so the user cache and the inactive/revoked
+    token checks are the same as on the sync endpoints.
+    """
+    try:
+        result = await sync_to_async(_jwt.authenticate)(request)
+    except InvalidToken:
+        raise _NotAuthenticated("Given token not valid for any token type")
+    if result is None:
+        raise _NotAuthenticated("Authentication credentials were not provided.")
+    return result[0]
+
+
+def _async_api_view(view):
+    """Authenticate the request and turn auth/API errors into DRF-shaped JSON responses."""
+    async def wrapped(request, *args, **kwargs):
+        try:
+            request.user = await _authenticate(request)
+            return await view(request, *args, **kwargs)
+        except _NotAuthenticated as exc:
+            return JsonResponse({'detail': str(exc)}, status=401)
+        except APIException as exc:
+            # simplejwt's AuthenticationFailed carries {'detail', 'code'}, as DRF renders it.
+            detail = exc.detail if isinstance(exc.detail, dict) else {'detail': str(exc.detail)}
+            return JsonResponse(detail, status=exc.status_code)
+    return require_GET(wrapped)
+
+
+@_async_api_view
+async def question_list(request):
+    qs = FeedbackQuestion.objects.filter(is_active=True)
+    ftype = request.GET.get('type') or request.GET.get('feedback_type')
+    if ftype:
+        qs = qs.filter(feedback_type=ftype)
+    data = [FeedbackQuestionSerializer(question).data async for question in qs.aiterator()]
+    return JsonResponse(data, safe=False)
+
+
+@_async_api_view
+async def employee_list(request):
+    qs = Employee.objects.select_related('user', 'designation').order_by('id')
+    data = [EmployeeSerializer(employee).data async for employee in qs.aiterator()]
+    return JsonResponse(data, safe=False)
+
+
+@_async_api_view
+async def designation_list(request):
+    qs = Designation.objects.all().order_by('id')
+    data = [DesignationSerializer(designation).data async for designation in qs.aiterator()]
+    return JsonResponse(data, safe=False)
+
+
+@_async_api_view
+async def my_feedback_list(request):
+    employee_id = request.GET.get('employee_id')
+    if not employee_id:
+        employee_id = await Employee.objects.filter(user_id=request.user.id).values_list('id', flat=True).afirst()
+    if employee_id is None:
+        qs = FeedbackSubmission.objects.none()
+    else:
+        qs = FeedbackSubmission.objects.filter(submitted_by__id=employee_id)
+
+    paginator = SubmissionCursorPagination()
+    try:
+        page = await paginator.apaginate_queryset(listing_rows(qs), Request(request))
+    except NotFound as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=404)
+    return JsonResponse({
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'results': await abuild_submission_listing(page),
+    })
+
+
+@_async_api_view
+async def feedback_stream(request):
+    """
+    Server-sent events for new submissions matching the admin filter query
+    parameters (see feedback.live). Each `submission` event carries a row
+    shaped like the admin filter results, and its id is a change feed cursor.
+    Only served under ASGI: a WSGI worker would be held for the whole stream.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'detail': "You do not have permission to perform this action."}, status=403)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': "Event streams are only served through the ASGI application."}, status=501)
+    serializer = FeedbackLiveFilterSerializer(data=request.GET)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    events = stream_events(LiveFilter(serializer.validated_data), request.headers.get('Last-Event-ID'))
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,94 @@
+import atexit
+import copy
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .catalogue import USERS, VersionedCache, current_version
+
+_user_cache = VersionedCache(max_entries=10000, ttl=60)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from a short-lived
+    process-local cache instead of loading the User row on every request.
+    Entries are dropped when any user is deactivated, deleted or changes
+    password (see the 'users' catalogue version).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        cached = _user_cache.get_or_build(
+            user_id, current_version(USERS), lambda: super(CachedJWTAuthentication, self).get_user(validated_token)
+        )
+
+        # The cached user was checked against the token that loaded it; check this one too.
+        if api_settings.CHECK_USER_IS_ACTIVE and not cached.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(cached.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        # Each request gets its own copy so relation caches are not shared.
+        return copy.copy(cached)
+
+
+class LastLoginBuffer:
+    """
+    Collects last_login timestamps and writes them in one UPDATE per flush,
+    either when `max_pending` users are waiting or `flush_seconds` after the
+    first pending login, so logins do not each take the database write lock.
+    """
+
+    def __init__(self, max_pending=500, flush_seconds=5.0):
+        self.max_pending = max_pending
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+
+    def record(self, user):
+        user.last_login = timezone.now()
+        with self._lock:
+            self._pending[user.pk] = user.last_login
+            full = len(self._pending) >= self.max_pending
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if pending:
+            User.objects.bulk_update(
+                [User(pk=pk, last_login=last_login) for pk, last_login in pending.items()],
+                ['last_login'],
+            )
+
+    def _flush_in_thread(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+
+last_login_buffer = LastLoginBuffer()
+atexit.register(last_login_buffer.flush)
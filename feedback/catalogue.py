@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+
+from .models import CatalogueVersion, FeedbackQuestion
+
+QUESTIONS = 'questions'
+USERS = 'users'
+DESIGNATIONS = 'designations'
+EMPLOYEES = 'employees'
+
+# How stale another worker's bump may be before this process notices it.
+VERSION_POLL_SECONDS = 1.0
+
+
+class _VersionMemo:
+    """Process-local copy of CatalogueVersion, refreshed at most once per poll interval."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._checked_at = float('-inf')
+
+    def get(self, name):
+        if time.monotonic() - self._checked_at >= VERSION_POLL_SECONDS:
+            # Always the primary: a lagging reporting snapshot would report old versions.
+            versions = dict(CatalogueVersion.objects.using(DEFAULT_DB_ALIAS).values_list('name', 'version'))
+            with self._lock:
+                self._versions = versions
+                self._checked_at = time.monotonic()
+        return self._versions.get(name, 0)
+
+    def expire(self):
+        self._checked_at = float('-inf')
+
+
+_versions = _VersionMemo()
+
+
+def current_version(name):
+    return _versions.get(name)
+
+
+def bump_version(name):
+    """Mark catalogue `name` as changed. Call inside the writing transaction."""
+    if not CatalogueVersion.objects.filter(name=name).update(version=F('version') + 1):
+        CatalogueVersion.objects.get_or_create(name=name)
+        CatalogueVersion.objects.filter(name=name).update(version=F('version') + 1)
+    transaction.on_commit(_versions.expire)
+
+
+class VersionedCache:
+    """
+    Bounded LRU of values tagged with the catalogue version they were built
+    from. An entry is served only while its version is current and it is
+    younger than `ttl` seconds.
+    """
+
+    def __init__(self, max_entries=64, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get_or_build(self, key, version, build):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[1] > now:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        value = build()
+        with self._lock:
+            self._entries[key] = (version, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_question_cache = VersionedCache(max_entries=16, ttl=300)
+
+
+def active_questions(feedback_type=None):
+    """Active questions in display order, optionally of one feedback_type."""
+    def build():
+        qs = FeedbackQuestion.objects.using(DEFAULT_DB_ALIAS).filter(is_active=True)
+        if feedback_type:
+            qs = qs.filter(feedback_type=feedback_type)
+        return tuple(qs)
+    return _question_cache.get_or_build(('list', feedback_type), current_version(QUESTIONS), build)
+
+
+def active_question_map():
+    """{id: question} for every active question."""
+    def build():
+        return {question.id: question for question in active_questions()}
+    return _question_cache.get_or_build(('map',), current_version(QUESTIONS), build)
@@ -0,0 +1,160 @@
+"""
+Change feed for feedback submissions and answers.
+
+Every creation, update and deletion is appended to FeedbackChange in the
+transaction that makes it, so the log never disagrees with the live
+tables. Consumers read it in id order after an opaque cursor. SQLite
+serialises writers, so ids become visible in increasing order and a
+cursor never skips a change that commits later.
+
+prune_change_log deletes old entries from the front but always keeps the
+newest one, so a cursor from before the oldest retained entry is known
+to have missed changes (CursorExpired).
+"""
+import base64
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .models import FeedbackChange
+
+CURSOR_PREFIX = 'c1:'
+CHANGE_FIELDS = ('id', 'entity', 'operation', 'object_id', 'submission_id', 'data', 'created_at')
+
+# (operation, buffer) while inside recording_deletions().
+_deletions = ContextVar('feedback_change_deletions', default=None)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorExpired(Exception):
+    """The changes after this cursor have been pruned from the log."""
+
+
+def encode_cursor(change_id):
+    return base64.urlsafe_b64encode(f'{CURSOR_PREFIX}{change_id}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        if text.startswith(CURSOR_PREFIX):
+            return int(text[len(CURSOR_PREFIX):])
+    except ValueError:
+        pass
+    raise InvalidCursor(f"Invalid cursor {cursor!r}.")
+
+
+def _submission_data(submission):
+    return {
+        'created_at': submission.created_at.isoformat(),
+        'submitted_by_id': submission.submitted_by_id,
+        'target_employee_id': submission.target_employee_id,
+        'answer_count': submission.answer_count,
+        'rating_sum': submission.rating_sum,
+        'rating_min': submission.rating_min,
+        'rating_max': submission.rating_max,
+        'has_comment': submission.has_comment,
+    }
+
+
+def _answer_data(answer):
+    return {
+        'question_id': answer.question_id,
+        'rating': answer.rating,
+        'comment': answer.comment,
+    }
+
+
+def log_created(submissions, answers):
+    """Append create entries for freshly inserted submissions and answers (one INSERT)."""
+    FeedbackChange.objects.bulk_create([
+        *(
+            FeedbackChange(
+                entity='submission', operation='create', object_id=submission.pk,
+                submission_id=submission.pk, data=_submission_data(submission),
+            )
+            for submission in submissions
+        ),
+        *(
+            FeedbackChange(
+                entity='answer', operation='create', object_id=answer.pk,
+                submission_id=answer.submission_id, data=_answer_data(answer),
+            )
+            for answer in answers
+        ),
+    ], batch_size=5000)
+
+
+def log_saved(entity, instance, created):
+    """Record a submission or answer saved through the ORM; called from the post_save signals."""
+    FeedbackChange.objects.create(
+        entity=entity,
+        operation='create' if created else 'update',
+        object_id=instance.pk,
+        submission_id=instance.pk if entity == 'submission' else instance.submission_id,
+        data=_submission_data(instance) if entity == 'submission' else _answer_data(instance),
+    )
+
+
+def log_deleted(entity, instance):
+    """Record a deleted submission or answer; called from the post_delete signals."""
+    change = FeedbackChange(
+        entity=entity,
+        operation='delete',
+        object_id=instance.pk,
+        submission_id=instance.pk if entity == 'submission' else instance.submission_id,
+    )
+    current = _deletions.get()
+    if current is None:
+        change.save()
+    else:
+        change.operation, buffer = current
+        buffer.append(change)
+
+
+@contextmanager
+def recording_deletions(operation='delete'):
+    """
+    Collect the deletions made inside the block and log them as `operation`
+    with one INSERT when it exits. Use inside the deleting transaction.
+    """
+    buffer = []
+    token = _deletions.set((operation, buffer))
+    try:
+        yield
+        FeedbackChange.objects.bulk_create(buffer, batch_size=5000)
+    finally:
+        _deletions.reset(token)
+
+
+def deletion_operation():
+    """How deletions made in the current context are recorded: 'delete', or 'archive' for archive_feedback."""
+    current = _deletions.get()
+    return 'delete' if current is None else current[0]
+
+
+def head_cursor():
+    """Cursor positioned after the newest change."""
+    return encode_cursor(FeedbackChange.objects.order_by('-id').values_list('id', flat=True).first() or 0)
+
+
+def read_changes(cursor=None, limit=500):
+    """
+    Up to `limit` changes after `cursor` (from the oldest retained change
+    without one). Returns (rows, next_cursor, has_more).
+    """
+    after = decode_cursor(cursor) if cursor else 0
+    if after:
+        first = FeedbackChange.objects.order_by('id').values_list('id', flat=True).first()
+        if first is not None and after < first - 1:
+            raise CursorExpired(f"Changes after this cursor were pruned; the oldest retained change is {first}.")
+
+    rows = list(FeedbackChange.objects.filter(id__gt=after).order_by('id').values(*CHANGE_FIELDS)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1]['id']) if rows else (cursor or encode_cursor(after))
+    for row in rows:
+        del row['id']
+    return rows, next_cursor, has_more
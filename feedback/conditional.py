@@ -0,0 +1,48 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from .catalogue import VersionedCache, current_version
+
+_body_cache = VersionedCache(max_entries=64, ttl=300)
+
+
+class CatalogueETagMixin:
+    """
+    Conditional GET for list views whose payload depends only on one
+    catalogue (see feedback.catalogue) and the query parameters.
+
+    The ETag is built from the catalogue's change version, so a matching
+    If-None-Match is answered with 304 without reading the listed tables.
+    Rendered JSON bodies are cached per (catalogue, variant, version).
+    """
+    catalogue_name = None
+
+    def get_catalogue_variant(self):
+        """Distinguishes payloads of the same catalogue (e.g. by query parameter)."""
+        return ''
+
+    def list(self, request, *args, **kwargs):
+        version = current_version(self.catalogue_name)
+        variant = self.get_catalogue_variant()
+        renderer = request.accepted_renderer
+        etag = f'"{self.catalogue_name}-{version}-{variant}-{renderer.format}"'
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self._with_validators(not_modified, etag)
+
+        if renderer.format != 'json':
+            return self._with_validators(super().list(request, *args, **kwargs), etag)
+
+        def render():
+            data = self.get_serializer(self.filter_queryset(self.get_queryset()), many=True).data
+            return renderer.render(data, request.accepted_media_type, self.get_renderer_context())
+
+        body = _body_cache.get_or_build((self.catalogue_name, variant), version, render)
+        return self._with_validators(HttpResponse(body, content_type=request.accepted_media_type), etag)
+
+    def _with_validators(self, response, etag):
+        response['ETag'] = etag
+        # Authenticated data: clients may keep it but must revalidate every time.
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,136 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import FeedbackAnswer, FeedbackQuestion
+
+EXPORT_CHUNK_SIZE = 2000
+
+SUBMISSION_FIELDS = (
+    'id',
+    'created_at',
+    'submitted_by_id',
+    'submitted_by__employee_code',
+    'submitted_by__user__username',
+    'submitted_by__designation__name',
+    'submitted_by__department',
+    'target_employee_id',
+)
+
+CSV_HEADER = (
+    'submission_id',
+    'created_at',
+    'submitted_by_id',
+    'submitted_by_code',
+    'submitted_by_username',
+    'designation',
+    'department',
+    'target_employee_id',
+    'question_id',
+    'question',
+    'rating',
+    'comment',
+)
+
+
+def iter_submissions_with_answers(qs, chunk_size=EXPORT_CHUNK_SIZE, on_progress=None):
+    """
+    Yield one dict per submission, with its answers attached, reading the
+    database in chunks so memory use does not grow with the result size.
+    Every query runs on the database `qs` is bound to, so a streamed export
+    stays on the connection it was started on. `on_progress`, if given, is
+    called with the running submission count after each chunk.
+    """
+    db = qs.db
+    questions = dict(FeedbackQuestion.objects.using(db).values_list('id', 'text'))
+    rows = qs.order_by('created_at', 'id').values(*SUBMISSION_FIELDS).iterator(chunk_size=chunk_size)
+
+    chunk = []
+    done = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield from _attach_answers(chunk, questions, db)
+            done += len(chunk)
+            chunk = []
+            if on_progress:
+                on_progress(done)
+    if chunk:
+        yield from _attach_answers(chunk, questions, db)
+        done += len(chunk)
+    if on_progress:
+        on_progress(done)
+
+
+def _attach_answers(chunk, questions, db):
+    by_submission = {row['id']: [] for row in chunk}
+    answers = (
+        FeedbackAnswer.objects.using(db)
+        .filter(submission_id__in=list(by_submission))
+        .order_by('submission_id', 'id')
+        .values_list('submission_id', 'question_id', 'rating', 'comment')
+    )
+    for submission_id, question_id, rating, comment in answers:
+        by_submission[submission_id].append({
+            'question_id': question_id,
+            'question': questions.get(question_id, ''),
+            'rating': rating,
+            'comment': comment,
+        })
+
+    for row in chunk:
+        yield {
+            'id': row['id'],
+            'created_at': row['created_at'],
+            'submitted_by_id': row['submitted_by_id'],
+            'submitted_by_code': row['submitted_by__employee_code'],
+            'submitted_by_username': row['submitted_by__user__username'],
+            'designation': row['submitted_by__designation__name'],
+            'department': row['submitted_by__department'],
+            'target_employee_id': row['target_employee_id'],
+            'answers': by_submission[row['id']],
+        }
+
+
+def iter_ndjson(qs, on_progress=None):
+    """One JSON object per line, one line per submission."""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for submission in iter_submissions_with_answers(qs, on_progress=on_progress):
+        yield encoder.encode(submission) + '\n'
+
+
+class _Echo:
+    """File-like object that hands back what csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(qs, on_progress=None):
+    """One CSV row per answer, with the submission columns repeated."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for submission in iter_submissions_with_answers(qs, on_progress=on_progress):
+        head = (
+            submission['id'],
+            submission['created_at'].isoformat(),
+            submission['submitted_by_id'],
+            submission['submitted_by_code'],
+            submission['submitted_by_username'],
+            submission['designation'],
+            submission['department'],
+            submission['target_employee_id'],
+        )
+        for answer in submission['answers']:
+            yield writer.writerow(head + (
+                answer['question_id'],
+                answer['question'],
+                answer['rating'],
+                answer['comment'],
+            ))
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson', 'ndjson'),
+    'csv': (iter_csv, 'text/csv', 'csv'),
+}
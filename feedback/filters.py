@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Department, Designation, lookup_key, prefix_range
+
+
+def name_lookup(field, value, match='prefix'):
+    """Filter kwargs on a case-folded key column: exact, or prefix as an index range."""
+    key = lookup_key(value)
+    if match == 'exact':
+        return {field: key}
+    return prefix_range(field, key)
+
+
+def filter_feedback_submissions(qs, params, prefix=''):
+    """
+    Apply the admin designation/department/date/rating filters to a queryset.
+
+    `prefix` is the lookup path from the queryset's model to FeedbackSubmission
+    (e.g. 'submission__' for FeedbackAnswer querysets).
+    """
+    designation = params.get('designation')
+    department = params.get('department')
+    start_date = params.get('start_date')
+    end_date = params.get('end_date')
+    match = params.get('match') or 'prefix'
+    max_average_rating = params.get('max_average_rating')
+    max_rating = params.get('max_rating')
+
+    if designation:
+        if str(designation).isdigit():
+            qs = qs.filter(**{f'{prefix}submitted_by__designation__id': int(designation)})
+        else:
+            designations = Designation.objects.filter(**name_lookup('name_key', designation, match))
+            qs = qs.filter(**{f'{prefix}submitted_by__designation__in': designations})
+
+    if department:
+        departments = Department.objects.filter(**name_lookup('key', department, match))
+        qs = qs.filter(**{f'{prefix}submitted_by__department_ref__in': departments})
+
+    if start_date:
+        try:
+            sd = datetime.fromisoformat(str(start_date))
+            sd = timezone.make_aware(sd)
+            qs = qs.filter(**{f'{prefix}created_at__gte': sd})
+        except ValueError:
+            pass
+
+    if end_date:
+        try:
+            ed = datetime.fromisoformat(str(end_date))
+            ed = timezone.make_aware(ed)
+            qs = qs.filter(**{f'{prefix}created_at__lte': ed})
+        except ValueError:
+            pass
+
+    # Low-rated submissions, from the summary columns without joining answers.
+    if max_average_rating not in (None, ''):
+        try:
+            qs = qs.filter(**{
+                f'{prefix}answer_count__gt': 0,
+                f'{prefix}rating_sum__lte': F(f'{prefix}answer_count') * float(max_average_rating),
+            })
+        except (TypeError, ValueError):
+            pass
+
+    if max_rating not in (None, ''):
+        try:
+            qs = qs.filter(**{f'{prefix}rating_min__lte': int(max_rating)})
+        except (TypeError, ValueError):
+            pass
+
+    return qs
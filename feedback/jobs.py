@@ -0,0 +1,264 @@
+"""
+Database-backed background jobs.
+
+Admin endpoints insert BackgroundJob rows; `manage.py run_workers` processes
+claim them with a conditional UPDATE (status 'queued' -> 'running'), which
+SQLite serialises, so no broker is needed and no job is run twice
+concurrently. While a job runs, a side thread of its worker refreshes the
+heartbeat; a job whose heartbeat stops (its worker died) is requeued, up to
+max_attempts claims, then failed. Handlers report progress and write their
+results to files under FEEDBACK_JOB_RESULTS_DIR.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .exports import EXPORT_FORMATS
+from .filters import filter_feedback_submissions
+from .models import BackgroundJob, FeedbackSubmission
+from .routers import reporting, reporting_alias
+
+logger = logging.getLogger('feedback.jobs')
+
+# Minimum seconds between progress writes from a running job.
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+# Seconds between heartbeats of a running job. run_workers --stale-after
+# must stay well above this.
+HEARTBEAT_SECONDS = 30.0
+
+
+def results_dir():
+    path = Path(settings.FEEDBACK_JOB_RESULTS_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def uploads_dir():
+    path = results_dir() / 'uploads'
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_job(kind, params=None, created_by=None):
+    return BackgroundJob.objects.create(kind=kind, params=params or {}, created_by=created_by)
+
+
+def _own(job):
+    """Queryset matching `job` only while this claim of it is still current."""
+    return BackgroundJob.objects.filter(id=job.id, status=BackgroundJob.STATUS_RUNNING, attempts=job.attempts)
+
+
+class JobProgress:
+    """Throttled progress and heartbeat writer handed to job handlers."""
+
+    def __init__(self, job):
+        self.job = job
+        self.done = 0
+        self.total = None
+        self._written_at = float('-inf')
+
+    def update(self, done, total=None, force=False):
+        self.done = done
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if not force and now - self._written_at < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._written_at = now
+        _own(self.job).update(progress=self.done, total=self.total, heartbeat_at=timezone.now())
+
+
+def touch_heartbeat(job):
+    _own(job).update(heartbeat_at=timezone.now())
+
+
+class JobHeartbeat:
+    """
+    Refreshes a running job's heartbeat from a side thread, so a handler
+    that reports no progress for a long time (a management command, one
+    slow query) is not taken for a dead worker.
+    """
+
+    def __init__(self, job, interval=None):
+        self.job = job
+        self.interval = HEARTBEAT_SECONDS if interval is None else interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'job-{job.id}-heartbeat', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    touch_heartbeat(self.job)
+                except Exception:
+                    # A locked database must not end the job; the next beat retries.
+                    logger.exception("Heartbeat for job %s failed", self.job.id)
+        finally:
+            connection.close()
+
+
+def claim_next_job(worker):
+    """Atomically move the oldest queued job to 'running' for `worker`, or return None."""
+    queued = BackgroundJob.objects.filter(status=BackgroundJob.STATUS_QUEUED).order_by('created_at', 'id')
+    while True:
+        job_id = queued.values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = BackgroundJob.objects.filter(id=job_id, status=BackgroundJob.STATUS_QUEUED).update(
+            status=BackgroundJob.STATUS_RUNNING,
+            worker=worker,
+            started_at=now,
+            heartbeat_at=now,
+            finished_at=None,
+            attempts=F('attempts') + 1,
+            progress=0,
+            message='',
+        )
+        if claimed:
+            return BackgroundJob.objects.get(id=job_id)
+        # Another worker claimed it first; look again.
+
+
+def requeue_stale_jobs(stale_after):
+    """
+    Put back running jobs whose worker has not reported for `stale_after`
+    seconds, or fail them once they have used up max_attempts. Returns the
+    number of jobs requeued.
+    """
+    now = timezone.now()
+    stale = BackgroundJob.objects.filter(
+        status=BackgroundJob.STATUS_RUNNING, heartbeat_at__lt=now - timedelta(seconds=stale_after),
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=BackgroundJob.STATUS_FAILED,
+        finished_at=now,
+        message=f"The worker stopped reporting for over {stale_after:g} seconds on the last allowed attempt.",
+    )
+    return stale.update(status=BackgroundJob.STATUS_QUEUED, worker='')
+
+
+def run_job(job):
+    """Run a claimed job to completion and record the outcome. Returns True on success."""
+    progress = JobProgress(job)
+    try:
+        with JobHeartbeat(job):
+            result_file, message = JOB_HANDLERS[job.kind](job, progress)
+    except Exception:
+        _own(job).update(
+            status=BackgroundJob.STATUS_FAILED,
+            finished_at=timezone.now(),
+            message=traceback.format_exc()[-4000:],
+        )
+        return False
+    _own(job).update(
+        status=BackgroundJob.STATUS_SUCCEEDED,
+        finished_at=timezone.now(),
+        heartbeat_at=timezone.now(),
+        progress=progress.done,
+        total=progress.total,
+        result_file=result_file or '',
+        message=message,
+    )
+    return True
+
+
+def work(worker, poll_interval=1.0, stale_after=None, once=False, stop=None):
+    """
+    Claim and run jobs until `stop` (a threading/multiprocessing Event) is
+    set or, with `once`, until the queue is empty.
+    """
+    while stop is None or not stop.is_set():
+        close_old_connections()
+        if stale_after:
+            requeue_stale_jobs(stale_after)
+        job = claim_next_job(worker)
+        if job is None:
+            if once:
+                return
+            if stop is not None:
+                stop.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+            continue
+        run_job(job)
+
+
+def _write_atomically(name, chunks):
+    path = results_dir() / name
+    partial = path.with_name(path.name + '.part')
+    with open(partial, 'w', newline='', encoding='utf-8') as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+    os.replace(partial, path)
+
+
+def _run_export(job, progress):
+    render_rows, content_type, extension = EXPORT_FORMATS[job.params.get('export_format', 'ndjson')]
+    with reporting():
+        qs = filter_feedback_submissions(FeedbackSubmission.objects.using(reporting_alias()), job.params)
+        total = qs.count()
+        progress.update(0, total, force=True)
+        name = f"job-{job.id}-feedback.{extension}"
+        _write_atomically(name, render_rows(qs, on_progress=progress.update))
+    return name, f"Exported {total} submissions."
+
+
+def _run_command(job, progress, command, *args, **options):
+    output = StringIO()
+    call_command(command, *args, stdout=output, stderr=output, **options)
+    name = f"job-{job.id}-{command}.log"
+    _write_atomically(name, [output.getvalue()])
+    lines = output.getvalue().strip().splitlines()
+    return name, lines[-1] if lines else ''
+
+
+def _run_rebuild_rollups(job, progress):
+    return _run_command(job, progress, 'rebuild_rating_rollups')
+
+
+def _run_import_employees(job, progress):
+    params = job.params
+    upload = uploads_dir() / params['upload']
+    try:
+        return _run_command(
+            job, progress, 'import_employees', str(upload),
+            format=params.get('format'),
+            batch_size=params.get('batch_size', 1000),
+            workers=params.get('workers', 1),
+            create_designations=params.get('create_designations', False),
+        )
+    finally:
+        upload.unlink(missing_ok=True)
+
+
+JOB_HANDLERS = {
+    BackgroundJob.KIND_EXPORT: _run_export,
+    BackgroundJob.KIND_REBUILD_ROLLUPS: _run_rebuild_rollups,
+    BackgroundJob.KIND_IMPORT_EMPLOYEES: _run_import_employees,
+}
@@ -0,0 +1,107 @@
+from rest_framework import serializers
+
+from .catalogue import active_question_map
+from .models import FeedbackAnswer, FeedbackQuestion
+
+LISTING_FIELDS = (
+    'id',
+    'created_at',
+    'submitted_by_id',
+    'submitted_by__user__username',
+    'submitted_by__user__first_name',
+    'submitted_by__user__last_name',
+    'submitted_by__designation__name',
+    'answer_count',
+    'rating_sum',
+    'rating_min',
+    'rating_max',
+    'has_comment',
+)
+
+_datetime_field = serializers.DateTimeField()
+
+
+def listing_rows(qs):
+    """Project a FeedbackSubmission queryset down to the columns listings render."""
+    return qs.values(*LISTING_FIELDS)
+
+
+def _question_label(feedback_type, text):
+    # Mirrors FeedbackQuestion.__str__.
+    return f"[{feedback_type}] {text[:50]}"
+
+
+def _answers_queryset(submission_ids):
+    return (
+        FeedbackAnswer.objects
+        .filter(submission_id__in=submission_ids)
+        .order_by('submission_id', 'id')
+        .values_list('submission_id', 'question_id', 'rating', 'comment')
+    )
+
+
+def _labels_queryset(question_ids):
+    return FeedbackQuestion.objects.filter(id__in=question_ids).values_list('id', 'feedback_type', 'text')
+
+
+def build_submission_listing(rows):
+    """
+    Render rows from listing_rows() in the same shape as
+    FeedbackSubmissionSerializer, without instantiating models. Costs one
+    query for all answers on the page, plus one for labels of questions that
+    are no longer active.
+    """
+    rows = list(rows)
+    answers = list(_answers_queryset([row['id'] for row in rows]))
+
+    labels = {
+        question.id: _question_label(question.feedback_type, question.text)
+        for question in active_question_map().values()
+    }
+    missing = {question_id for _, question_id, _, _ in answers if question_id not in labels}
+    if missing:
+        for question_id, feedback_type, text in _labels_queryset(missing):
+            labels[question_id] = _question_label(feedback_type, text)
+
+    return _render_listing(rows, answers, labels)
+
+
+async def abuild_submission_listing(rows):
+    """Async counterpart of build_submission_listing, using the async ORM."""
+    answers = [answer async for answer in _answers_queryset([row['id'] for row in rows])]
+    question_ids = {question_id for _, question_id, _, _ in answers}
+    labels = {
+        question_id: _question_label(feedback_type, text)
+        async for question_id, feedback_type, text in _labels_queryset(question_ids)
+    }
+    return _render_listing(rows, answers, labels)
+
+
+def _render_listing(rows, answers, labels):
+    answers_by_submission = {row['id']: [] for row in rows}
+    for submission_id, question_id, rating, comment in answers:
+        answers_by_submission[submission_id].append({
+            'question': labels.get(question_id),
+            'rating': rating,
+            'comment': comment,
+        })
+
+    results = []
+    for row in rows:
+        # Mirrors Employee.__str__.
+        full_name = f"{row['submitted_by__user__first_name']} {row['submitted_by__user__last_name']}".strip()
+        name = full_name or row['submitted_by__user__username']
+        results.append({
+            'id': row['id'],
+            'submitted_by': row['submitted_by_id'],
+            'submitted_by_employee': f"{name} ({row['submitted_by__designation__name']})",
+            'created_at': _datetime_field.to_representation(row['created_at']),
+            # Mirrors FeedbackSubmission.average_rating.
+            'answer_count': row['answer_count'],
+            'average_rating': round(row['rating_sum'] / row['answer_count'], 2) if row['answer_count'] else None,
+            'rating_min': row['rating_min'],
+            'rating_max': row['rating_max'],
+            'has_comment': row['has_comment'],
+            'answers': answers_by_submission[row['id']],
+        })
+    return results
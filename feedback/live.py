@@ -0,0 +1,222 @@
+"""
+Live push of new feedback submissions to server-sent event streams.
+
+One FeedbackPublisher per process (per event loop) tails the change log
+(feedback.changes) while anyone is subscribed: every poll is one query
+for new submission entries, plus one for the matching rows and one for
+their answers. Each submission is rendered and encoded once and the same
+bytes are handed to every subscriber whose filter matches it, so the
+database cost does not grow with the number of open streams.
+
+Subscribers have bounded queues. A client that falls behind loses
+events rather than holding memory: once its queue is full, new events
+for it are dropped until it has drained the queue. It then gets a `gap`
+event with the cursor of the last event it received, to resync from
+/api/admin/feedback-changes/ or the filter endpoint.
+"""
+import asyncio
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .changes import InvalidCursor, decode_cursor, encode_cursor
+from .listings import LISTING_FIELDS, abuild_submission_listing
+from .models import FeedbackChange, FeedbackSubmission, lookup_key
+
+logger = logging.getLogger('feedback.live')
+
+POLL_BATCH = 500
+
+# Extra columns the publisher reads to match subscriber filters in memory.
+MATCH_FIELDS = (
+    'target_employee_id',
+    'submitted_by__designation_id',
+    'submitted_by__designation__name_key',
+    'submitted_by__department_ref__key',
+)
+
+
+def format_event(event, data, event_id=None):
+    """One server-sent event, as bytes."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, cls=DjangoJSONEncoder)}')
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+HEARTBEAT = b': keepalive\n\n'
+
+
+class LiveFilter:
+    """
+    The admin filter parameters, evaluated against one submission row in
+    memory with the same semantics as feedback.filters.
+    """
+
+    def __init__(self, data):
+        self.target_employee_id = data.get('target_employee_id')
+        designation = data.get('designation')
+        self.designation_id = int(designation) if designation and str(designation).isdigit() else None
+        self.designation_key = lookup_key(designation) if designation and self.designation_id is None else None
+        self.department_key = lookup_key(data['department']) if data.get('department') else None
+        self.exact = data.get('match') == 'exact'
+        self.max_average_rating = data.get('max_average_rating')
+        self.max_rating = data.get('max_rating')
+
+    def _name_matches(self, key, wanted):
+        if key is None:
+            return False
+        return key == wanted if self.exact else key.startswith(wanted)
+
+    def matches(self, row):
+        if self.target_employee_id is not None and row['target_employee_id'] != self.target_employee_id:
+            return False
+        if self.designation_id is not None and row['submitted_by__designation_id'] != self.designation_id:
+            return False
+        if self.designation_key and not self._name_matches(row['submitted_by__designation__name_key'], self.designation_key):
+            return False
+        if self.department_key and not self._name_matches(row['submitted_by__department_ref__key'], self.department_key):
+            return False
+        if self.max_average_rating is not None and not (
+            row['answer_count'] and row['rating_sum'] <= row['answer_count'] * self.max_average_rating
+        ):
+            return False
+        if self.max_rating is not None and not (row['rating_min'] is not None and row['rating_min'] <= self.max_rating):
+            return False
+        return True
+
+
+class Subscriber:
+    def __init__(self, live_filter, buffer_size, last_cursor):
+        self.filter = live_filter
+        self.queue = asyncio.Queue(buffer_size)
+        # Cursor of the last event queued; where a resync starts after a gap.
+        self.last_cursor = last_cursor
+        self.dropped = 0
+
+    def offer(self, cursor, payload):
+        # Once lagging, drop everything until the backlog is drained, so
+        # the client sees an unbroken prefix, then a gap.
+        if self.dropped or self.queue.full():
+            self.dropped += 1
+            return
+        self.queue.put_nowait(payload)
+        self.last_cursor = cursor
+
+    async def next_event(self, timeout):
+        """The next encoded event, a gap event, or None after `timeout` seconds of silence."""
+        if self.dropped and self.queue.empty():
+            gap = format_event('gap', {'dropped': self.dropped, 'resume_after': self.last_cursor})
+            self.dropped = 0
+            return gap
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class FeedbackPublisher:
+    def __init__(self, loop):
+        self.loop = loop
+        self.subscribers = set()
+        self.position = None
+        self.task = None
+
+    async def subscribe(self, live_filter):
+        if self.position is None:
+            self.position = await FeedbackChange.objects.order_by('-id').values_list('id', flat=True).afirst() or 0
+        subscriber = Subscriber(live_filter, settings.FEEDBACK_LIVE_BUFFER, encode_cursor(self.position))
+        self.subscribers.add(subscriber)
+        if self.task is None or self.task.done():
+            self.task = self.loop.create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                caught_up = await self.poll()
+            except Exception:
+                # Keep the streams open through transient database errors.
+                logger.exception("Polling the change log failed")
+                caught_up = True
+            if caught_up:
+                await asyncio.sleep(settings.FEEDBACK_LIVE_POLL_SECONDS)
+        # Nobody is listening: start from the head again next time.
+        self.position = None
+
+    async def poll(self):
+        """Publish submissions created since the last poll. Returns False if more are waiting."""
+        changes = [
+            change async for change in
+            FeedbackChange.objects.filter(id__gt=self.position, entity='submission', operation='create')
+            .order_by('id').values_list('id', 'object_id')[:POLL_BATCH]
+        ]
+        if not changes:
+            return True
+
+        rows = {
+            row['id']: row async for row in
+            FeedbackSubmission.objects.filter(id__in=[object_id for _, object_id in changes])
+            .values(*LISTING_FIELDS, *MATCH_FIELDS)
+        }
+        # Rows already deleted again are skipped.
+        audience = {}
+        for change_id, submission_id in changes:
+            row = rows.get(submission_id)
+            if row is None:
+                continue
+            subscribers = [subscriber for subscriber in self.subscribers if subscriber.filter.matches(row)]
+            if subscribers:
+                audience[change_id] = (row, subscribers)
+
+        if audience:
+            rendered = await abuild_submission_listing([row for row, _ in audience.values()])
+            for (change_id, (_, subscribers)), data in zip(audience.items(), rendered):
+                cursor = encode_cursor(change_id)
+                payload = format_event('submission', data, event_id=cursor)
+                for subscriber in subscribers:
+                    subscriber.offer(cursor, payload)
+
+        self.position = changes[-1][0]
+        return len(changes) < POLL_BATCH
+
+    def behind(self, cursor):
+        """Whether a reconnecting client's Last-Event-ID precedes what this publisher will send."""
+        try:
+            return decode_cursor(cursor) < (self.position or 0)
+        except InvalidCursor:
+            return False
+
+
+_publisher = None
+
+
+def get_publisher():
+    """The publisher for the running event loop."""
+    global _publisher
+    loop = asyncio.get_running_loop()
+    if _publisher is None or _publisher.loop is not loop:
+        _publisher = FeedbackPublisher(loop)
+    return _publisher
+
+
+async def stream_events(live_filter, last_event_id=None):
+    """Async iterator of encoded events for one client, ending when it disconnects."""
+    publisher = get_publisher()
+    subscriber = await publisher.subscribe(live_filter)
+    try:
+        yield b'retry: 5000\n\n'
+        if last_event_id and publisher.behind(last_event_id):
+            yield format_event('gap', {'dropped': None, 'resume_after': last_event_id})
+        while True:
+            event = await subscriber.next_event(settings.FEEDBACK_LIVE_HEARTBEAT_SECONDS)
+            yield HEARTBEAT if event is None else event
+    finally:
+        publisher.unsubscribe(subscriber)
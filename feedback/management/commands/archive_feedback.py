@@ -0,0 +1,115 @@
+import os
+import shutil
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from feedback.archive import ArchiveReader, archive_dir, start_of_day, write_archive
+from feedback.changes import recording_deletions
+from feedback.models import FeedbackAnswer, FeedbackArchive, FeedbackSubmission
+
+
+class Command(BaseCommand):
+    help = (
+        "Move submissions created before --before (and their answers) into a columnar archive under "
+        "FEEDBACK_ARCHIVE_DIR, then delete them from the live tables in batches. Rating rollups are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', required=True, help="Archive submissions created before this date (YYYY-MM-DD).")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Submissions deleted per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be archived.")
+
+    def handle(self, *args, **options):
+        try:
+            before = date.fromisoformat(options['before'])
+        except ValueError:
+            raise CommandError("--before must be a date in YYYY-MM-DD format.")
+        if before > timezone.localdate():
+            raise CommandError("--before cannot be in the future.")
+
+        # Settle archives an earlier run did not finish, so rows are never archived twice.
+        if not options['dry_run']:
+            self._reconcile(options['batch_size'])
+
+        submissions = FeedbackSubmission.objects.filter(created_at__lt=start_of_day(before))
+        if options['dry_run']:
+            answers = FeedbackAnswer.objects.filter(submission__in=submissions).count()
+            self.stdout.write(f"Would archive {submissions.count()} submissions and {answers} answers.")
+            return
+        if not submissions.exists():
+            self._check_not_archived(before)
+            self.stdout.write("Nothing to archive.")
+            return
+
+        label = f"before-{before:%Y%m%d}-{timezone.now():%Y%m%d%H%M%S}"
+        # Claim the range before writing anything, so a concurrent run or a
+        # crash leaves a pending row for the next run to reconcile.
+        with transaction.atomic():
+            self._check_not_archived(before)
+            archive = FeedbackArchive.objects.create(label=label, before=before)
+
+        path = archive_dir() / label
+        partial = path.with_name(label + '.part')
+        writer = write_archive(submissions, partial, before=before.isoformat(), label=label)
+        os.replace(partial, path)
+
+        archive.first_created_at = writer.first_created_at
+        archive.last_created_at = writer.last_created_at
+        archive.submission_count = writer.submissions
+        archive.answer_count = writer.answers
+        archive.state = FeedbackArchive.STATE_WRITTEN
+        archive.save(update_fields=['first_created_at', 'last_created_at', 'submission_count', 'answer_count', 'state'])
+        self.stdout.write(f"Wrote {writer.submissions} submissions and {writer.answers} answers to {path}.")
+        self._purge(archive, options['batch_size'])
+
+    def _check_not_archived(self, before):
+        latest = FeedbackArchive.objects.order_by('-before').values_list('before', flat=True).first()
+        if latest and before <= latest:
+            raise CommandError(f"Everything before {latest} is already archived.")
+
+    def _reconcile(self, batch_size):
+        """
+        Bring unfinished archives to a consistent state: pending ones whose
+        files made it to disk are recorded and purged, pending ones without
+        files are dropped (nothing was deleted yet), written ones are purged.
+        """
+        unfinished = FeedbackArchive.objects.exclude(state=FeedbackArchive.STATE_COMPLETE).order_by('id')
+        for archive in unfinished:
+            path = archive_dir() / archive.label
+            if archive.state == FeedbackArchive.STATE_PENDING:
+                if not path.is_dir():
+                    shutil.rmtree(path.with_name(archive.label + '.part'), ignore_errors=True)
+                    archive.delete()
+                    self.stdout.write(f"Dropped unfinished archive {archive.label}.")
+                    continue
+                self._record_written(archive, ArchiveReader(path).manifest)
+            self._purge(archive, batch_size)
+
+    def _record_written(self, archive, manifest):
+        def parse(value):
+            return datetime.fromisoformat(value) if value else None
+
+        archive.first_created_at = parse(manifest['first_created_at'])
+        archive.last_created_at = parse(manifest['last_created_at'])
+        archive.submission_count = manifest['submissions']
+        archive.answer_count = manifest['answers']
+        archive.state = FeedbackArchive.STATE_WRITTEN
+        archive.save(update_fields=['first_created_at', 'last_created_at', 'submission_count', 'answer_count', 'state'])
+        self.stdout.write(f"Recovered archive {archive.label} with {archive.submission_count} submissions.")
+
+    def _purge(self, archive, batch_size):
+        """Delete exactly the submissions recorded in the archive, batch by batch."""
+        ids = ArchiveReader(archive_dir() / archive.label).columns['submission_id']
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size].tolist()
+            with transaction.atomic(), recording_deletions('archive'):
+                FeedbackAnswer.objects.filter(submission_id__in=batch).delete()
+                FeedbackSubmission.objects.filter(id__in=batch).delete()
+            self.stdout.write(f"Purged {min(start + batch_size, len(ids))}/{len(ids)} submissions.")
+        archive.purged_at = timezone.now()
+        archive.state = FeedbackArchive.STATE_COMPLETE
+        archive.save(update_fields=['purged_at', 'state'])
+        self.stdout.write(self.style.SUCCESS(f"Archive {archive.label} is complete."))
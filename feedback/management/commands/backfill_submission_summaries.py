@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from feedback.models import FeedbackSubmission
+from feedback.submissions import summary_expressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the answer summary columns (answer_count, rating_sum, rating_min, rating_max, "
+        "has_comment) of existing submissions from their answers, in id-range batches. Migration 0011 and "
+        "the answer signals keep them current; use this to repair rows changed behind the ORM's back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Submission ids updated per transaction.")
+        parser.add_argument('--missing-only', action='store_true', help="Only update submissions with answer_count 0.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        submissions = FeedbackSubmission.objects.all()
+        if options['missing_only']:
+            submissions = submissions.filter(answer_count=0)
+
+        last_id = submissions.aggregate(last=Max('id'))['last'] or 0
+        expressions = summary_expressions()
+        updated = 0
+        for start in range(0, last_id, batch_size):
+            with transaction.atomic():
+                updated += submissions.filter(id__gt=start, id__lte=start + batch_size).update(**expressions)
+            self.stdout.write(f"{updated} submissions updated (up to id {min(start + batch_size, last_id)}).")
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} submissions."))
@@ -0,0 +1,271 @@
+import json
+import platform
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import count
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from feedback import urls as feedback_urls
+from feedback.models import (
+    BackgroundJob, Designation, Employee, FeedbackAnswer, FeedbackQuestion, FeedbackSubmission,
+)
+
+BENCH_PASSWORD = 'bench-password-123'
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class BenchContext:
+    """Ids and tokens the request builders need, resolved once before the run."""
+
+    def __init__(self, user):
+        self.user = user
+        self.refresh = str(RefreshToken.for_user(user))
+        self.access = str(RefreshToken(self.refresh).access_token)
+        self.employee_id = user.employee_profile.id
+        self.target_ids = list(Employee.objects.order_by('id').values_list('id', flat=True)[:200])
+        self.questions = {}
+        for question_id, feedback_type in FeedbackQuestion.objects.filter(is_active=True).values_list('id', 'feedback_type'):
+            self.questions.setdefault(feedback_type, []).append(question_id)
+        self.search_term = (
+            FeedbackAnswer.objects.exclude(comment='').values_list('comment', flat=True).first() or 'good'
+        ).split()[0]
+        self.job_id = BackgroundJob.objects.order_by('-id').values_list('id', flat=True).first()
+        self.finished_job_id = (
+            BackgroundJob.objects.filter(status=BackgroundJob.STATUS_SUCCEEDED).exclude(result_file='')
+            .order_by('-id').values_list('id', flat=True).first()
+        )
+        self._counter = count()
+        self._lock = threading.Lock()
+
+    def unique(self):
+        with self._lock:
+            return f"{int(time.time())}_{next(self._counter)}"
+
+    def answers(self):
+        feedback_type, question_ids = next(iter(self.questions.items()))
+        return [{'question_id': question_id, 'rating': 4, 'comment': 'bench'} for question_id in question_ids[:5]]
+
+    def target(self, n=0):
+        return self.target_ids[n % len(self.target_ids)]
+
+
+# url name -> (method, builder, writes). A builder returns (path, body) or
+# None when the database has nothing for the endpoint to work on.
+SCENARIOS = {
+    'register': ('post', lambda ctx: (reverse('register'), {
+        'username': f"bench_{ctx.unique()}", 'email': 'bench@example.com', 'password': BENCH_PASSWORD,
+    }), True),
+    'token_obtain_pair': ('post', lambda ctx: (reverse('token_obtain_pair'), {
+        'username': ctx.user.username, 'password': BENCH_PASSWORD,
+    }), False),
+    'token_refresh': ('post', lambda ctx: (reverse('token_refresh'), {'refresh': ctx.refresh}), False),
+    'employee-list': ('get', lambda ctx: (reverse('employee-list'), None), False),
+    'feedback-questions': ('get', lambda ctx: (reverse('feedback-questions') + '?type=employee', None), False),
+    'submit-feedback': ('post', lambda ctx: ctx.questions and (reverse('submit-feedback'), {
+        'target_employee_id': ctx.target(), 'answers': ctx.answers(),
+    }), True),
+    'submit-feedback-batch': ('post', lambda ctx: ctx.questions and (reverse('submit-feedback-batch'), {
+        'submissions': [
+            {'target_employee_id': ctx.target(n), 'answers': ctx.answers()} for n in range(10)
+        ],
+    }), True),
+    'my-feedback': ('get', lambda ctx: (reverse('my-feedback') + f"?employee_id={ctx.target()}", None), False),
+    'designation-list-create': ('get', lambda ctx: (reverse('designation-list-create'), None), False),
+    'async-feedback-questions': ('get', lambda ctx: (reverse('async-feedback-questions') + '?type=employee', None), False),
+    'async-employee-list': ('get', lambda ctx: (reverse('async-employee-list'), None), False),
+    'async-designation-list': ('get', lambda ctx: (reverse('async-designation-list'), None), False),
+    'async-my-feedback': ('get', lambda ctx: (reverse('async-my-feedback') + f"?employee_id={ctx.target()}", None), False),
+    'admin-feedback-filter': ('post', lambda ctx: (reverse('admin-feedback-filter'), {}), False),
+    'admin-feedback-export': ('post', lambda ctx: (reverse('admin-feedback-export'), {
+        'export_format': 'ndjson', 'start_date': (timezone.localdate() - timedelta(days=1)).isoformat(),
+    }), False),
+    'admin-feedback-analytics': ('post', lambda ctx: (reverse('admin-feedback-analytics'), {'group_by': 'designation'}), False),
+    'admin-feedback-search': ('post', lambda ctx: (reverse('admin-feedback-search'), {'q': ctx.search_term}), False),
+    'admin-archive-list': ('get', lambda ctx: (reverse('admin-archive-list'), None), False),
+    'admin-archive-query': ('post', lambda ctx: (reverse('admin-archive-query'), {'limit': 100}), False),
+    'admin-feedback-changes': ('get', lambda ctx: (reverse('admin-feedback-changes') + '?limit=500', None), False),
+    'metrics': ('get', lambda ctx: (reverse('metrics'), None), False),
+    'metrics-slow-queries': ('get', lambda ctx: (reverse('metrics-slow-queries'), None), False),
+    'admin-feedback-trends': ('post', lambda ctx: (reverse('admin-feedback-trends'), {
+        'target_employee_ids': ctx.target_ids[:50], 'period': 'month',
+    }), False),
+    'admin-job-list': ('get', lambda ctx: (reverse('admin-job-list'), None), False),
+    'admin-job-detail': ('get', lambda ctx: ctx.job_id and (reverse('admin-job-detail', args=[ctx.job_id]), None), False),
+    'admin-job-download': ('get', lambda ctx: ctx.finished_job_id and (
+        reverse('admin-job-download', args=[ctx.finished_job_id]), None), False),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every endpoint in feedback/urls.py in-process with the Django test client, at "
+        "several concurrency levels (threads), and write latency percentiles, throughput and "
+        "queries per request to a JSON file. Seed data first with `manage.py seed_feedback`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', default='1,4,16', help="Comma-separated concurrency levels.")
+        parser.add_argument('--requests', type=int, default=100, help="Requests per endpoint and level.")
+        parser.add_argument('--warmup', type=int, default=3, help="Unmeasured requests per endpoint.")
+        parser.add_argument('--endpoints', help="Comma-separated URL names (default: all).")
+        parser.add_argument('--read-only', action='store_true', help="Skip endpoints that write data.")
+        parser.add_argument('--username', default='bench_admin',
+                            help="Staff user to run as; created (or its password reset) for the run.")
+        parser.add_argument('--host', default='localhost', help="Host header; must be in ALLOWED_HOSTS.")
+        parser.add_argument('--output', help="JSON results path (default: bench_results/bench-<time>.json).")
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options['clients'].split(',') if level]
+        names = self._endpoint_names(options['endpoints'])
+        ctx = BenchContext(self._bench_user(options['username']))
+        self.host = options['host']
+
+        results = []
+        skipped = []
+        for name in names:
+            scenario = SCENARIOS.get(name)
+            if scenario is None:
+                skipped.append({'name': name, 'reason': 'no benchmark scenario'})
+                continue
+            method, build, writes = scenario
+            if writes and options['read_only']:
+                skipped.append({'name': name, 'reason': 'writes data'})
+                continue
+            if not build(ctx):
+                skipped.append({'name': name, 'reason': 'no data to exercise it'})
+                continue
+
+            self._run_level(ctx, method, build, 1, options['warmup'])
+            for clients in levels:
+                row = self._run_level(ctx, method, build, clients, options['requests'])
+                row.update({'name': name, 'method': method.upper(), 'path': build(ctx)[0], 'writes': writes})
+                results.append(row)
+                self.stdout.write(
+                    f"{name:26} c={clients:<3} rps={row['throughput_rps']:8.1f} "
+                    f"p50={row['p50_ms']:7.1f} p95={row['p95_ms']:7.1f} p99={row['p99_ms']:7.1f}ms "
+                    f"q/req={row['queries_mean']:.1f} errors={row['errors']}"
+                )
+
+        for entry in skipped:
+            self.stdout.write(f"skipped {entry['name']}: {entry['reason']}")
+
+        report = {
+            'started_at': timezone.now().isoformat(),
+            'git_commit': self._git_commit(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'db_profile': getattr(settings, 'FEEDBACK_DB_PROFILE', 'development'),
+                'debug': settings.DEBUG,
+            },
+            'dataset': {
+                'employees': Employee.objects.count(),
+                'designations': Designation.objects.count(),
+                'questions': FeedbackQuestion.objects.count(),
+                'submissions': FeedbackSubmission.objects.count(),
+                'answers': FeedbackAnswer.objects.count(),
+            },
+            'config': {'clients': levels, 'requests': options['requests'], 'warmup': options['warmup']},
+            'results': results,
+            'skipped': skipped,
+        }
+        output = Path(options['output'] or f"bench_results/bench-{timezone.now():%Y%m%d-%H%M%S}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output}"))
+
+    def _endpoint_names(self, selected):
+        names = list(dict.fromkeys(pattern.name for pattern in feedback_urls.urlpatterns if pattern.name))
+        if not selected:
+            return names
+        wanted = [name for name in selected.split(',') if name]
+        unknown = set(wanted) - set(names)
+        if unknown:
+            raise CommandError(f"Unknown endpoint names: {', '.join(sorted(unknown))}")
+        return wanted
+
+    def _bench_user(self, username):
+        user, created = User.objects.get_or_create(username=username, defaults={'is_staff': True, 'is_superuser': True})
+        if not user.is_staff:
+            raise CommandError(f"{username} exists and is not staff.")
+        user.set_password(BENCH_PASSWORD)
+        user.save()
+        Employee.objects.get_or_create(user=user)
+        return User.objects.select_related('employee_profile').get(pk=user.pk)
+
+    def _git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _run_level(self, ctx, method, build, clients, requests):
+        local = threading.local()
+
+        def one_request(_):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client(
+                    raise_request_exception=False, HTTP_HOST=self.host,
+                    HTTP_AUTHORIZATION=f"Bearer {ctx.access}",
+                )
+            path, body = build(ctx)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                if method == 'get':
+                    response = client.get(path)
+                else:
+                    response = client.post(path, body, content_type='application/json')
+                if response.streaming:
+                    for _ in response.streaming_content:
+                        pass
+                latency = time.perf_counter() - started
+            return response.status_code, latency, len(queries)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            outcomes = list(pool.map(one_request, range(requests)))
+        wall = time.perf_counter() - started
+
+        latencies = sorted(latency * 1000 for _, latency, _ in outcomes)
+        queries = [n for _, _, n in outcomes]
+        statuses = Counter(status for status, _, _ in outcomes)
+        return {
+            'clients': clients,
+            'requests': len(outcomes),
+            'errors': sum(n for status, n in statuses.items() if status >= 400),
+            'status_counts': {str(status): n for status, n in sorted(statuses.items())},
+            'wall_seconds': round(wall, 4),
+            'throughput_rps': round(len(outcomes) / wall, 2) if wall else 0.0,
+            'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'p50_ms': round(_percentile(latencies, 50), 3),
+            'p95_ms': round(_percentile(latencies, 95), 3),
+            'p99_ms': round(_percentile(latencies, 99), 3),
+            'queries_mean': round(sum(queries) / len(queries), 2) if queries else 0.0,
+            'queries_max': max(queries, default=0),
+        }
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+ENDPOINTS = ('questions/', 'employees/', 'designations/', 'feedback/my/')
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync and async read endpoints of a running server (e.g. under uvicorn) "
+        "with many concurrent slow clients that trickle their request and read the response slowly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--token', required=True, help="JWT access token sent as a Bearer header.")
+        parser.add_argument('--clients', default='10,50,200', help="Comma-separated concurrency levels.")
+        parser.add_argument('--trickle', type=float, default=1.0,
+                            help="Seconds each client spends sending its request and reading the response.")
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['base_url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError("--base-url must be a plain http:// URL.")
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.token = options['token']
+        self.trickle = options['trickle']
+
+        levels = [int(level) for level in options['clients'].split(',') if level]
+        endpoints = [endpoint for endpoint in options['endpoints'].split(',') if endpoint]
+        results = asyncio.run(self._run_all(endpoints, levels))
+
+        for row in results:
+            self.stdout.write(
+                f"{row['variant']:5} {row['endpoint']:15} clients={row['clients']:<5} "
+                f"wall={row['wall_seconds']:.2f}s rps={row['requests_per_second']:.1f} "
+                f"p50={row['p50_ms']:.0f}ms p95={row['p95_ms']:.0f}ms "
+                f"probe={row['probe_ms']:.0f}ms errors={row['errors']}"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+
+    async def _run_all(self, endpoints, levels):
+        results = []
+        for endpoint in endpoints:
+            for clients in levels:
+                for variant, prefix in (('sync', '/api/'), ('async', '/api/async/')):
+                    results.append(await self._run_level(variant, prefix + endpoint, endpoint, clients))
+        return results
+
+    async def _run_level(self, variant, path, endpoint, clients):
+        started = time.perf_counter()
+        slow = [asyncio.create_task(self._request(path, slow=True)) for _ in range(clients)]
+        # A well-behaved client arriving while the slow ones are in flight.
+        await asyncio.sleep(min(0.1, self.trickle / 2))
+        probe = await self._request(path, slow=False)
+        outcomes = await asyncio.gather(*slow)
+        wall = time.perf_counter() - started
+
+        latencies = sorted(latency for ok, latency in outcomes if ok)
+        return {
+            'variant': variant,
+            'endpoint': endpoint,
+            'clients': clients,
+            'wall_seconds': wall,
+            'requests_per_second': len(latencies) / wall if wall else 0.0,
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+            'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] * 1000 if latencies else 0.0,
+            'probe_ms': probe[1] * 1000,
+            'errors': clients - len(latencies),
+        }
+
+    async def _request(self, path, slow):
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Authorization: Bearer {self.token}\r\nConnection: close\r\n\r\n"
+        ).encode()
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            if slow:
+                # Send the request in a few pieces spread over half the trickle time.
+                pieces = 5
+                step = max(1, len(request) // pieces)
+                for offset in range(0, len(request), step):
+                    writer.write(request[offset:offset + step])
+                    await writer.drain()
+                    await asyncio.sleep(self.trickle / 2 / pieces)
+            else:
+                writer.write(request)
+                await writer.drain()
+
+            status_line = await reader.readline()
+            while True:
+                chunk = await reader.read(1024 if slow else 65536)
+                if not chunk:
+                    break
+                if slow:
+                    await asyncio.sleep(self.trickle / 2 / 20)
+            writer.close()
+            ok = status_line.split()[1:2] == [b'200']
+        except OSError:
+            ok = False
+        return ok, time.perf_counter() - started
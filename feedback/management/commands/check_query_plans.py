@@ -0,0 +1,156 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from feedback.exports import SUBMISSION_FIELDS
+from feedback.filters import filter_feedback_submissions
+from feedback.models import Designation, FeedbackAnswer, FeedbackQuestion, FeedbackSubmission
+
+# Tables that grow with usage. A plan step that scans one of them is a
+# regression unless it reads a covering index under a LIMIT, or the query
+# lists that exact step as expected.
+HOT_TABLES = ('feedback_feedbacksubmission', 'feedback_feedbackanswer')
+
+# Newest-first pages walk the created_at index and stop at the LIMIT.
+NEWEST_FIRST_WALK = 'SCAN feedback_feedbacksubmission USING INDEX submission_created_idx'
+
+PAGE = 51
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN on the querysets behind each feedback endpoint "
+        "and fail if any of them does a full scan of a feedback table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help="Insert this many throwaway submissions (rolled back afterwards) and ANALYZE before explaining."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("check_query_plans only understands SQLite query plans.")
+
+        failures = []
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self._seed(options['seed'])
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE')
+                failures = self._explain_all()
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"{len(failures)} queryset(s) fall back to a full table scan: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All endpoint query plans use indexes."))
+
+    def _querysets(self):
+        """(name, queryset, scan steps expected in its plan) for every endpoint query."""
+        now = timezone.now()
+        cursor = Q(created_at__lt=now) | Q(created_at=now, id__lt=10 ** 9)
+        dates = {'start_date': (now - timedelta(days=30)).date().isoformat(), 'end_date': now.date().isoformat()}
+        submissions = FeedbackSubmission.objects.all()
+        answers = FeedbackAnswer.objects.all()
+
+        yield 'my-feedback', submissions.filter(submitted_by_id=1).order_by('-created_at', '-id')[:PAGE], ()
+        yield 'my-feedback (cursor)', (
+            submissions.filter(submitted_by_id=1).filter(cursor, created_at__lte=now)
+            .order_by('-created_at', '-id')[:PAGE]
+        ), ()
+        yield 'admin-filter', submissions.order_by('-created_at', '-id')[:PAGE], (NEWEST_FIRST_WALK,)
+        yield 'admin-filter (cursor)', (
+            submissions.filter(cursor, created_at__lte=now).order_by('-created_at', '-id')[:PAGE]
+        ), ()
+        yield 'admin-filter (dates)', (
+            filter_feedback_submissions(submissions, dates).order_by('-created_at', '-id')[:PAGE]
+        ), ()
+        yield 'admin-filter (designation id)', (
+            filter_feedback_submissions(submissions, {'designation': '1'}).order_by('-created_at', '-id')[:PAGE]
+        ), (NEWEST_FIRST_WALK,)
+        yield 'admin-filter (designation name)', (
+            filter_feedback_submissions(submissions, {'designation': 'eng'}).order_by('-created_at', '-id')[:PAGE]
+        ), (NEWEST_FIRST_WALK,)
+        yield 'admin-filter (department)', (
+            filter_feedback_submissions(submissions, {'department': 'dept'}).order_by('-created_at', '-id')[:PAGE]
+        ), (NEWEST_FIRST_WALK,)
+        yield 'admin-filter (low rated)', (
+            filter_feedback_submissions(submissions, {'max_average_rating': 2}).order_by('-created_at', '-id')[:PAGE]
+        ), (NEWEST_FIRST_WALK,)
+        yield 'admin-filter answers prefetch', answers.filter(submission_id__in=range(1, PAGE)), ()
+        yield 'admin-export', (
+            filter_feedback_submissions(submissions, dates).order_by('created_at', 'id').values(*SUBMISSION_FIELDS)
+        ), ()
+        yield 'admin-export answers', (
+            answers.filter(submission_id__in=range(1, 2000)).order_by('submission_id', 'id')
+        ), ()
+        yield 'admin-analytics (dates)', (
+            filter_feedback_submissions(answers, dates, prefix='submission__')
+            .values_list('question_id', 'rating').annotate(n=Count('id')).order_by()
+        ), ()
+        yield 'per-question stats', (
+            answers.filter(question_id=1).values_list('rating').annotate(n=Count('id')).order_by()
+        ), ()
+
+    def _explain_all(self):
+        failures = []
+        for name, qs, expected in self._querysets():
+            plan = qs.explain()
+            bad = [
+                line for line in plan.splitlines()
+                if self._is_full_scan(line.split(maxsplit=3)[-1], qs.query.is_sliced, expected)
+            ]
+            if bad:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FAIL {name}"))
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+            else:
+                self.stdout.write(f"ok   {name}")
+        return failures
+
+    def _is_full_scan(self, step, limited, expected):
+        for table in HOT_TABLES:
+            if step == f'SCAN {table}' or step.startswith(f'SCAN {table} '):
+                if step in expected:
+                    return False
+                return not (limited and step.startswith(f'SCAN {table} USING COVERING INDEX '))
+        return False
+
+    def _seed(self, count):
+        rng = random.Random(0)
+        designations = [Designation.objects.create(name=f'__plan_check_{i}') for i in range(5)]
+        employees = []
+        for i in range(max(10, count // 20)):
+            user = User.objects.create(username=f'__plan_check_{i}')
+            employee = user.employee_profile
+            employee.designation = rng.choice(designations)
+            employee.department = f'Dept {i % 7}'
+            employee.save()
+            employees.append(employee)
+        questions = [
+            FeedbackQuestion.objects.create(text=f'Plan check {i}', feedback_type='employee')
+            for i in range(10)
+        ]
+        submissions = FeedbackSubmission.objects.bulk_create([
+            FeedbackSubmission(submitted_by=rng.choice(employees), target_employee=rng.choice(employees))
+            for _ in range(count)
+        ])
+        FeedbackAnswer.objects.bulk_create([
+            FeedbackAnswer(submission=submission, question=question, rating=rng.randint(1, 5))
+            for submission in submissions
+            for question in questions
+        ], batch_size=5000)
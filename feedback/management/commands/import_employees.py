@@ -0,0 +1,166 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from feedback.catalogue import EMPLOYEES, bump_version
+from feedback.models import Designation, Employee, lookup_key
+
+
+def _read_rows(path, fmt):
+    with open(path, newline='', encoding='utf-8') as handle:
+        if fmt == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import users and employee profiles from CSV or JSONL. Columns: username, email, "
+        "password, first_name, last_name, designation (name), department, employee_code (optional)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Processes used to hash passwords.")
+        parser.add_argument('--create-designations', action='store_true',
+                            help="Create designations that do not exist yet instead of skipping the row.")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        fmt = options['format'] or ('jsonl' if path.suffix in ('.jsonl', '.ndjson') else 'csv')
+
+        self.create_designations = options['create_designations']
+        self.designations = {d.name_key: d for d in Designation.objects.all()}
+        self.seen_usernames = set()
+        self.seen_codes = set()
+
+        created = skipped = 0
+        started = time.monotonic()
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+            for batch in _batches(_read_rows(path, fmt), options['batch_size']):
+                try:
+                    batch_created, batch_skipped = self._import_batch(batch, pool)
+                except CommandError as exc:
+                    raise CommandError(
+                        f"{exc} {created} employees were imported before the failure; "
+                        f"running the import again skips them."
+                    ) from exc
+                created += batch_created
+                skipped += batch_skipped
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{created} created, {skipped} skipped ({created / elapsed if elapsed else 0:.0f} rows/s)"
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} employees, skipped {skipped}."))
+
+    def _import_batch(self, rows, pool):
+        usernames = [(row.get('username') or '').strip() for row in rows]
+        existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        codes = [(row.get('employee_code') or '').strip() or None for row in rows]
+        taken_codes = set(
+            Employee.objects.filter(employee_code__in=[code for code in codes if code])
+            .values_list('employee_code', flat=True)
+        )
+
+        accepted = []
+        for username, code, row in zip(usernames, codes, rows):
+            if not username or username in existing or username in self.seen_usernames:
+                continue
+            if code and (code in taken_codes or code in self.seen_codes):
+                self.stderr.write(f"Skipping {username}: employee_code {code!r} is already in use")
+                continue
+            designation = self._designation(row.get('designation'))
+            if designation is False:
+                self.stderr.write(f"Skipping {username}: unknown designation {row.get('designation')!r}")
+                continue
+            self.seen_usernames.add(username)
+            if code:
+                self.seen_codes.add(code)
+            accepted.append((username, code, row, designation))
+
+        hashes = self._hash_passwords(pool, accepted)
+
+        users = [
+            User(
+                username=username,
+                email=row.get('email') or '',
+                first_name=row.get('first_name') or '',
+                last_name=row.get('last_name') or '',
+                password=password_hash,
+            )
+            for (username, _, row, _), password_hash in zip(accepted, hashes)
+        ]
+
+        with transaction.atomic():
+            # bulk_create skips post_save, so create_employee_profile does not run.
+            User.objects.bulk_create(users)
+            employees = [
+                Employee(
+                    user=user,
+                    designation=designation,
+                    department=(row.get('department') or '').strip(),
+                    employee_code=code,
+                )
+                for user, (_, code, row, designation) in zip(users, accepted)
+            ]
+            Employee.assign_codes(employees)
+            Employee.assign_departments(employees)
+            Employee.objects.bulk_create(employees)
+            bump_version(EMPLOYEES)
+
+        return len(users), len(rows) - len(users)
+
+    def _hash_passwords(self, pool, accepted):
+        passwords = [row.get('password') or None for _, _, row, _ in accepted]
+        try:
+            return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // 32)))
+        except BrokenProcessPool as exc:
+            raise CommandError(f"A password hashing worker process died ({exc}).") from exc
+        except Exception as exc:
+            # pool.map re-raises the worker's exception without saying which row caused it.
+            raise CommandError(
+                f"Hashing passwords for the batch from {accepted[0][0]!r} to {accepted[-1][0]!r} failed: {exc!r}."
+            ) from exc
+
+    def _designation(self, name):
+        """Designation for `name`, None if blank, False if unknown and not creatable."""
+        name = (name or '').strip()
+        if not name:
+            return None
+        designation = self.designations.get(lookup_key(name))
+        if designation is None:
+            if not self.create_designations:
+                return False
+            designation = Designation.objects.create(name=name)
+            self.designations[designation.name_key] = designation
+        return designation
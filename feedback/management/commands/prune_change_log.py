@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from feedback.models import FeedbackChange
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete change feed entries older than --days (FEEDBACK_CHANGE_LOG_RETENTION_DAYS by default). "
+        "The newest entry is always kept, so the feed can tell expired cursors apart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Keep entries from the last N days.")
+        parser.add_argument('--batch-size', type=int, default=10000, help="Entries deleted per transaction.")
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.FEEDBACK_CHANGE_LOG_RETENTION_DAYS
+        if days < 0:
+            raise CommandError("--days cannot be negative.")
+        cutoff = timezone.now() - timedelta(days=days)
+
+        newest = FeedbackChange.objects.order_by('-id').values_list('id', flat=True).first()
+        if newest is None:
+            self.stdout.write("The change log is empty.")
+            return
+        # Ids increase with time, so everything before the first recent entry is old.
+        keep_from = (
+            FeedbackChange.objects.filter(created_at__gte=cutoff).order_by('id').values_list('id', flat=True).first()
+        )
+        keep_from = min(keep_from or newest, newest)
+
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    FeedbackChange.objects.filter(id__lt=keep_from).order_by('id')
+                    .values_list('id', flat=True)[:options['batch_size']]
+                )
+                if not batch:
+                    break
+                FeedbackChange.objects.filter(id__gte=batch[0], id__lte=batch[-1]).delete()
+            deleted += len(batch)
+            self.stdout.write(f"Deleted {deleted} entries.")
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} change log entries older than {cutoff:%Y-%m-%d %H:%M}."))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from feedback.archive import archive_watermark, start_of_day
+from feedback.models import FeedbackAnswer, FeedbackRatingRollup
+from feedback.rollups import rollup_aggregates_from_answers
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the rating rollup table from FeedbackAnswer rows. Days already moved to the "
+        "archive (see archive_feedback) have no live answers, so their rollups are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+
+        rollups = FeedbackRatingRollup.objects.all()
+        answers = FeedbackAnswer.objects.all()
+        watermark = archive_watermark()
+        if watermark:
+            rollups = rollups.filter(day__gte=watermark)
+            answers = answers.filter(submission__created_at__gte=start_of_day(watermark))
+
+        with transaction.atomic():
+            rollups.delete()
+
+            batch = []
+            for row in rollup_aggregates_from_answers(answers).iterator(chunk_size=batch_size):
+                batch.append(FeedbackRatingRollup(
+                    target_employee_id=row.pop('submission__target_employee_id'),
+                    question_id=row.pop('question_id'),
+                    **row,
+                ))
+                if len(batch) >= batch_size:
+                    FeedbackRatingRollup.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                FeedbackRatingRollup.objects.bulk_create(batch)
+                total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} rollup rows."))
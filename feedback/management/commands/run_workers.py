@@ -0,0 +1,52 @@
+import multiprocessing
+import signal
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from feedback.jobs import HEARTBEAT_SECONDS, work, worker_name
+
+
+def _worker_main(poll_interval, stale_after, once, stop):
+    django.setup()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    work(worker_name(), poll_interval=poll_interval, stale_after=stale_after, once=once, stop=stop)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background job workers. Each worker process claims queued jobs from the "
+        "database and runs them; stop with Ctrl-C or SIGTERM after the current jobs finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="Number of worker processes.")
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Seconds an idle worker waits before checking the queue again.")
+        parser.add_argument('--stale-after', type=float, default=300,
+                            help="Requeue running jobs whose worker has not sent a heartbeat for this many "
+                                 f"seconds (0 disables). Workers beat every {HEARTBEAT_SECONDS:g} seconds while a job runs.")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        ctx = multiprocessing.get_context()
+        stop = ctx.Event()
+        args = (options['poll_interval'], options['stale_after'], options['once'], stop)
+
+        def request_stop(signum, frame):
+            self.stdout.write("Stopping after the current jobs finish...")
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        # Connections must not be shared with forked workers.
+        connections.close_all()
+        processes = [ctx.Process(target=_worker_main, args=args) for _ in range(max(1, options['workers']))]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {len(processes)} worker(s).")
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
@@ -0,0 +1,180 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from feedback.catalogue import DESIGNATIONS, EMPLOYEES, QUESTIONS, bump_version
+from feedback.changes import log_created
+from feedback.models import Designation, Employee, FeedbackAnswer, FeedbackQuestion, FeedbackSubmission, lookup_key
+
+COMMENT_WORDS = (
+    'clear', 'helpful', 'patient', 'onboarding', 'communication', 'deadline', 'review', 'mentoring',
+    'documentation', 'testing', 'ownership', 'responsive', 'meetings', 'planning', 'quality',
+    'feedback', 'support', 'training', 'pace', 'examples', 'friendly', 'late', 'unclear', 'great',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a reproducible synthetic dataset (designations, employees, questions, "
+        "submissions and answers) for load testing. Rows are appended; run on an empty database "
+        "for comparable benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--designations', type=int, default=20)
+        parser.add_argument('--departments', type=int, default=12)
+        parser.add_argument('--questions', type=int, default=20, help="Split evenly between feedback types.")
+        parser.add_argument('--submissions', type=int, default=10000)
+        parser.add_argument('--answers-per-submission', type=int, default=5)
+        parser.add_argument('--comment-ratio', type=float, default=0.4,
+                            help="Share of answers that carry a comment.")
+        parser.add_argument('--days', type=int, default=365, help="Spread submissions over this many past days.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Submissions written per transaction.")
+        parser.add_argument('--password', default='password123', help="Password for every generated user.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--skip-change-log', action='store_true',
+                            help="Do not write change feed entries for the generated feedback (faster).")
+
+    def handle(self, *args, **options):
+        if options['employees'] < 1 or options['questions'] < 2:
+            raise CommandError("Need at least one employee and two questions.")
+        self.random = random.Random(options['seed'])
+        self.run_id = f"{options['seed']}{int(time.time()) % 100000}"
+        started = time.monotonic()
+
+        designations = self._seed_designations(options['designations'])
+        departments = [f"Department {n}" for n in range(1, options['departments'] + 1)]
+        employee_ids = self._seed_employees(options['employees'], designations, departments, options['password'])
+        questions = self._seed_questions(options['questions'])
+        answers = self._seed_submissions(employee_ids, questions, options)
+        # Generated answers spread over nearly every (target, question, day),
+        # so one aggregate rebuild is far cheaper than incremental updates.
+        call_command('rebuild_rating_rollups', stdout=self.stdout)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(employee_ids)} employees, {sum(map(len, questions.values()))} questions, "
+            f"{options['submissions']} submissions and {answers} answers in {elapsed:.1f}s."
+        ))
+
+    def _seed_designations(self, count):
+        names = [f"Designation {n}" for n in range(1, count + 1)]
+        Designation.objects.bulk_create([Designation(name=name, name_key=lookup_key(name)) for name in names], ignore_conflicts=True)
+        bump_version(DESIGNATIONS)
+        return list(Designation.objects.filter(name__in=names))
+
+    def _seed_employees(self, count, designations, departments, password):
+        # Every user shares one hash: hashing per user would dominate the run.
+        hashed = make_password(password)
+        ids = []
+        for offset in range(0, count, 5000):
+            size = min(5000, count - offset)
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(
+                        username=f"seed{self.run_id}_{offset + n}",
+                        email=f"seed{self.run_id}_{offset + n}@example.com",
+                        first_name=f"First{offset + n}",
+                        last_name=f"Last{offset + n}",
+                        password=hashed,
+                    )
+                    for n in range(size)
+                ])
+                employees = [
+                    Employee(
+                        user=user,
+                        designation=self.random.choice(designations) if designations else None,
+                        department=self.random.choice(departments) if departments else '',
+                    )
+                    for user in users
+                ]
+                Employee.assign_codes(employees)
+                Employee.assign_departments(employees)
+                ids.extend(employee.id for employee in Employee.objects.bulk_create(employees))
+                bump_version(EMPLOYEES)
+            self.stdout.write(f"{len(ids)} employees")
+        return ids
+
+    def _seed_questions(self, count):
+        types = [value for value, _ in FeedbackQuestion.FEEDBACK_TYPE_CHOICES]
+        questions = FeedbackQuestion.objects.bulk_create([
+            FeedbackQuestion(
+                text=f"Seed question {n}: how would you rate {self.random.choice(COMMENT_WORDS)}?",
+                feedback_type=types[n % len(types)],
+                order=n,
+            )
+            for n in range(count)
+        ])
+        # bulk_create skips the signal that invalidates cached catalogues.
+        bump_version(QUESTIONS)
+        by_type = {}
+        for question in questions:
+            by_type.setdefault(question.feedback_type, []).append(question.id)
+        return by_type
+
+    def _comment(self):
+        return ' '.join(self.random.choices(COMMENT_WORDS, k=self.random.randint(3, 12)))
+
+    def _seed_submissions(self, employee_ids, questions, options):
+        rng = self.random
+        question_sets = list(questions.values())
+        per_submission = options['answers_per_submission']
+        comment_ratio = options['comment_ratio']
+        now = timezone.now()
+        span = options['days'] * 86400
+        # Give each target a typical rating so scorecards are not all identical.
+        bias = {employee_id: rng.uniform(-1.5, 1.5) for employee_id in employee_ids}
+
+        total = options['submissions']
+        written = answers_written = 0
+        started = time.monotonic()
+        while written < total:
+            size = min(options['batch_size'], total - written)
+            with transaction.atomic():
+                submissions = []
+                created_at = []
+                answers = []
+                for _ in range(size):
+                    submission = FeedbackSubmission(
+                        submitted_by_id=rng.choice(employee_ids),
+                        target_employee_id=rng.choice(employee_ids),
+                    )
+                    created_at.append(now - timedelta(seconds=rng.randrange(span or 1)))
+                    question_ids = rng.choice(question_sets)
+                    centre = 3.5 + bias[submission.target_employee_id]
+                    submission_answers = [
+                        FeedbackAnswer(
+                            submission=submission,
+                            question_id=question_id,
+                            rating=min(5, max(1, round(rng.gauss(centre, 1.0)))),
+                            comment=self._comment() if rng.random() < comment_ratio else '',
+                        )
+                        for question_id in rng.sample(question_ids, min(per_submission, len(question_ids)))
+                    ]
+                    submission.summarize(submission_answers)
+                    submissions.append(submission)
+                    answers.extend(submission_answers)
+                FeedbackSubmission.objects.bulk_create(submissions)
+                # auto_now_add stamped every row with now(); store the generated times instead.
+                for submission, value in zip(submissions, created_at):
+                    submission.created_at = value
+                FeedbackSubmission.objects.bulk_update(submissions, ['created_at'], batch_size=1000)
+                FeedbackAnswer.objects.bulk_create(answers)
+                if not options['skip_change_log']:
+                    log_created(submissions, answers)
+            written += size
+            answers_written += len(answers)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"{written}/{total} submissions, {answers_written} answers "
+                f"({answers_written / elapsed if elapsed else 0:.0f} answers/s)"
+            )
+        return answers_written
@@ -0,0 +1,295 @@
+"""
+Per-view request metrics with a Prometheus text exposition.
+
+MetricsMiddleware times each request and, through a database execute
+wrapper installed on every connection, counts the SQL it runs. Each thread
+records into its own shard, so the hot path takes no locks; shards are only
+merged when /api/metrics is scraped. When a thread exits, its shard is
+folded into a base shard, so short-lived threads do not pile up shards. Queries slower than
+FEEDBACK_SLOW_QUERY_SECONDS are logged to the 'feedback.slow_queries' logger
+with the calling view and kept in a bounded in-memory log.
+"""
+import logging
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+RESPONSE_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+SLOW_QUERY_LOG_SIZE = 200
+
+logger = logging.getLogger('feedback.slow_queries')
+
+
+class _RequestRecord:
+    __slots__ = ('request', 'queries', 'query_seconds')
+
+    def __init__(self, request):
+        self.request = request
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+_current = ContextVar('feedback_metrics_request', default=None)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else '<unmatched>'
+
+
+class _ViewStats:
+    __slots__ = (
+        'count', 'duration_sum', 'duration_buckets', 'queries', 'query_seconds', 'query_buckets',
+        'response_bytes', 'response_sized', 'response_buckets', 'statuses',
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.duration_sum = 0.0
+        self.duration_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.query_buckets = [0] * (len(QUERY_COUNT_BUCKETS) + 1)
+        self.response_bytes = 0
+        self.response_sized = 0
+        self.response_buckets = [0] * (len(RESPONSE_SIZE_BUCKETS) + 1)
+        self.statuses = {}
+
+    def merge(self, other):
+        self.count += other.count
+        self.duration_sum += other.duration_sum
+        self.queries += other.queries
+        self.query_seconds += other.query_seconds
+        self.response_bytes += other.response_bytes
+        self.response_sized += other.response_sized
+        for mine, theirs in (
+            (self.duration_buckets, other.duration_buckets),
+            (self.query_buckets, other.query_buckets),
+            (self.response_buckets, other.response_buckets),
+        ):
+            for index, value in enumerate(theirs):
+                mine[index] += value
+        for status, value in list(other.statuses.items()):
+            self.statuses[status] = self.statuses.get(status, 0) + value
+
+
+class _Shard:
+    """Counters written by exactly one thread."""
+
+    def __init__(self):
+        self.views = {}
+        self.slow_queries = 0
+
+
+class _ShardOwner:
+    """Lives in a thread's local data; its finalizer retires the thread's shard."""
+
+
+def _merge_shard(target, shard):
+    target.slow_queries += shard.slow_queries
+    for key, stats in list(shard.views.items()):
+        target.views.setdefault(key, _ViewStats()).merge(stats)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        # Reentrant: a shard can be retired by the garbage collector at any point.
+        self._shards_lock = threading.RLock()
+        # Totals of threads that have exited; only touched under _shards_lock.
+        self._retired = _Shard()
+        self.slow_query_log = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            # The thread-local data, and with it this owner, is released when the thread exits.
+            owner = self._local.owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, shard)
+            # Taken once per thread, never on the request path afterwards.
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _retire(self, shard):
+        """Fold the shard of an exited thread into the retired totals."""
+        with self._shards_lock:
+            self._shards.remove(shard)
+            _merge_shard(self._retired, shard)
+
+    def observe_request(self, view, method, status, duration, record, response_bytes):
+        views = self._shard().views
+        stats = views.get((view, method))
+        if stats is None:
+            stats = views[(view, method)] = _ViewStats()
+        stats.count += 1
+        stats.duration_sum += duration
+        stats.duration_buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        stats.queries += record.queries
+        stats.query_seconds += record.query_seconds
+        stats.query_buckets[bisect_left(QUERY_COUNT_BUCKETS, record.queries)] += 1
+        if response_bytes is not None:
+            stats.response_bytes += response_bytes
+            stats.response_sized += 1
+            stats.response_buckets[bisect_left(RESPONSE_SIZE_BUCKETS, response_bytes)] += 1
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def observe_slow_query(self, view, alias, sql, duration):
+        self._shard().slow_queries += 1
+        entry = {
+            'at': time.time(),
+            'view': view,
+            'database': alias,
+            'duration_ms': round(duration * 1000, 3),
+            'sql': sql,
+        }
+        self.slow_query_log.append(entry)
+        logger.warning("Slow query (%.1f ms) in %s on %s: %s", duration * 1000, view, alias, sql)
+
+    def snapshot(self):
+        """Merge every thread's shard into ({(view, method): _ViewStats}, slow query count)."""
+        merged = _Shard()
+        with self._shards_lock:
+            shards = list(self._shards)
+            _merge_shard(merged, self._retired)
+        for shard in shards:
+            _merge_shard(merged, shard)
+        return merged.views, merged.slow_queries
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)."""
+        views, slow_queries = self.snapshot()
+        lines = []
+
+        def header(name, kind, text):
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, labels, bounds, buckets, total, count):
+            cumulative = 0
+            for bound, value in zip(bounds, buckets):
+                cumulative += value
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {total}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+
+        ordered = sorted(views.items())
+
+        header('feedback_http_requests_total', 'counter', 'Requests handled, by view, method and status.')
+        for (view, method), stats in ordered:
+            for status, value in sorted(stats.statuses.items()):
+                lines.append(
+                    f'feedback_http_requests_total{{{_labels(view, method)},status="{status}"}} {value}'
+                )
+
+        header('feedback_http_request_duration_seconds', 'histogram', 'Time spent in Django per request.')
+        for (view, method), stats in ordered:
+            histogram('feedback_http_request_duration_seconds', _labels(view, method), LATENCY_BUCKETS,
+                      stats.duration_buckets, stats.duration_sum, stats.count)
+
+        header('feedback_db_queries_per_request', 'histogram', 'SQL queries executed per request.')
+        for (view, method), stats in ordered:
+            histogram('feedback_db_queries_per_request', _labels(view, method), QUERY_COUNT_BUCKETS,
+                      stats.query_buckets, stats.queries, stats.count)
+
+        header('feedback_db_query_duration_seconds_total', 'counter', 'Time spent executing SQL.')
+        for (view, method), stats in ordered:
+            lines.append(f"feedback_db_query_duration_seconds_total{{{_labels(view, method)}}} {stats.query_seconds}")
+
+        header('feedback_http_response_size_bytes', 'histogram', 'Response body size (streamed responses excluded).')
+        for (view, method), stats in ordered:
+            histogram('feedback_http_response_size_bytes', _labels(view, method), RESPONSE_SIZE_BUCKETS,
+                      stats.response_buckets, stats.response_bytes, stats.response_sized)
+
+        header('feedback_db_slow_queries_total', 'counter', 'Queries slower than FEEDBACK_SLOW_QUERY_SECONDS.')
+        lines.append(f"feedback_db_slow_queries_total {slow_queries}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(view, method):
+    return f'view="{_escape(view)}",method="{method}"'
+
+
+registry = MetricsRegistry()
+
+
+def _record_queries(execute, sql, params, many, context):
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        record.queries += 1
+        record.query_seconds += elapsed
+        if elapsed >= settings.FEEDBACK_SLOW_QUERY_SECONDS:
+            registry.observe_slow_query(_view_name(record.request), context['connection'].alias, sql, elapsed)
+
+
+def _install_execute_wrapper(sender, connection, **kwargs):
+    # Connections are reopened per request, but the wrapper object survives on them.
+    if _record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_queries)
+
+
+connection_created.connect(_install_execute_wrapper, dispatch_uid='feedback_metrics_execute_wrapper')
+
+
+class MetricsMiddleware:
+    """Place first in MIDDLEWARE so the timing covers the whole stack."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        record = _RequestRecord(request)
+        token = _current.set(record)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._observe(request, response, record, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        record = _RequestRecord(request)
+        token = _current.set(record)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._observe(request, response, record, time.perf_counter() - started)
+        return response
+
+    def _observe(self, request, response, record, duration):
+        size = None if response.streaming else len(response.content)
+        registry.observe_request(
+            _view_name(request), request.method, response.status_code, duration, record, size,
+        )
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:11
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0002_alter_employee_employee_code_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="feedbackanswer",
+            name="rating",
+            field=models.PositiveSmallIntegerField(
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(5),
+                ]
+            ),
+        ),
+        migrations.CreateModel(
+            name="FeedbackRatingRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("answer_count", models.PositiveIntegerField(default=0)),
+                ("rating_sum", models.PositiveBigIntegerField(default=0)),
+                ("rating_sq_sum", models.PositiveBigIntegerField(default=0)),
+                ("rating_1", models.PositiveIntegerField(default=0)),
+                ("rating_2", models.PositiveIntegerField(default=0)),
+                ("rating_3", models.PositiveIntegerField(default=0)),
+                ("rating_4", models.PositiveIntegerField(default=0)),
+                ("rating_5", models.PositiveIntegerField(default=0)),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rating_rollups",
+                        to="feedback.feedbackquestion",
+                    ),
+                ),
+                (
+                    "target_employee",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rating_rollups",
+                        to="feedback.employee",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["question", "day"], name="rollup_question_day_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("target_employee", "question", "day"),
+                        name="unique_rating_rollup",
+                    )
+                ],
+            },
+        ),
+    ]
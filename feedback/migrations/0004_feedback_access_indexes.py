@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0003_feedback_rating_rollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedbackanswer",
+            index=models.Index(
+                fields=["question", "rating"], name="answer_question_rating_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedbacksubmission",
+            index=models.Index(
+                fields=["created_at", "id"], name="submission_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedbacksubmission",
+            index=models.Index(
+                fields=["submitted_by", "created_at", "id"],
+                name="submission_by_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# External-content FTS5 index over FeedbackAnswer.comment. Triggers keep it in
+# sync with every insert/update/delete, including bulk_create and cascades.
+# Note: SQLite table rebuilds (AlterField on feedbackanswer) drop these
+# triggers; re-run the forward SQL after such a migration.
+FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS feedback_answer_fts USING fts5(
+        comment,
+        content='feedback_feedbackanswer',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedback_answer_fts_ai AFTER INSERT ON feedback_feedbackanswer BEGIN
+        INSERT INTO feedback_answer_fts(rowid, comment) VALUES (new.id, new.comment);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedback_answer_fts_ad AFTER DELETE ON feedback_feedbackanswer BEGIN
+        INSERT INTO feedback_answer_fts(feedback_answer_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedback_answer_fts_au AFTER UPDATE OF comment ON feedback_feedbackanswer BEGIN
+        INSERT INTO feedback_answer_fts(feedback_answer_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+        INSERT INTO feedback_answer_fts(rowid, comment) VALUES (new.id, new.comment);
+    END
+    """,
+    "INSERT INTO feedback_answer_fts(feedback_answer_fts) VALUES ('rebuild')",
+]
+
+REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS feedback_answer_fts_au",
+    "DROP TRIGGER IF EXISTS feedback_answer_fts_ad",
+    "DROP TRIGGER IF EXISTS feedback_answer_fts_ai",
+    "DROP TABLE IF EXISTS feedback_answer_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0004_feedback_access_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FORWARD_SQL), _run(REVERSE_SQL)),
+    ]
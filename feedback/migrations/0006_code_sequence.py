@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:13
+
+import re
+
+from django.db import migrations, models
+
+
+def seed_employee_code_sequence(apps, schema_editor):
+    # Start after every code the old id-based scheme could have produced.
+    Employee = apps.get_model("feedback", "Employee")
+    CodeSequence = apps.get_model("feedback", "CodeSequence")
+    last_value = Employee.objects.aggregate(models.Max("id"))["id__max"] or 0
+    for code in Employee.objects.exclude(employee_code=None).values_list(
+        "employee_code", flat=True
+    ):
+        match = re.fullmatch(r"EMP(\d+)", code)
+        if match:
+            last_value = max(last_value, int(match.group(1)))
+    CodeSequence.objects.update_or_create(
+        name="employee_code", defaults={"last_value": last_value}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0005_feedback_answer_fts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CodeSequence",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("last_value", models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_employee_code_sequence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0008_background_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedbackArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("label", models.CharField(max_length=100, unique=True)),
+                ("before", models.DateField()),
+                ("first_created_at", models.DateTimeField()),
+                ("last_created_at", models.DateTimeField()),
+                ("submission_count", models.PositiveBigIntegerField()),
+                ("answer_count", models.PositiveBigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("purged_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
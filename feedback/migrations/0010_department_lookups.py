@@ -0,0 +1,84 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _lookup_key(name):
+    return " ".join((name or "").split()).casefold()
+
+
+def normalise_names(apps, schema_editor):
+    Designation = apps.get_model("feedback", "Designation")
+    Department = apps.get_model("feedback", "Department")
+    Employee = apps.get_model("feedback", "Employee")
+
+    designations = list(Designation.objects.all())
+    for designation in designations:
+        designation.name_key = _lookup_key(designation.name)
+    Designation.objects.bulk_update(designations, ["name_key"], batch_size=500)
+
+    # The first spelling seen (collapsed whitespace) names the department.
+    departments = {}
+    for name in (
+        Employee.objects.exclude(department="")
+        .values_list("department", flat=True)
+        .distinct()
+    ):
+        key = _lookup_key(name)
+        if key:
+            departments.setdefault(key, " ".join(name.split()))
+    Department.objects.bulk_create(
+        [Department(name=name, key=key) for key, name in departments.items()]
+    )
+    ids = dict(Department.objects.values_list("key", "id"))
+
+    employees = list(Employee.objects.exclude(department="").only("id", "department"))
+    for employee in employees:
+        employee.department_ref_id = ids.get(_lookup_key(employee.department))
+    Employee.objects.bulk_update(employees, ["department_ref"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0009_feedback_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Department",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("key", models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="designation",
+            name="name_key",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=100
+            ),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="department_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="employees",
+                to="feedback.department",
+            ),
+        ),
+        migrations.RunPython(normalise_names, migrations.RunPython.noop),
+    ]
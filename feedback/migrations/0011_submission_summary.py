@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:50
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_summaries(apps, schema_editor):
+    # One UPDATE with correlated subqueries per batch of submission ids.
+    FeedbackSubmission = apps.get_model("feedback", "FeedbackSubmission")
+    FeedbackAnswer = apps.get_model("feedback", "FeedbackAnswer")
+    answers = (
+        FeedbackAnswer.objects.filter(submission=OuterRef("pk"))
+        .order_by()
+        .values("submission")
+    )
+
+    def aggregate(function):
+        return Subquery(answers.annotate(value=function("rating")).values("value"))
+
+    expressions = {
+        "answer_count": Coalesce(aggregate(Count), Value(0)),
+        "rating_sum": Coalesce(aggregate(Sum), Value(0)),
+        "rating_min": aggregate(Min),
+        "rating_max": aggregate(Max),
+        "has_comment": Exists(
+            FeedbackAnswer.objects.filter(submission=OuterRef("pk")).exclude(comment="")
+        ),
+    }
+    last_id = FeedbackSubmission.objects.aggregate(last=Max("id"))["last"] or 0
+    for start in range(0, last_id, 5000):
+        FeedbackSubmission.objects.filter(id__gt=start, id__lte=start + 5000).update(
+            **expressions
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0010_department_lookups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feedbacksubmission",
+            name="answer_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="feedbacksubmission",
+            name="has_comment",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="feedbacksubmission",
+            name="rating_max",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="feedbacksubmission",
+            name="rating_min",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="feedbacksubmission",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
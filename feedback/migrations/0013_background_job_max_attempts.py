@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0012_feedback_change_log"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="backgroundjob",
+            name="max_attempts",
+            field=models.PositiveIntegerField(default=3),
+        ),
+    ]
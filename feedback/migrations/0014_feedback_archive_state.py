@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+def set_existing_states(apps, schema_editor):
+    # Rows written before states existed were only created once their files
+    # were in place.
+    FeedbackArchive = apps.get_model("feedback", "FeedbackArchive")
+    FeedbackArchive.objects.filter(purged_at__isnull=False).update(state="complete")
+    FeedbackArchive.objects.filter(purged_at__isnull=True).update(state="written")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0013_background_job_max_attempts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feedbackarchive",
+            name="state",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("written", "Written"),
+                    ("complete", "Complete"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="feedbackarchive",
+            name="answer_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="feedbackarchive",
+            name="first_created_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="feedbackarchive",
+            name="last_created_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="feedbackarchive",
+            name="submission_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(set_existing_states, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0014_feedback_archive_state"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="feedbackchange",
+            name="operation",
+            field=models.CharField(
+                choices=[
+                    ("create", "Create"),
+                    ("update", "Update"),
+                    ("delete", "Delete"),
+                    ("archive", "Archive"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
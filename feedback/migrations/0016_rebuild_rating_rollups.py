@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:27
+
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def rebuild_rollups(apps, schema_editor):
+    """
+    Recompute the rollups of live days from the answers: 0003 created the
+    table empty, and answers with no target could be counted in several
+    rows. Archived days have no answers left, so of their duplicate
+    no-target rows only the oldest, which saw every change, is kept.
+    """
+    from feedback.rollups import rollup_aggregates_from_answers
+
+    FeedbackAnswer = apps.get_model("feedback", "FeedbackAnswer")
+    FeedbackArchive = apps.get_model("feedback", "FeedbackArchive")
+    FeedbackRatingRollup = apps.get_model("feedback", "FeedbackRatingRollup")
+
+    rollups = FeedbackRatingRollup.objects.all()
+    answers = FeedbackAnswer.objects.all()
+    watermark = FeedbackArchive.objects.filter(
+        state__in=("written", "complete")
+    ).aggregate(before=Max("before"))["before"]
+    if watermark:
+        archived = rollups.filter(day__lt=watermark, target_employee__isnull=True)
+        keep = archived.values("question_id", "day").annotate(first=Min("id"))
+        archived.exclude(id__in=[row["first"] for row in keep]).delete()
+        rollups = rollups.filter(day__gte=watermark)
+        answers = answers.filter(submission__created_at__date__gte=watermark)
+
+    rollups.delete()
+    FeedbackRatingRollup.objects.bulk_create(
+        [
+            FeedbackRatingRollup(
+                target_employee_id=row.pop("submission__target_employee_id"),
+                question_id=row.pop("question_id"),
+                **row,
+            )
+            for row in rollup_aggregates_from_answers(answers)
+        ],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0015_feedback_change_update"),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_rollups, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="feedbackratingrollup",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("target_employee__isnull", True)),
+                fields=("question", "day"),
+                name="unique_rating_rollup_no_target",
+            ),
+        ),
+    ]
@@ -1,27 +1,152 @@
 
-from django.db import models
+from django.db import connection, models, transaction
 from django.contrib.auth.models import User
+from django.core.validators import MaxValueValidator, MinValueValidator
+
+def lookup_key(name):
+    """Case-folded, whitespace-collapsed form used for indexed name lookups."""
+    return ' '.join((name or '').split()).casefold()
+
+
+def prefix_range(lookup, prefix):
+    """Filter kwargs matching keys that start with `prefix`, as an index-servable range."""
+    return {f'{lookup}__gte': prefix, f'{lookup}__lt': prefix + '\U0010ffff'}
+
 
 class Designation(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    name_key = models.CharField(max_length=100, db_index=True, editable=False, default='')
+
+    def save(self, *args, **kwargs):
+        self.name_key = lookup_key(self.name)
+        if kwargs.get('update_fields') is not None and 'name' in kwargs['update_fields']:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'name_key'}
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+class Department(models.Model):
+    """
+    Normalised department. Employee.department keeps the text as entered;
+    Employee.department_ref points here, so "Engineering" and "engineering "
+    are one department and filters can seek on the unique `key`.
+    """
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)
+
+    @classmethod
+    def for_names(cls, names):
+        """{key: Department} for the given names, creating missing ones in bulk."""
+        wanted = {}
+        for name in names:
+            key = lookup_key(name)
+            if key:
+                wanted.setdefault(key, ' '.join(name.split()))
+        if not wanted:
+            return {}
+        found = {department.key: department for department in cls.objects.filter(key__in=list(wanted))}
+        missing = [cls(name=name, key=key) for key, name in wanted.items() if key not in found]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            found.update(
+                (department.key, department)
+                for department in cls.objects.filter(key__in=[department.key for department in missing])
+            )
+        return found
 
     def __str__(self):
         return self.name
 
+class CodeSequence(models.Model):
+    """
+    Named counter handing out unique numbers. A single UPDATE ... RETURNING
+    reserves a whole block, so concurrent callers never receive the same
+    value and bulk inserts cost one statement per block instead of per row.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_value}"
+
+    @classmethod
+    def allocate(cls, name, count=1):
+        """Reserve `count` consecutive values and return them as a range."""
+        sql = f"UPDATE {cls._meta.db_table} SET last_value = last_value + %s WHERE name = %s RETURNING last_value"
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [count, name])
+                row = cursor.fetchone()
+                if row is None:
+                    cls.objects.get_or_create(name=name)
+                    cursor.execute(sql, [count, name])
+                    row = cursor.fetchone()
+        last = row[0]
+        return range(last - count + 1, last + 1)
+
+
+class CatalogueVersion(models.Model):
+    """
+    Change counter per cached catalogue (e.g. 'questions'), bumped in the
+    same transaction as every save/delete so all worker processes can tell
+    when their in-memory copies are stale.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+EMPLOYEE_CODE_SEQUENCE = 'employee_code'
+
+
+def format_employee_code(number):
+    return f"EMP{number:04d}"
+
+
 class Employee(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='employee_profile')
     designation = models.ForeignKey(Designation, on_delete=models.SET_NULL, null=True, blank=True)
     department = models.CharField(max_length=100, blank=True)
+    department_ref = models.ForeignKey(
+        Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='employees'
+    )
     employee_code = models.CharField(max_length=50, blank=True, null=True, unique=True)
 
     def save(self, *args, **kwargs):
-       
         if not self.employee_code:
-            last_employee = Employee.objects.order_by('-id').first()
-            next_id = 1 if not last_employee else last_employee.id + 1
-            self.employee_code = f"EMP{next_id:04d}"  
+            Employee.assign_codes([self])
+        Employee.assign_departments([self])
+        if kwargs.get('update_fields') is not None and 'department' in kwargs['update_fields']:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'department_ref'}
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def assign_departments(employees):
+        """Point every employee's department_ref at the Department for its department text."""
+        stale = [
+            employee for employee in employees
+            if not (
+                Employee.department_ref.is_cached(employee)
+                and (employee.department_ref.key if employee.department_ref else '') == lookup_key(employee.department)
+            )
+        ]
+        departments = Department.for_names(employee.department for employee in stale)
+        for employee in stale:
+            employee.department_ref = departments.get(lookup_key(employee.department))
+
+    @staticmethod
+    def assign_codes(employees):
+        """Give every employee without a code one, reserving them as a single block."""
+        missing = [employee for employee in employees if not employee.employee_code]
+        if not missing:
+            return
+        numbers = CodeSequence.allocate(EMPLOYEE_CODE_SEQUENCE, len(missing))
+        for employee, number in zip(missing, numbers):
+            employee.employee_code = format_employee_code(number)
+
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} ({self.designation})"
 
@@ -45,16 +170,201 @@ class FeedbackSubmission(models.Model):
     submitted_by = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='submissions')
     target_employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='feedback_received', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    # Summary of the answers, written with them so listings and rating
+    # filters need no answer join (see summarize()).
+    answer_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_min = models.PositiveSmallIntegerField(null=True, blank=True)
+    rating_max = models.PositiveSmallIntegerField(null=True, blank=True)
+    has_comment = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # Listings page newest first on (created_at, id), optionally per submitter.
+            models.Index(fields=['created_at', 'id'], name='submission_created_idx'),
+            models.Index(fields=['submitted_by', 'created_at', 'id'], name='submission_by_created_idx'),
+        ]
 
     def __str__(self):
         return f"Submission {self.id} by {self.submitted_by}"
 
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.answer_count, 2) if self.answer_count else None
+
+    def summarize(self, answers):
+        """Fill the summary columns from this submission's FeedbackAnswer objects."""
+        ratings = [answer.rating for answer in answers]
+        self.answer_count = len(ratings)
+        self.rating_sum = sum(ratings)
+        self.rating_min = min(ratings, default=None)
+        self.rating_max = max(ratings, default=None)
+        self.has_comment = any(answer.comment for answer in answers)
+
 class FeedbackAnswer(models.Model):
     submission = models.ForeignKey(FeedbackSubmission, on_delete=models.CASCADE, related_name='answers')
     question = models.ForeignKey(FeedbackQuestion, on_delete=models.CASCADE)
-    rating = models.PositiveSmallIntegerField()  
+    rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     comment = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['question', 'rating'], name='answer_question_rating_idx'),
+        ]
+
+    def __str__(self):
+        return f"Answer q:{self.question.id} rating:{self.rating}"
+
+class FeedbackRatingRollup(models.Model):
+    """
+    Running rating totals per (target employee, question, day).
+
+    Kept up to date in the same transaction that writes the answers, so
+    reports can read these rows instead of scanning FeedbackAnswer.
+    """
+    target_employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='rating_rollups', null=True, blank=True)
+    question = models.ForeignKey(FeedbackQuestion, on_delete=models.CASCADE, related_name='rating_rollups')
+    day = models.DateField()
+    answer_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveBigIntegerField(default=0)
+    rating_sq_sum = models.PositiveBigIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['target_employee', 'question', 'day'], name='unique_rating_rollup'),
+            # NULLs are distinct in the constraint above, so rows without a
+            # target need their own for adjust_rating_rollups' upsert.
+            models.UniqueConstraint(
+                fields=['question', 'day'], condition=models.Q(target_employee__isnull=True),
+                name='unique_rating_rollup_no_target',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['question', 'day'], name='rollup_question_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"Rollup {self.day} target:{self.target_employee_id} q:{self.question_id} n:{self.answer_count}"
+
+class BackgroundJob(models.Model):
+    """
+    A unit of heavy work (export, rollup rebuild, import) queued by an admin
+    and executed by `manage.py run_workers`. Workers claim rows with a
+    conditional UPDATE on status, so each job runs at most once at a time.
+    """
+    KIND_EXPORT = 'export'
+    KIND_REBUILD_ROLLUPS = 'rebuild_rollups'
+    KIND_IMPORT_EMPLOYEES = 'import_employees'
+    KIND_CHOICES = [
+        (KIND_EXPORT, 'Feedback export'),
+        (KIND_REBUILD_ROLLUPS, 'Rebuild rating rollups'),
+        (KIND_IMPORT_EMPLOYEES, 'Import employees'),
+    ]
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    params = models.JSONField(default=dict, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='background_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    # A job whose worker vanishes this many times is failed instead of requeued.
+    max_attempts = models.PositiveIntegerField(default=3)
+    progress = models.PositiveBigIntegerField(default=0)
+    total = models.PositiveBigIntegerField(null=True, blank=True)
+    message = models.TextField(blank=True)
+    result_file = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at', 'id'], name='job_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} {self.kind} ({self.status})"
+
+
+class FeedbackArchive(models.Model):
+    """
+    Submissions created before `before` that `manage.py archive_feedback`
+    moved out of the live tables into columnar files under
+    FEEDBACK_ARCHIVE_DIR/<label>/. Rollups for those days are kept.
+
+    The row is created `pending` before the files are written, becomes
+    `written` once they are in place (the counts and time span are then
+    known) and `complete` once the archived rows are deleted, so a run that
+    dies at any point can be reconciled by the next one.
+    """
+    STATE_PENDING = 'pending'
+    STATE_WRITTEN = 'written'
+    STATE_COMPLETE = 'complete'
+    STATE_CHOICES = [
+        (STATE_PENDING, 'Pending'),
+        (STATE_WRITTEN, 'Written'),
+        (STATE_COMPLETE, 'Complete'),
+    ]
+    # States whose files exist and can be read.
+    READABLE_STATES = (STATE_WRITTEN, STATE_COMPLETE)
+
+    label = models.CharField(max_length=100, unique=True)
+    before = models.DateField()
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default=STATE_PENDING)
+    first_created_at = models.DateTimeField(null=True, blank=True)
+    last_created_at = models.DateTimeField(null=True, blank=True)
+    submission_count = models.PositiveBigIntegerField(default=0)
+    answer_count = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set once every archived row has been deleted from the live tables.
+    purged_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Archive {self.label} ({self.submission_count} submissions before {self.before}, {self.state})"
+
+
+class FeedbackChange(models.Model):
+    """
+    Append-only log of submission and answer creations, updates and deletions,
+    written in the same transaction as the change itself (see
+    feedback.changes). The id is the change feed cursor position.
+    """
+    ENTITY_CHOICES = [
+        ('submission', 'Submission'),
+        ('answer', 'Answer'),
+    ]
+    OPERATION_CHOICES = [
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+        # Deleted from the live tables by archive_feedback; still in the archive.
+        ('archive', 'Archive'),
+    ]
+
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    operation = models.CharField(max_length=20, choices=OPERATION_CHOICES)
+    object_id = models.BigIntegerField()
+    submission_id = models.BigIntegerField()
+    data = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
     def __str__(self):
-        return f"Answer q:{self.question.id} rating:{self.rating}"
\ No newline at end of file
+        return f"Change {self.id}: {self.operation} {self.entity} {self.object_id}"
@@ -0,0 +1,127 @@
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class SubmissionCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    DRF's CursorPagination only filters on the first ordering field and
+    falls back to OFFSET for ties. Here the position carries the id as well,
+    so every position is unique and each page is a single index range seek,
+    no matter how deep the client pages.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Async counterpart of paginate_queryset, fetching the page with the async ORM."""
+        page_queryset = self.page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.set_page([row async for row in page_queryset])
+
+    def page_queryset(self, queryset, request):
+        """Decode the cursor and return the (lazy) queryset for this page plus one row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            _, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            created_at, pk = self._parse_position(current_position)
+            if reverse:
+                # created_at >= c AND (created_at > c OR id > pk)
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk),
+                    created_at__gte=created_at,
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk),
+                    created_at__lte=created_at,
+                )
+
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        """Keep the page out of `results` and work out the next/previous positions."""
+        reverse = bool(self.cursor and self.cursor.reverse)
+        current_position = self.cursor.position if self.cursor else None
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # Positions are unique, so the cursor never needs an offset.
+        position = self.next_position
+        if self.cursor and self.cursor.reverse and self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.previous_position
+        if self.cursor and not self.cursor.reverse and self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            created_at, pk = instance['created_at'], instance['id']
+        else:
+            created_at, pk = instance.created_at, instance.id
+        return f"{created_at.isoformat()}|{pk}"
+
+    def _parse_position(self, position):
+        try:
+            created_at, pk = position.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,114 @@
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import FeedbackAnswer, FeedbackRatingRollup
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+HISTOGRAM_FIELDS = tuple(f'rating_{value}' for value in RATING_VALUES)
+ROLLUP_FIELDS = ('answer_count', 'rating_sum', 'rating_sq_sum') + HISTOGRAM_FIELDS
+
+
+def _empty_delta():
+    return dict.fromkeys(ROLLUP_FIELDS, 0)
+
+
+def rollup_key(target_employee_id, question_id, created_at):
+    """The (target employee, question, day) rollup row an answer counts towards."""
+    return (target_employee_id, question_id, timezone.localdate(created_at))
+
+
+def _add_rating(deltas, key, rating, sign):
+    delta = deltas.setdefault(key, _empty_delta())
+    delta['answer_count'] += sign
+    delta['rating_sum'] += sign * rating
+    delta['rating_sq_sum'] += sign * rating * rating
+    if rating in RATING_VALUES:
+        delta[f'rating_{rating}'] += sign
+
+
+def update_rating_rollups(answers):
+    """
+    Add freshly written answers to the rollup table.
+
+    `answers` are FeedbackAnswer instances whose `submission` is loaded.
+    Must run inside the transaction that created them.
+    """
+    adjust_rating_rollups(added=[
+        (rollup_key(answer.submission.target_employee_id, answer.question_id, answer.submission.created_at), answer.rating)
+        for answer in answers
+    ])
+
+
+def adjust_rating_rollups(removed=(), added=()):
+    """
+    Take answers out of and add answers to the rollup table. Items are
+    (rollup_key(...), rating) pairs. Must run inside the transaction that
+    changed the answers. Costs three queries whatever the number of answers:
+    create missing rows, lock and read the affected rows, then write them
+    back; rows left without answers are deleted.
+    """
+    deltas = {}
+    for key, rating in removed:
+        _add_rating(deltas, key, rating, -1)
+    for key, rating in added:
+        _add_rating(deltas, key, rating, 1)
+    deltas = {key: delta for key, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+
+    FeedbackRatingRollup.objects.bulk_create(
+        [
+            FeedbackRatingRollup(target_employee_id=target_id, question_id=question_id, day=day)
+            for (target_id, question_id, day), delta in deltas.items()
+            if delta['answer_count'] > 0
+        ],
+        ignore_conflicts=True,
+    )
+
+    target_ids = {key[0] for key in deltas}
+    target_filter = Q(target_employee_id__in=[t for t in target_ids if t is not None])
+    if None in target_ids:
+        target_filter |= Q(target_employee__isnull=True)
+
+    rows = (
+        FeedbackRatingRollup.objects
+        .select_for_update()
+        .filter(target_filter)
+        .filter(question_id__in={key[1] for key in deltas}, day__in={key[2] for key in deltas})
+    )
+    changed = []
+    emptied = []
+    for row in rows:
+        delta = deltas.get((row.target_employee_id, row.question_id, row.day))
+        if delta is None:
+            continue
+        for field, value in delta.items():
+            setattr(row, field, max(0, getattr(row, field) + value))
+        (changed if row.answer_count else emptied).append(row)
+
+    FeedbackRatingRollup.objects.bulk_update(changed, ROLLUP_FIELDS)
+    if emptied:
+        FeedbackRatingRollup.objects.filter(pk__in=[row.pk for row in emptied]).delete()
+
+
+def rollup_aggregates_from_answers(qs=None):
+    """Grouped query computing rollup rows straight from FeedbackAnswer."""
+    if qs is None:
+        qs = FeedbackAnswer.objects.all()
+    histogram = {
+        f'rating_{value}': Count('id', filter=Q(rating=value))
+        for value in RATING_VALUES
+    }
+    return (
+        qs
+        .annotate(day=TruncDate('submission__created_at'))
+        .values('submission__target_employee_id', 'question_id', 'day')
+        .annotate(
+            answer_count=Count('id'),
+            rating_sum=Sum('rating'),
+            rating_sq_sum=Sum(F('rating') * F('rating')),
+            **histogram,
+        )
+        .order_by()
+    )
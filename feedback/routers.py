@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPORTING_DB_ALIAS = 'reporting'
+
+_reporting = ContextVar('feedback_reporting', default=False)
+
+
+def reporting_alias():
+    """Database alias heavy read-only work should use right now."""
+    if _reporting.get() and REPORTING_DB_ALIAS in connections.databases:
+        return REPORTING_DB_ALIAS
+    return DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def reporting():
+    """Route reads made inside the block to the read-only reporting database."""
+    token = _reporting.set(True)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def use_reporting_database(handler):
+    """Run a view handler with its reads routed to the reporting database."""
+    @wraps(handler)
+    def wrapped(*args, **kwargs):
+        with reporting():
+            return handler(*args, **kwargs)
+    return wrapped
+
+
+class ReportingRouter:
+    """
+    Sends reads made under `reporting()` to the 'reporting' alias (a
+    read-only connection to the live WAL database or to a snapshot file) so
+    long reports never hold or wait for the writer's lock. Everything else,
+    and every write, goes to 'default'.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = reporting_alias()
+        return alias if alias != DEFAULT_DB_ALIAS else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
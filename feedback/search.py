@@ -0,0 +1,89 @@
+from django.db import OperationalError, connections
+from rest_framework.exceptions import ValidationError
+
+from .filters import filter_feedback_submissions
+from .models import FeedbackAnswer
+from .routers import reporting_alias
+
+FTS_TABLE = 'feedback_answer_fts'
+
+RESULT_FIELDS = (
+    'id',
+    'submission_id',
+    'submission__created_at',
+    'submission__submitted_by_id',
+    'submission__target_employee_id',
+    'question_id',
+    'question__text',
+    'rating',
+    'comment',
+)
+
+
+def phrase_query(text):
+    """Quote free text as a single FTS5 phrase."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _match(query, params):
+    """FROM/WHERE clause and parameters selecting the FTS rows that match `query` and the admin filters."""
+    sql = f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    sql_params = [query]
+
+    filtered = filter_feedback_submissions(FeedbackAnswer.objects.all(), params, prefix='submission__')
+    if filtered.query.where:
+        sub_sql, sub_params = filtered.values('id').query.sql_with_params()
+        sql += f" AND rowid IN ({sub_sql})"
+        sql_params.extend(sub_params)
+    return sql, sql_params
+
+
+def _fetch(sql, sql_params):
+    try:
+        with connections[reporting_alias()].cursor() as cursor:
+            cursor.execute(sql, sql_params)
+            return cursor.fetchall()
+    except OperationalError as exc:
+        raise ValidationError({'q': [f"Invalid search query: {exc}"]})
+
+
+def count_matches(query, params):
+    """Number of answers matching the FTS5 `query` and the admin filters."""
+    sql, sql_params = _match(query, params)
+    return _fetch(f"SELECT count(*) {sql}", sql_params)[0][0]
+
+
+def search_answers(query, params, limit=50, offset=0):
+    """
+    Rank answers whose comment matches the FTS5 `query` (bm25, best first),
+    restricted by the admin designation/department/date filters.
+    """
+    sql, sql_params = _match(query, params)
+    hits = _fetch(
+        f"SELECT rowid, bm25({FTS_TABLE}), snippet({FTS_TABLE}, 0, '[', ']', '...', 12) "
+        f"{sql} ORDER BY rank LIMIT %s OFFSET %s",
+        [*sql_params, limit, offset],
+    )
+
+    rows = FeedbackAnswer.objects.filter(id__in=[hit[0] for hit in hits]).values(*RESULT_FIELDS)
+    by_id = {row['id']: row for row in rows}
+
+    results = []
+    for answer_id, score, snippet in hits:
+        row = by_id.get(answer_id)
+        if row is None:
+            continue
+        results.append({
+            'answer_id': answer_id,
+            'submission_id': row['submission_id'],
+            'created_at': row['submission__created_at'],
+            'submitted_by': row['submission__submitted_by_id'],
+            'target_employee': row['submission__target_employee_id'],
+            'question_id': row['question_id'],
+            'question': row['question__text'],
+            'rating': row['rating'],
+            'comment': row['comment'],
+            'snippet': snippet,
+            'score': round(-score, 4),
+        })
+    return results
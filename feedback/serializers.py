@@ -2,13 +2,16 @@
 
 
 from django.contrib.auth.models import User
-from .models import Designation, Employee, FeedbackQuestion, FeedbackSubmission, FeedbackAnswer
+from .models import BackgroundJob, Designation, FeedbackArchive, Employee, FeedbackQuestion, FeedbackSubmission, FeedbackAnswer
+from django.urls import reverse
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.db import IntegrityError
 from .models import Employee, Designation
 
 from django.db import IntegrityError, transaction
+from .catalogue import active_question_map
+from .submissions import create_submissions
 
 class UserRegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
@@ -100,12 +103,44 @@ class FeedbackQuestionSerializer(serializers.ModelSerializer):
 
 
 
+def resolve_answer_questions(answers, questions, feedback_type=None):
+    """
+    Swap each answer's question_id for its FeedbackQuestion from the
+    `questions` map ({id: active question}), in a single pass.
+
+    Rejects unknown/inactive ids, duplicate questions and questions of another
+    feedback_type (the given one, or else the type of the first question).
+    Returns (answers, errors); errors is None or a list aligned with `answers`.
+    """
+    resolved = []
+    errors = []
+    seen = set()
+    for ans in answers:
+        question_id = ans['question_id']
+        question = questions.get(question_id)
+        if question is None:
+            errors.append({'question_id': [f'Invalid pk "{question_id}" - object does not exist.']})
+        elif question_id in seen:
+            errors.append({'question_id': ["Duplicate answer for this question."]})
+        elif feedback_type and question.feedback_type != feedback_type:
+            errors.append({'question_id': [f'Question is not a "{feedback_type}" question.']})
+        else:
+            feedback_type = question.feedback_type
+            errors.append({})
+            resolved.append({
+                'question': question,
+                'rating': ans['rating'],
+                'comment': ans.get('comment', ''),
+            })
+        seen.add(question_id)
+
+    if any(errors):
+        return resolved, errors
+    return resolved, None
+
+
 class FeedbackAnswerSerializer(serializers.ModelSerializer):
-    question_id = serializers.PrimaryKeyRelatedField(
-        queryset=FeedbackQuestion.objects.filter(is_active=True),
-        source='question',
-        write_only=True
-    )
+    question_id = serializers.IntegerField(write_only=True)
     question = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -120,8 +155,14 @@ class FeedbackSubmissionSerializer(serializers.ModelSerializer):
         source='target_employee',
         write_only=True
     )
+    feedback_type = serializers.ChoiceField(
+        choices=FeedbackQuestion.FEEDBACK_TYPE_CHOICES,
+        write_only=True,
+        required=False
+    )
     submitted_by = serializers.PrimaryKeyRelatedField(read_only=True)
     submitted_by_employee = serializers.SerializerMethodField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = FeedbackSubmission
@@ -130,14 +171,32 @@ class FeedbackSubmissionSerializer(serializers.ModelSerializer):
             'submitted_by',
             'submitted_by_employee',
             'target_employee_id',
+            'feedback_type',
             'created_at',
+            'answer_count',
+            'average_rating',
+            'rating_min',
+            'rating_max',
+            'has_comment',
             'answers'
         ]
-        read_only_fields = ['id', 'created_at', 'submitted_by', 'submitted_by_employee']
+        read_only_fields = [
+            'id', 'created_at', 'submitted_by', 'submitted_by_employee',
+            'answer_count', 'rating_min', 'rating_max', 'has_comment',
+        ]
 
     def get_submitted_by_employee(self, obj):
         return str(obj.submitted_by)
 
+    def validate(self, attrs):
+        answers = attrs.get('answers', [])
+        attrs['answers'], errors = resolve_answer_questions(
+            answers, active_question_map(), attrs.pop('feedback_type', None)
+        )
+        if errors:
+            raise serializers.ValidationError({'answers': errors})
+        return attrs
+
     def create(self, validated_data):
         """Create a feedback submission with multiple answers."""
         answers_data = validated_data.pop('answers', [])
@@ -149,19 +208,7 @@ class FeedbackSubmissionSerializer(serializers.ModelSerializer):
 
       
         submitted_by = request.user.employee_profile
-        submission = FeedbackSubmission.objects.create(submitted_by=submitted_by, **validated_data)
-
-       
-        feedback_answers = [
-            FeedbackAnswer(
-                submission=submission,
-                question=ans['question'],
-                rating=ans['rating'],
-                comment=ans.get('comment', '')
-            )
-            for ans in answers_data
-        ]
-        FeedbackAnswer.objects.bulk_create(feedback_answers)
+        submission, = create_submissions(submitted_by, [(validated_data.get('target_employee'), answers_data)])
 
         return submission
 
@@ -172,7 +219,208 @@ class FeedbackSubmissionSerializer(serializers.ModelSerializer):
 class FeedbackFilterSerializer(serializers.Serializer):
     designation = serializers.CharField(required=False)
     department = serializers.CharField(required=False)
+    match = serializers.ChoiceField(
+        choices=['prefix', 'exact'], default='prefix',
+        help_text="How designation names and departments match (case-insensitive)."
+    )
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    max_average_rating = serializers.FloatField(
+        required=False, min_value=1, max_value=5,
+        help_text="Only submissions whose average rating is at most this value."
+    )
+    max_rating = serializers.IntegerField(
+        required=False, min_value=1, max_value=5,
+        help_text="Only submissions with at least one answer rated at most this value."
+    )
+
+
+class FeedbackLiveFilterSerializer(FeedbackFilterSerializer):
+    # Only new submissions are streamed, so date ranges do not apply.
+    start_date = None
+    end_date = None
+    target_employee_id = serializers.IntegerField(required=False)
+
+
+class FeedbackExportSerializer(FeedbackFilterSerializer):
+    export_format = serializers.ChoiceField(choices=['ndjson', 'csv'], default='ndjson')
+
+
+class FeedbackAnalyticsSerializer(FeedbackFilterSerializer):
+    group_by = serializers.ChoiceField(
+        choices=['employee', 'designation', 'department', 'question'],
+        default='employee'
+    )
+
+
+class FeedbackSearchSerializer(FeedbackFilterSerializer):
+    q = serializers.CharField(max_length=500)
+    phrase = serializers.BooleanField(default=False)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=50)
+    offset = serializers.IntegerField(min_value=0, max_value=10000, default=0)
+
+
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BackgroundJob
+        fields = [
+            'id', 'kind', 'status', 'params', 'created_at', 'started_at', 'finished_at',
+            'attempts', 'max_attempts', 'progress', 'total', 'message', 'download_url',
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != BackgroundJob.STATUS_SUCCEEDED or not obj.result_file:
+            return None
+        url = reverse('admin-job-download', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class BackgroundJobCreateSerializer(serializers.Serializer):
+    """
+    `params` carries the export filters (see FeedbackExportSerializer);
+    imports upload `file` as multipart form data instead.
+    """
+    kind = serializers.ChoiceField(choices=BackgroundJob.KIND_CHOICES)
+    params = serializers.DictField(required=False, default=dict)
+    file = serializers.FileField(required=False)
+    create_designations = serializers.BooleanField(default=False)
+    batch_size = serializers.IntegerField(min_value=1, max_value=10000, default=1000)
+
+    def validate(self, attrs):
+        kind = attrs['kind']
+        if kind == BackgroundJob.KIND_EXPORT:
+            export = FeedbackExportSerializer(data=attrs['params'])
+            if not export.is_valid():
+                raise serializers.ValidationError({'params': export.errors})
+            # Keep the raw filter strings: they are stored as JSON and parsed by the worker.
+            attrs['params'] = {
+                name: attrs['params'][name] for name in export.fields if name in attrs['params']
+            }
+            attrs['params']['export_format'] = export.validated_data['export_format']
+        elif kind == BackgroundJob.KIND_IMPORT_EMPLOYEES:
+            if 'file' not in attrs:
+                raise serializers.ValidationError({'file': ["An import file is required."]})
+            attrs['params'] = {
+                'create_designations': attrs['create_designations'],
+                'batch_size': attrs['batch_size'],
+            }
+        else:
+            attrs['params'] = {}
+        return attrs
+
+
+class FeedbackTrendSerializer(serializers.Serializer):
+    """Select targets by id(s), or every employee of a designation and/or department."""
+    target_employee_id = serializers.IntegerField(required=False)
+    target_employee_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
+    designation = serializers.CharField(required=False)
+    department = serializers.CharField(required=False)
+    match = serializers.ChoiceField(choices=['prefix', 'exact'], default='exact')
+    period = serializers.ChoiceField(choices=['week', 'month', 'quarter'], default='month')
     start_date = serializers.DateField(required=False)
     end_date = serializers.DateField(required=False)
+    question_id = serializers.IntegerField(required=False)
+    window = serializers.IntegerField(min_value=1, max_value=24, default=3)
+
+    def validate(self, attrs):
+        ids = list(attrs.get('target_employee_ids') or [])
+        if 'target_employee_id' in attrs:
+            ids.append(attrs.pop('target_employee_id'))
+        attrs['target_employee_ids'] = ids
+        if not (ids or attrs.get('designation') or attrs.get('department')):
+            raise serializers.ValidationError(
+                "Provide target_employee_id, target_employee_ids, designation or department."
+            )
+        return attrs
+
+
+class FeedbackArchiveSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FeedbackArchive
+        fields = [
+            'id', 'label', 'before', 'state', 'first_created_at', 'last_created_at',
+            'submission_count', 'answer_count', 'created_at', 'purged_at',
+        ]
+
+
+class FeedbackArchiveQuerySerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False, help_text="Inclusive.")
+    submitted_by_id = serializers.IntegerField(required=False)
+    target_employee_id = serializers.IntegerField(required=False)
+    question_id = serializers.IntegerField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class FeedbackChangeFeedSerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False, help_text="next_cursor from the previous response.")
+    limit = serializers.IntegerField(min_value=1, max_value=5000, default=500)
+    latest = serializers.BooleanField(
+        default=False,
+        help_text="Return no changes, only a cursor at the current end of the log (to start following it)."
+    )
+
+
+class FeedbackBatchAnswerSerializer(serializers.Serializer):
+    question_id = serializers.IntegerField()
+    rating = serializers.IntegerField(min_value=1, max_value=5)
+    comment = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class FeedbackBatchItemSerializer(serializers.Serializer):
+    target_employee_id = serializers.IntegerField()
+    feedback_type = serializers.ChoiceField(choices=FeedbackQuestion.FEEDBACK_TYPE_CHOICES, required=False)
+    answers = FeedbackBatchAnswerSerializer(many=True, allow_empty=False)
+
+
+class FeedbackBatchSubmissionSerializer(serializers.Serializer):
+    """
+    Many submissions in one request. Items are checked individually for
+    shape, then all employee ids are resolved with one query and question ids
+    against the cached catalogue, so validation cost stays flat.
+    """
+    submissions = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=200
+    )
+    atomic = serializers.BooleanField(default=False)
+
+    def validate_items(self):
+        """Return ({index: (target_employee, answers)}, {index: errors})."""
+        items = {}
+        errors = {}
+        for index, raw in enumerate(self.validated_data['submissions']):
+            item = FeedbackBatchItemSerializer(data=raw)
+            if item.is_valid():
+                items[index] = item.validated_data
+            else:
+                errors[index] = item.errors
+
+        target_ids = {item['target_employee_id'] for item in items.values()}
+        targets = Employee.objects.in_bulk(target_ids)
+        questions = active_question_map()
+
+        entries = {}
+        for index, item in items.items():
+            item_errors = {}
+            target = targets.get(item['target_employee_id'])
+            if target is None:
+                item_errors['target_employee_id'] = [f"Invalid pk \"{item['target_employee_id']}\" - object does not exist."]
+
+            answers, answer_errors = resolve_answer_questions(
+                item['answers'], questions, item.get('feedback_type')
+            )
+            if answer_errors:
+                item_errors['answers'] = answer_errors
 
+            if item_errors:
+                errors[index] = item_errors
+            else:
+                entries[index] = (target, answers)
 
+        return entries, errors
@@ -1,9 +1,194 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Employee
+from .catalogue import DESIGNATIONS, EMPLOYEES, QUESTIONS, USERS, bump_version
+from .changes import deletion_operation, log_deleted, log_saved
+from .models import Designation, Employee, FeedbackAnswer, FeedbackQuestion, FeedbackSubmission
+from .rollups import adjust_rating_rollups, rollup_key
+from .submissions import summary_expressions
 
 @receiver(post_save, sender=User)
 def create_employee_profile(sender, instance, created, **kwargs):
     if created:
         Employee.objects.get_or_create(user=instance)
+
+@receiver(post_save, sender=FeedbackQuestion)
+@receiver(post_delete, sender=FeedbackQuestion)
+def bump_question_catalogue(sender, **kwargs):
+    bump_version(QUESTIONS)
+
+def _saved_state(sender, instance, fields):
+    """The stored values of `fields` for an existing row, or None for a new one."""
+    if instance._state.adding or instance.pk is None:
+        return None
+    return sender._base_manager.using(instance._state.db).filter(pk=instance.pk).values(*fields).first()
+
+# Fields shown by the cached catalogues: the user cache behind JWT
+# authentication and the employee list. Saves that touch nothing else
+# (last_login, unrelated profile edits) keep the caches warm.
+USER_CATALOGUE_FIELDS = (
+    'username', 'password', 'first_name', 'last_name', 'email', 'is_active', 'is_staff', 'is_superuser',
+)
+EMPLOYEE_CATALOGUE_FIELDS = ('user', 'designation', 'department', 'employee_code')
+
+def _remember_catalogue_changes(sender, instance, fields, update_fields):
+    """Set instance._catalogue_changes to the names in `fields` this save changes."""
+    if update_fields is not None:
+        fields = [name for name in fields if name in update_fields]
+    attnames = {name: sender._meta.get_field(name).attname for name in fields}
+    stored = _saved_state(sender, instance, attnames.values()) if fields else None
+    if stored is None:
+        instance._catalogue_changes = set(fields) if instance._state.adding else set()
+    else:
+        instance._catalogue_changes = {
+            name for name, attname in attnames.items() if stored[attname] != getattr(instance, attname)
+        }
+
+@receiver(pre_save, sender=User)
+def remember_user_catalogue_changes(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        _remember_catalogue_changes(sender, instance, USER_CATALOGUE_FIELDS, update_fields)
+
+@receiver(post_save, sender=User)
+def bump_user_catalogue(sender, instance, created, raw=False, **kwargs):
+    # New users cannot be cached yet.
+    if created:
+        return
+    changes = getattr(instance, '_catalogue_changes', None)
+    if raw or changes:
+        bump_version(USERS)
+    # The employee list shows usernames.
+    if raw or (changes and 'username' in changes):
+        bump_version(EMPLOYEES)
+
+@receiver(post_delete, sender=User)
+def bump_user_catalogue_on_delete(sender, **kwargs):
+    bump_version(USERS)
+
+@receiver(post_save, sender=Designation)
+@receiver(post_delete, sender=Designation)
+def bump_designation_catalogue(sender, **kwargs):
+    bump_version(DESIGNATIONS)
+    # The employee list embeds designation names.
+    bump_version(EMPLOYEES)
+
+@receiver(pre_save, sender=Employee)
+def remember_employee_catalogue_changes(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        _remember_catalogue_changes(sender, instance, EMPLOYEE_CATALOGUE_FIELDS, update_fields)
+
+@receiver(post_save, sender=Employee)
+def bump_employee_catalogue(sender, instance, created, raw=False, **kwargs):
+    if raw or created or getattr(instance, '_catalogue_changes', None):
+        bump_version(EMPLOYEES)
+
+@receiver(post_delete, sender=Employee)
+def bump_employee_catalogue_on_delete(sender, **kwargs):
+    bump_version(EMPLOYEES)
+
+# create_submissions and seed_feedback bulk-insert without signals and log
+# their rows themselves; these cover single saves (admin, shell, fixups).
+
+@receiver(post_save, sender=FeedbackSubmission)
+def log_submission_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        log_saved('submission', instance, created)
+
+@receiver(post_save, sender=FeedbackAnswer)
+def log_answer_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        log_saved('answer', instance, created)
+
+@receiver(post_delete, sender=FeedbackSubmission)
+def log_submission_deleted(sender, instance, **kwargs):
+    log_deleted('submission', instance)
+
+@receiver(post_delete, sender=FeedbackAnswer)
+def log_answer_deleted(sender, instance, **kwargs):
+    log_deleted('answer', instance)
+
+# Rating rollups follow answers created, edited or deleted outside
+# create_submissions (admin, cascades). Rows removed by archive_feedback
+# stay counted: the rollups are the only record of archived days.
+
+def _answer_rollup_entry(submission_id, question_id, rating):
+    submission = (
+        FeedbackSubmission._base_manager.filter(pk=submission_id)
+        .values_list('target_employee_id', 'created_at').first()
+    )
+    if submission is None:
+        return []
+    return [(rollup_key(submission[0], question_id, submission[1]), rating)]
+
+@receiver(pre_save, sender=FeedbackAnswer)
+def remember_answer_before_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._stored = _saved_state(sender, instance, ('submission_id', 'question_id', 'rating'))
+
+@receiver(post_save, sender=FeedbackAnswer)
+def adjust_rollups_on_answer_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    stored = getattr(instance, '_stored', None)
+    current = {'submission_id': instance.submission_id, 'question_id': instance.question_id, 'rating': instance.rating}
+    if stored == current:
+        return
+    adjust_rating_rollups(
+        removed=_answer_rollup_entry(**stored) if stored else [],
+        added=_answer_rollup_entry(**current),
+    )
+
+@receiver(post_delete, sender=FeedbackAnswer)
+def adjust_rollups_on_answer_delete(sender, instance, **kwargs):
+    if deletion_operation() == 'archive':
+        return
+    adjust_rating_rollups(removed=_answer_rollup_entry(instance.submission_id, instance.question_id, instance.rating))
+
+@receiver(pre_save, sender=FeedbackSubmission)
+def remember_submission_before_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._stored = _saved_state(sender, instance, ('target_employee_id', 'created_at'))
+
+@receiver(post_save, sender=FeedbackSubmission)
+def adjust_rollups_on_submission_save(sender, instance, created, raw=False, **kwargs):
+    stored = getattr(instance, '_stored', None)
+    if raw or stored is None:
+        return
+    if (stored['target_employee_id'], stored['created_at']) == (instance.target_employee_id, instance.created_at):
+        return
+    # The submission's answers move to other rollup rows.
+    ratings = list(FeedbackAnswer.objects.filter(submission=instance).values_list('question_id', 'rating'))
+    old_target, old_created_at = stored['target_employee_id'], stored['created_at']
+    adjust_rating_rollups(
+        removed=[(rollup_key(old_target, question_id, old_created_at), rating) for question_id, rating in ratings],
+        added=[
+            (rollup_key(instance.target_employee_id, question_id, instance.created_at), rating)
+            for question_id, rating in ratings
+        ],
+    )
+
+def _refresh_submission_summaries(submission_ids):
+    submissions = FeedbackSubmission._base_manager.filter(pk__in=submission_ids)
+    submissions.update(**summary_expressions())
+    # The summary columns are part of the submission's change feed data.
+    for submission in submissions:
+        log_saved('submission', submission, created=False)
+
+@receiver(post_save, sender=FeedbackAnswer)
+def refresh_summary_on_answer_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    stored = getattr(instance, '_stored', None)
+    # A moved answer leaves its old submission too.
+    previous = stored['submission_id'] if stored else instance.submission_id
+    _refresh_submission_summaries({instance.submission_id, previous})
+
+@receiver(post_delete, sender=FeedbackAnswer)
+def refresh_summary_on_answer_delete(sender, instance, origin=None, **kwargs):
+    # Archived rows keep nothing live; answers cascading from their own
+    # submission's deletion have no summary left to update.
+    if deletion_operation() == 'archive':
+        return
+    if isinstance(origin, FeedbackSubmission) or getattr(origin, 'model', None) is FeedbackSubmission:
+        return
+    _refresh_submission_summaries([instance.submission_id])
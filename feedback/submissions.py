@@ -0,0 +1,70 @@
+from django.db import transaction
+from django.db.models import Count, Exists, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .changes import log_created
+from .models import FeedbackAnswer, FeedbackSubmission
+from .rollups import update_rating_rollups
+
+
+def create_submissions(submitted_by, entries):
+    """
+    Write feedback submissions and their answers in one transaction.
+
+    `entries` is a list of (target_employee, answers) pairs, where answers are
+    dicts with validated 'question', 'rating' and optional 'comment'. Returns
+    the created submissions in the same order, with their summary columns
+    filled from the answers. Uses one INSERT per table, change log included,
+    regardless of how many submissions or answers there are.
+    """
+    submissions = [
+        FeedbackSubmission(submitted_by=submitted_by, target_employee=target_employee)
+        for target_employee, _ in entries
+    ]
+    # Answers point at the unsaved submissions; bulk_create fills in their ids.
+    answers_by_submission = [
+        [
+            FeedbackAnswer(
+                submission=submission,
+                question=ans['question'],
+                rating=ans['rating'],
+                comment=ans.get('comment', '')
+            )
+            for ans in answers
+        ]
+        for submission, (_, answers) in zip(submissions, entries)
+    ]
+    for submission, answers in zip(submissions, answers_by_submission):
+        submission.summarize(answers)
+    feedback_answers = [answer for answers in answers_by_submission for answer in answers]
+
+    with transaction.atomic():
+        FeedbackSubmission.objects.bulk_create(submissions)
+        FeedbackAnswer.objects.bulk_create(feedback_answers)
+        update_rating_rollups(feedback_answers)
+        log_created(submissions, feedback_answers)
+
+    # Serve submission.answers.all() from memory when the response is rendered.
+    for submission, answers in zip(submissions, answers_by_submission):
+        submission._prefetched_objects_cache = {'answers': answers}
+
+    return submissions
+
+
+def summary_expressions():
+    """
+    Update kwargs that recompute FeedbackSubmission's summary columns from
+    its answers with correlated subqueries, for use in queryset.update().
+    """
+    answers = FeedbackAnswer.objects.filter(submission=OuterRef('pk')).order_by().values('submission')
+
+    def aggregate(function):
+        return Subquery(answers.annotate(value=function('rating')).values('value'))
+
+    return {
+        'answer_count': Coalesce(aggregate(Count), Value(0)),
+        'rating_sum': Coalesce(aggregate(Sum), Value(0)),
+        'rating_min': aggregate(Min),
+        'rating_max': aggregate(Max),
+        'has_comment': Exists(FeedbackAnswer.objects.filter(submission=OuterRef('pk')).exclude(comment='')),
+    }
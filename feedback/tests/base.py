@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from feedback import authentication, catalogue, conditional
+from feedback.models import Designation, FeedbackQuestion
+from feedback.submissions import create_submissions
+
+
+def reset_process_caches():
+    """Forget process-local caches; their versions restart when a test rolls back."""
+    catalogue._versions.expire()
+    catalogue._question_cache.clear()
+    authentication._user_cache.clear()
+    conditional._body_cache.clear()
+
+
+class FeedbackTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        reset_process_caches()
+        self.addCleanup(reset_process_caches)
+
+    def make_employee(self, username, designation=None, department='', staff=False):
+        user = User.objects.create(username=username, is_staff=staff, is_superuser=staff)
+        employee = user.employee_profile
+        if isinstance(designation, str):
+            designation, _ = Designation.objects.get_or_create(name=designation)
+        employee.designation = designation
+        employee.department = department
+        employee.save()
+        return employee
+
+    def make_questions(self, count=2, feedback_type='employee'):
+        return [
+            FeedbackQuestion.objects.create(text=f'{feedback_type} question {n}', feedback_type=feedback_type, order=n)
+            for n in range(count)
+        ]
+
+    def submit(self, submitted_by, target, answers, created_at=None):
+        """
+        Create one submission through create_submissions, optionally as if
+        at `created_at`. `answers` are (question, rating) or
+        (question, rating, comment) tuples.
+        """
+        entries = [(target, [
+            {'question': answer[0], 'rating': answer[1], 'comment': answer[2] if len(answer) > 2 else ''}
+            for answer in answers
+        ])]
+        with mock.patch('django.utils.timezone.now', return_value=created_at or timezone.now()):
+            submission, = create_submissions(submitted_by, entries)
+        return submission
+
+    def client_for(self, employee):
+        client = APIClient()
+        client.force_authenticate(employee.user)
+        return client
@@ -0,0 +1,51 @@
+import io
+import tempfile
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .base import FeedbackTestCase
+
+
+class FeedbackAnalyticsTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', designation='Engineer', staff=True)
+        self.other = self.make_employee('other', designation='Engineer')
+        self.question, = self.make_questions(1)
+        self.submit(self.admin, self.other, [(self.question, 1)], created_at=timezone.now() - timedelta(days=10))
+        self.submit(self.admin, self.other, [(self.question, 4)])
+        self.submit(self.other, self.admin, [(self.question, 5)])
+
+    def _scorecard(self, **filters):
+        response = self.client_for(self.admin).post(
+            reverse('admin-feedback-analytics'), {'group_by': 'employee', **filters}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_statistics_per_target_employee(self):
+        results = {row['key']: row for row in self._scorecard()['results']}
+        self.assertEqual(results[self.other.id]['histogram'], {'1': 1, '2': 0, '3': 0, '4': 1, '5': 0})
+        self.assertEqual(results[self.other.id]['count'], 2)
+        self.assertEqual(results[self.admin.id]['mean'], 5)
+
+    def test_rollups_and_answers_agree(self):
+        unfiltered = self._scorecard()
+        filtered = self._scorecard(designation='Engineer')
+        self.assertEqual((unfiltered['source'], filtered['source']), ('rollups', 'answers'))
+        self.assertEqual(unfiltered['results'], filtered['results'])
+
+    def test_archived_feedback_is_left_out_of_both_sources(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(FEEDBACK_ARCHIVE_DIR=directory):
+            before = timezone.localdate() - timedelta(days=5)
+            call_command('archive_feedback', before=before.isoformat(), stdout=io.StringIO())
+
+        unfiltered = self._scorecard()
+        filtered = self._scorecard(designation='Engineer')
+        self.assertEqual(unfiltered['results'], filtered['results'])
+        results = {row['key']: row for row in unfiltered['results']}
+        self.assertEqual(results[self.other.id]['histogram'], {'1': 0, '2': 0, '3': 0, '4': 1, '5': 0})
@@ -0,0 +1,122 @@
+import io
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from feedback.archive import ArchiveReader, archive_watermark, write_archive
+from feedback.models import FeedbackAnswer, FeedbackArchive, FeedbackSubmission
+
+from .base import FeedbackTestCase
+from .test_rollups import rollup_table
+
+
+class FeedbackArchiveTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = override_settings(FEEDBACK_ARCHIVE_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.admin = self.make_employee('admin', staff=True)
+        self.other = self.make_employee('other')
+        self.first, self.second = self.make_questions(2)
+        old = timezone.now() - timedelta(days=10)
+        self.old = [
+            self.submit(self.admin, self.other, [(self.first, 2, 'too slow'), (self.second, 3)], created_at=old),
+            self.submit(self.other, self.admin, [(self.first, 5)], created_at=old + timedelta(hours=1)),
+        ]
+        self.recent = self.submit(self.admin, self.other, [(self.first, 4)])
+        self.before = timezone.localdate() - timedelta(days=5)
+
+    def _archive(self, *args):
+        out = io.StringIO()
+        call_command('archive_feedback', *args, before=self.before.isoformat(), stdout=out)
+        return out.getvalue()
+
+    def _query(self, **body):
+        response = self.client_for(self.admin).post(reverse('admin-archive-query'), body, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_archived_submissions_are_moved_out_of_the_live_tables(self):
+        rollups = rollup_table()
+        self._archive()
+
+        archive = FeedbackArchive.objects.get()
+        self.assertEqual(archive.state, FeedbackArchive.STATE_COMPLETE)
+        self.assertIsNotNone(archive.purged_at)
+        self.assertEqual((archive.submission_count, archive.answer_count), (2, 3))
+        self.assertEqual(list(FeedbackSubmission.objects.values_list('id', flat=True)), [self.recent.id])
+        self.assertEqual(FeedbackAnswer.objects.count(), 1)
+        self.assertEqual(rollup_table(), rollups)
+        self.assertEqual(archive_watermark(), self.before)
+
+    def test_query_reads_back_what_was_archived(self):
+        self._archive()
+        results = self._query()['results']
+        self.assertEqual([row['id'] for row in results], [submission.id for submission in self.old])
+        self.assertEqual(
+            [(answer['question_id'], answer['rating'], answer['comment']) for answer in results[0]['answers']],
+            [(self.first.id, 2, 'too slow'), (self.second.id, 3, '')],
+        )
+
+    def test_query_filters_by_employee_and_question(self):
+        self._archive()
+        results = self._query(target_employee_id=self.other.id, question_id=self.second.id)['results']
+        self.assertEqual([row['id'] for row in results], [self.old[0].id])
+        self.assertEqual([answer['question_id'] for answer in results[0]['answers']], [self.second.id])
+        self.assertEqual(self._query(end_date=(self.before - timedelta(days=20)).isoformat())['results'], [])
+
+    def test_dry_run_changes_nothing(self):
+        self.assertIn('Would archive 2 submissions and 3 answers.', self._archive('--dry-run'))
+        self.assertFalse(FeedbackArchive.objects.exists())
+        self.assertEqual(FeedbackSubmission.objects.count(), 3)
+
+    def test_pending_archive_without_files_is_dropped_on_the_next_run(self):
+        FeedbackArchive.objects.create(label='before-crashed', before=self.before)
+        (self.directory / 'before-crashed.part').mkdir()
+
+        output = self._archive()
+        self.assertIn('Dropped unfinished archive before-crashed.', output)
+        self.assertFalse((self.directory / 'before-crashed.part').exists())
+        archive = FeedbackArchive.objects.get()
+        self.assertNotEqual(archive.label, 'before-crashed')
+        self.assertEqual(archive.state, FeedbackArchive.STATE_COMPLETE)
+        self.assertEqual(FeedbackSubmission.objects.count(), 1)
+
+    def test_pending_archive_with_files_is_recorded_and_purged(self):
+        archive = FeedbackArchive.objects.create(label='before-written', before=self.before - timedelta(days=1))
+        submissions = FeedbackSubmission.objects.filter(id__in=[submission.id for submission in self.old])
+        write_archive(submissions, self.directory / 'before-written', label='before-written')
+        self.assertIsNone(archive_watermark())
+
+        output = self._archive()
+        self.assertIn('Recovered archive before-written with 2 submissions.', output)
+        self.assertIn('Nothing to archive.', output)
+        archive.refresh_from_db()
+        self.assertEqual(archive.state, FeedbackArchive.STATE_COMPLETE)
+        self.assertEqual((archive.submission_count, archive.answer_count), (2, 3))
+        self.assertEqual(archive.first_created_at, self.old[0].created_at)
+        self.assertEqual(list(FeedbackSubmission.objects.values_list('id', flat=True)), [self.recent.id])
+
+    def test_comments_are_read_back_across_blocks(self):
+        comments = ['', 'first', 'déjà vu', '', 'x' * 300, 'last']
+        for comment in comments:
+            self.submit(self.other, self.admin, [(self.first, 3, comment)])
+        submissions = FeedbackSubmission.objects.order_by('created_at', 'id')
+        with mock.patch('feedback.archive.COMMENT_BLOCK', 2):
+            write_archive(submissions, self.directory / 'blocks')
+            reader = ArchiveReader(self.directory / 'blocks')
+            read = [answer['comment'] for row in reader.iter_submissions() for answer in row['answers']]
+        expected = FeedbackAnswer.objects.order_by('submission__created_at', 'submission_id', 'id')
+        self.assertEqual(read, list(expected.values_list('comment', flat=True)))
+        self.assertEqual(read[-len(comments):], comments)
@@ -0,0 +1,70 @@
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .base import FeedbackTestCase, reset_process_caches
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AsyncReadEndpointTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ada = self.make_employee('ada', designation='Engineer')
+        self.bob = self.make_employee('bob')
+        question, = self.make_questions(1)
+        for rating in (3, 4, 5):
+            self.submit(self.ada, self.bob, [(question, rating, 'fine')])
+        self.submit(self.bob, self.ada, [(question, 1)])
+
+    def _auth(self, employee=None):
+        token = AccessToken.for_user((employee or self.ada).user)
+        return {'Authorization': f'Bearer {token}'}
+
+    async def _get(self, name, query='', headers=None):
+        response = await self.async_client.get(reverse(name) + query, headers=headers)
+        return response.status_code, json.loads(response.content)
+
+    async def _sync_get(self, path, headers):
+        return json.loads((await sync_to_async(self.client.get)(path, headers=headers)).content)
+
+    async def test_employee_list_matches_the_sync_endpoint_in_id_order(self):
+        status, data = await self._get('async-employee-list', headers=self._auth())
+        self.assertEqual(status, 200)
+        self.assertEqual([row['id'] for row in data], sorted(row['id'] for row in data))
+        self.assertEqual(data, await self._sync_get(reverse('employee-list'), self._auth()))
+
+    async def test_my_feedback_matches_the_sync_endpoint(self):
+        status, data = await self._get('async-my-feedback', '?page_size=2', headers=self._auth())
+        self.assertEqual(status, 200)
+        sync = await self._sync_get(reverse('my-feedback') + '?page_size=2', self._auth())
+        self.assertEqual(data['results'], sync['results'])
+        self.assertEqual(len(data['results']), 2)
+
+    async def test_missing_or_invalid_tokens_are_rejected(self):
+        self.assertEqual((await self._get('async-feedback-questions'))[0], 401)
+        status, data = await self._get('async-feedback-questions', headers={'Authorization': 'Bearer nonsense'})
+        self.assertEqual(status, 401)
+        self.assertEqual(data['detail'], "Given token not valid for any token type")
+
+    async def test_inactive_users_are_rejected(self):
+        headers = self._auth(self.bob)
+        self.bob.user.is_active = False
+        await self.bob.user.asave()
+        status, data = await self._get('async-feedback-questions', headers=headers)
+        self.assertEqual(status, 401)
+
+    async def test_revoked_tokens_are_rejected(self):
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            headers = self._auth(self.bob)
+            self.bob.user.set_password('changed-password')
+            await self.bob.user.asave()
+            # The version bump's on_commit hook never runs inside a test transaction.
+            await sync_to_async(reset_process_caches)()
+            status, data = await self._get('async-feedback-questions', headers=headers)
+        self.assertEqual(status, 401)
+        self.assertEqual(data['detail'], "The user's password has been changed.")
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from feedback.authentication import LastLoginBuffer, last_login_buffer
+
+from .base import FeedbackTestCase
+
+FAST_HASHER = override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+
+
+@FAST_HASHER
+class CachedJWTAuthenticationTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = self.make_employee('ada')
+        self.user = self.employee.user
+        self.user.set_password('secret-password')
+        self.user.save()
+        self.api = APIClient()
+        self.api.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def _get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(reverse('my-feedback'))
+        return response.status_code, sum(query['sql'].startswith('SELECT "auth_user"') for query in queries)
+
+    def _commit_user(self):
+        # Run the version bump's on_commit hook, as a real commit would.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+    def test_user_is_loaded_once(self):
+        self.assertEqual(self._get(), (200, 1))
+        self.assertEqual(self._get(), (200, 0))
+
+    def test_deactivated_users_are_rejected(self):
+        self._get()
+        self.user.is_active = False
+        self._commit_user()
+        self.assertEqual(self._get()[0], 401)
+
+    def test_password_change_revokes_tokens_when_enabled(self):
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            self.api.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+            self.assertEqual(self._get()[0], 200)
+            self.user.set_password('another-password')
+            self._commit_user()
+            self.assertEqual(self._get()[0], 401)
+
+
+@FAST_HASHER
+class LastLoginBufferTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = [self.make_employee(f'user{n}').user for n in range(3)]
+
+    def test_logins_are_written_in_one_update_when_full(self):
+        buffer = LastLoginBuffer(max_pending=3, flush_seconds=60)
+        for user in self.users[:2]:
+            buffer.record(user)
+        self.assertFalse(User.objects.filter(last_login__isnull=False).exists())
+        with CaptureQueriesContext(connection) as queries:
+            buffer.record(self.users[2])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(User.objects.filter(last_login__isnull=False).count(), 3)
+
+    def test_flush_keeps_the_latest_login(self):
+        buffer = LastLoginBuffer(max_pending=10, flush_seconds=60)
+        buffer.record(self.users[0])
+        first = self.users[0].last_login
+        buffer.record(self.users[0])
+        buffer.flush()
+        self.users[0].refresh_from_db()
+        self.assertGreaterEqual(self.users[0].last_login, first)
+        self.assertLess(timezone.now() - self.users[0].last_login, timedelta(minutes=1))
+
+    def test_login_endpoint_records_last_login(self):
+        self.users[0].set_password('secret-password')
+        self.users[0].save()
+        response = APIClient().post(
+            reverse('token_obtain_pair'), {'username': 'user0', 'password': 'secret-password'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        last_login_buffer.flush()
+        self.users[0].refresh_from_db()
+        self.assertIsNotNone(self.users[0].last_login)
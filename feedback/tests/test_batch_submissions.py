@@ -0,0 +1,58 @@
+from django.urls import reverse
+
+from feedback.models import FeedbackChange, FeedbackRatingRollup, FeedbackSubmission
+
+from .base import FeedbackTestCase
+
+
+class BatchSubmissionTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_employee('author')
+        self.first_target = self.make_employee('first')
+        self.second_target = self.make_employee('second')
+        self.question, = self.make_questions(1)
+        self.api = self.client_for(self.author)
+
+    def _item(self, target_id, rating=4):
+        return {'target_employee_id': target_id, 'answers': [{'question_id': self.question.id, 'rating': rating}]}
+
+    def _post(self, items, **body):
+        return self.api.post(reverse('submit-feedback-batch'), {'submissions': items, **body}, format='json')
+
+    def test_all_valid_items_are_created(self):
+        response = self._post([self._item(self.first_target.id), self._item(self.second_target.id, 2)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['index'] for row in response.data['created']], [0, 1])
+        self.assertEqual(response.data['errors'], [])
+        submissions = FeedbackSubmission.objects.filter(submitted_by=self.author).order_by('id')
+        self.assertEqual([s.target_employee_id for s in submissions], [self.first_target.id, self.second_target.id])
+        self.assertEqual([s.rating_sum for s in submissions], [4, 2])
+        self.assertEqual(FeedbackRatingRollup.objects.count(), 2)
+        self.assertEqual(FeedbackChange.objects.filter(entity='submission', operation='create').count(), 2)
+
+    def test_invalid_items_are_reported_by_index(self):
+        response = self._post([
+            self._item(self.first_target.id),
+            self._item(10 ** 6),
+            {'target_employee_id': self.second_target.id, 'answers': [{'question_id': 10 ** 6, 'rating': 3}]},
+            self._item(self.second_target.id, rating=9),
+        ])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([row['index'] for row in response.data['created']], [0])
+        errors = {row['index']: row['errors'] for row in response.data['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        self.assertIn('target_employee_id', errors[1])
+        self.assertIn('answers', errors[2])
+        self.assertEqual(FeedbackSubmission.objects.count(), 1)
+
+    def test_atomic_batch_is_rejected_as_a_whole(self):
+        response = self._post([self._item(self.first_target.id), self._item(10 ** 6)], atomic=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['created'], [])
+        self.assertFalse(FeedbackSubmission.objects.exists())
+
+    def test_batch_size_is_limited(self):
+        response = self._post([self._item(self.first_target.id)] * 201)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('submissions', response.data)
@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from feedback.catalogue import EMPLOYEES, QUESTIONS, USERS, active_question_map, active_questions
+from feedback.models import CatalogueVersion, Designation
+
+from .base import FeedbackTestCase, reset_process_caches
+
+
+def versions():
+    stored = dict(CatalogueVersion.objects.values_list('name', 'version'))
+    return {name: stored.get(name, 0) for name in (USERS, EMPLOYEES)}
+
+
+class CatalogueVersionSignalTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = self.make_employee('ada', designation='Engineer')
+        self.user = self.employee.user
+        self.manager = Designation.objects.create(name='Manager')
+        self.before = versions()
+
+    def assertBumped(self, users, employees):
+        after = versions()
+        self.assertEqual(
+            (after[USERS] - self.before[USERS], after[EMPLOYEES] - self.before[EMPLOYEES]), (users, employees)
+        )
+
+    def test_last_login_updates_do_not_bump(self):
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        self.assertBumped(0, 0)
+
+    def test_saving_unchanged_rows_does_not_bump(self):
+        self.user.save()
+        self.employee.save()
+        self.assertBumped(0, 0)
+
+    def test_update_fields_limit_what_is_compared(self):
+        self.user.is_staff = True
+        self.user.save(update_fields=['last_login'])
+        self.assertBumped(0, 0)
+
+    def test_permission_changes_bump_users_only(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.assertBumped(1, 0)
+
+    def test_username_changes_bump_the_employee_list(self):
+        self.user.username = 'ada.lovelace'
+        self.user.save(update_fields=['username'])
+        self.assertBumped(1, 1)
+
+    def test_employee_changes_bump_the_employee_list(self):
+        self.employee.designation = self.manager
+        self.employee.save()
+        self.assertBumped(0, 1)
+
+
+class QuestionCatalogueTests(FeedbackTestCase):
+    def test_active_questions_are_served_from_memory_until_changed(self):
+        first, second = self.make_questions(2)
+        reset_process_caches()
+        self.assertEqual(list(active_questions()), [first, second])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(list(active_questions()), [first, second])
+            self.assertEqual(set(active_question_map()), {first.id, second.id})
+        self.assertEqual(len(queries), 0)
+
+        version = CatalogueVersion.objects.get(name=QUESTIONS).version
+        second.is_active = False
+        second.save()
+        self.assertEqual(CatalogueVersion.objects.get(name=QUESTIONS).version, version + 1)
+        # Commit hooks do not run inside a test transaction; expire as they would.
+        reset_process_caches()
+        self.assertEqual(list(active_questions()), [first])
@@ -0,0 +1,100 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from feedback.changes import InvalidCursor, decode_cursor, encode_cursor, recording_deletions
+from feedback.models import FeedbackAnswer, FeedbackChange, FeedbackSubmission
+
+from .base import FeedbackTestCase
+
+
+class ChangeFeedTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', staff=True)
+        self.other = self.make_employee('other')
+        self.first, self.second = self.make_questions(2)
+        self.submission = self.submit(self.admin, self.other, [(self.first, 4), (self.second, 2, 'vague')])
+
+    def _changes(self, **params):
+        return self.client_for(self.admin).get(reverse('admin-feedback-changes'), params)
+
+    def _read_all(self, cursor=None, limit=2):
+        rows, has_more = [], True
+        while has_more:
+            params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+            data = self._changes(**params).data
+            rows.extend(data['results'])
+            cursor, has_more = data['next_cursor'], data['has_more']
+        return rows, cursor
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(42)), 42)
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(encode_cursor(42)[:-2] + '!!')
+
+    def test_pages_replay_the_log_in_order_and_resume_from_the_cursor(self):
+        rows, cursor = self._read_all()
+        self.assertEqual(
+            [(row['entity'], row['operation']) for row in rows],
+            [('submission', 'create'), ('answer', 'create'), ('answer', 'create')],
+        )
+        self.assertEqual(rows[0]['data']['rating_sum'], 6)
+
+        self.submit(self.other, self.admin, [(self.first, 5)])
+        more, _ = self._read_all(cursor)
+        self.assertEqual([row['operation'] for row in more], ['create', 'create'])
+        self.assertEqual(more[0]['data']['submitted_by_id'], self.other.id)
+
+    def test_latest_starts_at_the_end_of_the_log(self):
+        cursor = self._changes(latest='true').data['next_cursor']
+        self.assertEqual(self._changes(cursor=cursor).data['results'], [])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self._changes(cursor='bogus').status_code, 400)
+
+    def test_pruned_cursor_has_expired(self):
+        cursor = self._changes(latest='true').data['next_cursor']
+        self.submit(self.other, self.admin, [(self.first, 5)])
+        self.submit(self.other, self.admin, [(self.second, 1)])
+        FeedbackChange.objects.update(created_at=timezone.now() - timedelta(days=30))
+        call_command('prune_change_log', days=1, stdout=io.StringIO())
+
+        self.assertEqual(FeedbackChange.objects.count(), 1)
+        self.assertEqual(self._changes(cursor=cursor).status_code, 410)
+        _, head = self._read_all()
+        self.assertEqual(self._changes(cursor=head).status_code, 200)
+
+    def test_orm_saves_are_logged_as_creates_and_updates(self):
+        cursor = self._changes(latest='true').data['next_cursor']
+        answer = FeedbackAnswer.objects.get(submission=self.submission, question=self.first)
+        answer.rating = 1
+        answer.save()
+        added = FeedbackSubmission.objects.create(submitted_by=self.other, target_employee=self.admin)
+
+        rows, _ = self._read_all(cursor)
+        self.assertEqual(
+            [(row['entity'], row['operation'], row['object_id']) for row in rows],
+            [
+                ('answer', 'update', answer.id),
+                ('submission', 'update', self.submission.id),
+                ('submission', 'create', added.id),
+            ],
+        )
+        self.assertEqual(rows[0]['data']['rating'], 1)
+        self.assertEqual(rows[1]['data']['rating_sum'], 3)
+
+    def test_deletions_are_logged_as_deletes_or_archives(self):
+        cursor = self._changes(latest='true').data['next_cursor']
+        FeedbackAnswer.objects.filter(question=self.second).delete()
+        with recording_deletions('archive'):
+            self.submission.delete()
+
+        rows, _ = self._read_all(cursor)
+        self.assertEqual(
+            [(row['entity'], row['operation']) for row in rows],
+            [('answer', 'delete'), ('submission', 'update'), ('answer', 'archive'), ('submission', 'archive')],
+        )
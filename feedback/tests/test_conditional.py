@@ -0,0 +1,45 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .base import FeedbackTestCase, reset_process_caches
+
+
+class CatalogueETagTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = self.make_employee('ada', designation='Engineer')
+        self.make_questions(2)
+        self.make_questions(1, feedback_type='project')
+        self.api = self.client_for(self.employee)
+
+    def test_matching_etag_is_not_modified_without_touching_the_tables(self):
+        first = self.api.get(reverse('feedback-questions'))
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Cache-Control'], 'private, no-cache')
+        with CaptureQueriesContext(connection) as queries:
+            again = self.api.get(reverse('feedback-questions'), headers={'If-None-Match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], first['ETag'])
+        self.assertFalse([q for q in queries if 'feedback_feedbackquestion' in q['sql']])
+
+    def test_variants_have_their_own_etags_and_bodies(self):
+        everything = self.api.get(reverse('feedback-questions'))
+        projects = self.api.get(reverse('feedback-questions') + '?type=project')
+        self.assertNotEqual(everything['ETag'], projects['ETag'])
+        self.assertEqual((len(everything.json()), len(projects.json())), (3, 1))
+
+    def test_changes_produce_a_new_etag(self):
+        before = self.api.get(reverse('employee-list'))
+        self.make_employee('bob')
+        # Commit hooks do not run inside a test transaction; expire as they would.
+        reset_process_caches()
+        after = self.api.get(reverse('employee-list'), headers={'If-None-Match': before['ETag']})
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertEqual(len(after.json()), 2)
+
+    def test_designations_are_conditional_too(self):
+        first = self.api.get(reverse('designation-list-create'))
+        again = self.api.get(reverse('designation-list-create'), headers={'If-None-Match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+
+from feedback.models import EMPLOYEE_CODE_SEQUENCE, CodeSequence, Employee, format_employee_code
+
+from .base import FeedbackTestCase
+
+
+class EmployeeCodeTests(FeedbackTestCase):
+    def test_allocate_reserves_consecutive_blocks(self):
+        first = CodeSequence.allocate('test', 3)
+        second = CodeSequence.allocate('test')
+        self.assertEqual(list(first), [1, 2, 3])
+        self.assertEqual(list(second), [4])
+        self.assertEqual(CodeSequence.objects.get(name='test').last_value, 4)
+
+    def test_new_employees_get_sequential_codes(self):
+        codes = [self.make_employee(f'user{n}').employee_code for n in range(3)]
+        start = CodeSequence.objects.get(name=EMPLOYEE_CODE_SEQUENCE).last_value - 2
+        self.assertEqual(codes, [format_employee_code(start + n) for n in range(3)])
+
+    def test_codes_are_not_reused_after_deletes(self):
+        first = self.make_employee('first')
+        code = first.employee_code
+        first.user.delete()
+        self.assertNotEqual(self.make_employee('second').employee_code, code)
+
+    def test_assign_codes_fills_only_missing_codes_for_bulk_create(self):
+        users = User.objects.bulk_create([User(username=f'bulk{n}') for n in range(3)])
+        employees = [Employee(user=user) for user in users]
+        employees[1].employee_code = 'CUSTOM'
+        Employee.assign_codes(employees)
+        codes = [employee.employee_code for employee in employees]
+        self.assertEqual(codes[1], 'CUSTOM')
+        self.assertEqual(len(set(codes)), 3)
+        Employee.objects.bulk_create(employees)
+        self.assertEqual(Employee.objects.filter(employee_code__in=codes).count(), 3)
+
+    def test_explicit_codes_are_kept(self):
+        user = User.objects.create(username='explicit')
+        employee = user.employee_profile
+        employee.employee_code = 'EXT-1'
+        employee.save()
+        employee.refresh_from_db()
+        self.assertEqual(employee.employee_code, 'EXT-1')
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+
+from feedback.exports import CSV_HEADER, iter_submissions_with_answers
+from feedback.models import FeedbackSubmission
+
+from .base import FeedbackTestCase
+
+
+class FeedbackExportTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', designation='Engineer', department='Engineering', staff=True)
+        self.sales = self.make_employee('sales', designation='Manager', department='Sales')
+        self.first, self.second = self.make_questions(2)
+        self.submit(self.admin, self.sales, [(self.first, 4, 'clear, "direct"'), (self.second, 2)])
+        self.submit(self.sales, self.admin, [(self.first, 5)])
+
+    def _export(self, **body):
+        client = self.client_for(self.admin)
+        response = client.post(reverse('admin-feedback-export'), body, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_has_one_line_per_submission_with_answers(self):
+        lines = [json.loads(line) for line in self._export(export_format='ndjson').splitlines()]
+        expected = FeedbackSubmission.objects.order_by('created_at', 'id').values_list('id', flat=True)
+        self.assertEqual([line['id'] for line in lines], list(expected))
+        self.assertEqual(
+            [(answer['question_id'], answer['rating'], answer['comment']) for answer in lines[0]['answers']],
+            [(self.first.id, 4, 'clear, "direct"'), (self.second.id, 2, '')],
+        )
+        self.assertEqual(lines[0]['department'], 'Engineering')
+
+    def test_csv_has_one_row_per_answer_and_quotes_comments(self):
+        rows = list(csv.reader(io.StringIO(self._export(export_format='csv'))))
+        self.assertEqual(tuple(rows[0]), CSV_HEADER)
+        self.assertEqual(len(rows), 1 + 3)
+        self.assertEqual(rows[1][CSV_HEADER.index('comment')], 'clear, "direct"')
+
+    def test_export_applies_the_admin_filters(self):
+        lines = self._export(export_format='ndjson', department='sales').splitlines()
+        self.assertEqual([json.loads(line)['submitted_by_id'] for line in lines], [self.sales.id])
+
+    def test_chunks_do_not_split_or_repeat_submissions(self):
+        progress = []
+        rows = list(iter_submissions_with_answers(
+            FeedbackSubmission.objects.all(), chunk_size=1, on_progress=progress.append
+        ))
+        self.assertEqual(sum(len(row['answers']) for row in rows), 3)
+        self.assertEqual(progress[-1], 2)
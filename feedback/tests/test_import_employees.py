@@ -0,0 +1,76 @@
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+
+from feedback.models import Designation, Employee
+
+from .base import FeedbackTestCase
+
+
+class ImportEmployeesTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        Designation.objects.create(name='Engineer')
+        self.existing = self.make_employee('existing')
+
+    def _write(self, rows, suffix='.jsonl'):
+        handle = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8')
+        with handle:
+            if suffix == '.csv':
+                handle.write('username,email,designation,department,employee_code\n')
+                handle.writelines(','.join(row) + '\n' for row in rows)
+            else:
+                handle.writelines(json.dumps(row) + '\n' for row in rows)
+        self.addCleanup(os.unlink, handle.name)
+        return handle.name
+
+    def _import(self, path, **options):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_employees', path, workers=1, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_users_with_profiles(self):
+        path = self._write([
+            ('ada', 'ada@example.com', 'engineer', 'Research', ''),
+            ('bob', 'bob@example.com', '', 'Sales', 'EXT-7'),
+        ], suffix='.csv')
+        out, _ = self._import(path)
+        self.assertIn("Imported 2 employees, skipped 0.", out)
+        ada = Employee.objects.get(user__username='ada')
+        self.assertEqual((ada.designation.name, ada.department_ref.name), ('Engineer', 'Research'))
+        self.assertTrue(ada.employee_code)
+        self.assertEqual(Employee.objects.get(user__username='bob').employee_code, 'EXT-7')
+
+    def test_existing_and_repeated_usernames_are_skipped(self):
+        path = self._write([{'username': 'existing'}, {'username': 'new'}, {'username': 'new'}])
+        out, _ = self._import(path)
+        self.assertIn("Imported 1 employees, skipped 2.", out)
+
+    def test_unknown_designations_are_reported_unless_created(self):
+        path = self._write([{'username': 'ada', 'designation': 'Pilot'}])
+        _, err = self._import(path)
+        self.assertIn("unknown designation 'Pilot'", err)
+        self.assertFalse(User.objects.filter(username='ada').exists())
+        self._import(path, create_designations=True)
+        self.assertEqual(Employee.objects.get(user__username='ada').designation.name, 'Pilot')
+
+    def test_duplicate_employee_codes_are_reported_and_skipped(self):
+        path = self._write([
+            {'username': 'clash_db', 'employee_code': self.existing.employee_code},
+            {'username': 'first', 'employee_code': 'EXT-1'},
+            {'username': 'clash_file', 'employee_code': 'EXT-1'},
+        ])
+        out, err = self._import(path, batch_size=2)
+        self.assertIn("Imported 1 employees, skipped 2.", out)
+        self.assertIn(f"Skipping clash_db: employee_code {self.existing.employee_code!r} is already in use", err)
+        self.assertIn("Skipping clash_file: employee_code 'EXT-1' is already in use", err)
+        self.assertEqual(Employee.objects.get(employee_code='EXT-1').user.username, 'first')
+
+    def test_hashing_failure_names_the_batch(self):
+        path = self._write([{'username': 'ada'}, {'username': 'bob', 'password': ['not', 'a', 'string']}])
+        with self.assertRaisesRegex(CommandError, r"from 'ada' to 'bob' failed: TypeError.*0 employees were imported"):
+            self._import(path)
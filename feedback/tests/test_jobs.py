@@ -0,0 +1,87 @@
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+
+from feedback import jobs
+from feedback.models import BackgroundJob
+
+from .base import FeedbackTestCase
+
+
+class BackgroundJobQueueTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.results = Path(directory.name)
+        settings_override = override_settings(FEEDBACK_JOB_RESULTS_DIR=self.results)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _go_stale(self, job):
+        BackgroundJob.objects.filter(id=job.id).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+    def test_jobs_are_claimed_oldest_first_and_only_once(self):
+        first = jobs.enqueue_job(BackgroundJob.KIND_REBUILD_ROLLUPS)
+        second = jobs.enqueue_job(BackgroundJob.KIND_REBUILD_ROLLUPS)
+        claimed = jobs.claim_next_job('worker-a')
+        self.assertEqual((claimed.id, claimed.status, claimed.attempts, claimed.worker),
+                         (first.id, BackgroundJob.STATUS_RUNNING, 1, 'worker-a'))
+        self.assertEqual(jobs.claim_next_job('worker-b').id, second.id)
+        self.assertIsNone(jobs.claim_next_job('worker-c'))
+
+    def test_stale_jobs_are_requeued_and_the_old_claim_loses_its_writes(self):
+        jobs.enqueue_job(BackgroundJob.KIND_REBUILD_ROLLUPS)
+        lost = jobs.claim_next_job('worker-a')
+        self.assertEqual(jobs.requeue_stale_jobs(60), 0)
+        self._go_stale(lost)
+        self.assertEqual(jobs.requeue_stale_jobs(60), 1)
+
+        reclaimed = jobs.claim_next_job('worker-b')
+        self.assertEqual((reclaimed.id, reclaimed.attempts), (lost.id, 2))
+        jobs.JobProgress(lost).update(99, force=True)
+        reclaimed.refresh_from_db()
+        self.assertEqual((reclaimed.progress, reclaimed.worker), (0, 'worker-b'))
+
+    def test_jobs_fail_after_max_attempts(self):
+        job = jobs.enqueue_job(BackgroundJob.KIND_REBUILD_ROLLUPS)
+        BackgroundJob.objects.filter(id=job.id).update(max_attempts=2)
+        for _ in range(2):
+            claimed = jobs.claim_next_job('worker')
+            self._go_stale(claimed)
+            jobs.requeue_stale_jobs(60)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.STATUS_FAILED, 2))
+        self.assertIn("last allowed attempt", job.message)
+        self.assertIsNone(jobs.claim_next_job('worker'))
+
+    def test_work_runs_queued_jobs_and_stores_results(self):
+        job = jobs.enqueue_job(BackgroundJob.KIND_REBUILD_ROLLUPS)
+        jobs.work('worker', once=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.message, "Rebuilt 0 rollup rows.")
+        self.assertIn("Rebuilt 0 rollup rows.", (self.results / job.result_file).read_text())
+
+    def test_handler_errors_fail_the_job(self):
+        job = jobs.enqueue_job(BackgroundJob.KIND_IMPORT_EMPLOYEES, {'upload': 'missing.csv'})
+        self.assertFalse(jobs.run_job(jobs.claim_next_job('worker')))
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertIn("does not exist", job.message)
+
+    def test_heartbeat_beats_while_the_handler_runs(self):
+        jobs.enqueue_job(BackgroundJob.KIND_REBUILD_ROLLUPS)
+        job = jobs.claim_next_job('worker')
+        with mock.patch.object(jobs, 'touch_heartbeat') as touch:
+            with jobs.JobHeartbeat(job, interval=0.01):
+                time.sleep(0.1)
+            beats = touch.call_count
+            time.sleep(0.05)
+        self.assertGreaterEqual(beats, 2)
+        self.assertEqual(touch.call_count, beats)
@@ -0,0 +1,41 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from feedback.listings import build_submission_listing, listing_rows
+from feedback.models import FeedbackSubmission
+from feedback.serializers import FeedbackSubmissionSerializer
+
+from .base import FeedbackTestCase
+
+
+class SubmissionListingTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', designation='Engineer', staff=True)
+        self.admin.user.first_name = 'Ada'
+        self.admin.user.save()
+        self.other = self.make_employee('other')
+        self.first, self.retired = self.make_questions(2)
+        self.submit(self.admin, self.other, [(self.first, 4, 'good'), (self.retired, 3)])
+        self.submit(self.other, self.admin, [(self.first, 1)])
+        self.retired.is_active = False
+        self.retired.save()
+
+    def test_matches_the_model_serializer(self):
+        submissions = FeedbackSubmission.objects.order_by('id')
+        expected = FeedbackSubmissionSerializer(submissions, many=True).data
+        self.assertEqual(build_submission_listing(listing_rows(submissions)), expected)
+
+    def test_admin_filter_query_count_does_not_grow_with_the_page(self):
+        client = self.client_for(self.admin)
+        url = reverse('admin-feedback-filter')
+        client.post(url, {}, format='json')  # Load the question catalogue.
+        with CaptureQueriesContext(connection) as small:
+            client.post(url + '?page_size=2', {}, format='json')
+        for _ in range(5):
+            self.submit(self.admin, self.other, [(self.first, 5), (self.retired, 2)])
+        with CaptureQueriesContext(connection) as large:
+            response = client.post(url + '?page_size=10', {}, format='json')
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertEqual(len(large), len(small))
@@ -0,0 +1,127 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from feedback.changes import encode_cursor
+from feedback.live import LiveFilter, Subscriber, format_event, get_publisher, stream_events
+
+from .base import FeedbackTestCase
+
+
+def row(**values):
+    return {
+        'target_employee_id': 1,
+        'submitted_by__designation_id': 7,
+        'submitted_by__designation__name_key': 'engineering lead',
+        'submitted_by__department_ref__key': 'engineering',
+        'answer_count': 2,
+        'rating_sum': 5,
+        'rating_min': 1,
+        **values,
+    }
+
+
+def parse_event(payload):
+    fields = dict(line.split(': ', 1) for line in payload.decode().strip().splitlines())
+    return fields['event'], json.loads(fields['data'])
+
+
+class LiveFilterTests(SimpleTestCase):
+    def test_names_match_by_prefix_unless_exact(self):
+        self.assertTrue(LiveFilter({'designation': 'Engineering'}).matches(row()))
+        self.assertFalse(LiveFilter({'designation': 'Engineering', 'match': 'exact'}).matches(row()))
+        self.assertTrue(LiveFilter({'department': ' ENGINEERING', 'match': 'exact'}).matches(row()))
+        self.assertFalse(LiveFilter({'department': 'sales'}).matches(row()))
+        self.assertFalse(LiveFilter({'department': 'eng'}).matches(row(submitted_by__department_ref__key=None)))
+
+    def test_ids_and_ratings(self):
+        self.assertTrue(LiveFilter({'designation': '7', 'target_employee_id': 1}).matches(row()))
+        self.assertFalse(LiveFilter({'target_employee_id': 2}).matches(row()))
+        self.assertTrue(LiveFilter({'max_average_rating': 2.5, 'max_rating': 1}).matches(row()))
+        self.assertFalse(LiveFilter({'max_average_rating': 2}).matches(row()))
+        self.assertFalse(LiveFilter({'max_rating': 1}).matches(row(answer_count=0, rating_sum=0, rating_min=None)))
+
+
+class SubscriberTests(SimpleTestCase):
+    async def test_a_full_queue_drops_events_until_drained_then_reports_a_gap(self):
+        subscriber = Subscriber(LiveFilter({}), buffer_size=2, last_cursor='start')
+        for n in range(4):
+            subscriber.offer(f'c{n}', b'event %d' % n)
+        self.assertEqual(await subscriber.next_event(1), b'event 0')
+        # Room again, but the backlog must drain before anything new is queued.
+        subscriber.offer('c4', b'event 4')
+        self.assertEqual(await subscriber.next_event(1), b'event 1')
+
+        event, data = parse_event(await subscriber.next_event(1))
+        self.assertEqual((event, data), ('gap', {'dropped': 3, 'resume_after': 'c1'}))
+        self.assertIsNone(await subscriber.next_event(0.01))
+
+
+@override_settings(FEEDBACK_LIVE_POLL_SECONDS=0.01, FEEDBACK_LIVE_HEARTBEAT_SECONDS=0.01)
+class FeedbackPublisherTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', designation='Engineer', staff=True)
+        self.sales = self.make_employee('sales', designation='Manager')
+        self.question, = self.make_questions(1)
+        self.submit(self.admin, self.sales, [(self.question, 3)])
+
+    async def _next(self, subscriber):
+        event = await subscriber.next_event(5)
+        self.assertIsNotNone(event)
+        return parse_event(event)
+
+    async def test_new_submissions_reach_matching_subscribers_only(self):
+        publisher = get_publisher()
+        engineers = await publisher.subscribe(LiveFilter({'designation': 'eng'}))
+        managers = await publisher.subscribe(LiveFilter({'designation': 'manager', 'max_rating': 2}))
+        submission = await sync_to_async(self.submit)(self.admin, self.sales, [(self.question, 4, 'solid')])
+
+        event, data = await self._next(engineers)
+        self.assertEqual((event, data['id'], data['submitted_by']), ('submission', submission.id, self.admin.id))
+        self.assertTrue(engineers.queue.empty())
+        self.assertIsNone(await managers.next_event(0.05))
+
+        publisher.unsubscribe(engineers)
+        publisher.unsubscribe(managers)
+        await publisher.task
+        self.assertIsNone(publisher.position)
+
+    async def test_stream_reports_a_gap_for_a_stale_last_event_id(self):
+        events = stream_events(LiveFilter({}), last_event_id=encode_cursor(0))
+        self.assertEqual(await anext(events), b'retry: 5000\n\n')
+        event, data = parse_event(await anext(events))
+        self.assertEqual((event, data), ('gap', {'dropped': None, 'resume_after': encode_cursor(0)}))
+        self.assertEqual(await anext(events), b': keepalive\n\n')
+        await events.aclose()
+        await get_publisher().task
+
+    def test_format_event(self):
+        self.assertEqual(format_event('gap', {'a': 1}, event_id='c'), b'id: c\nevent: gap\ndata: {"a": 1}\n\n')
+
+
+class FeedbackStreamViewTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', staff=True)
+        self.other = self.make_employee('other')
+
+    def _auth(self, employee):
+        return {'Authorization': f'Bearer {AccessToken.for_user(employee.user)}'}
+
+    async def test_staff_only(self):
+        response = await self.async_client.get(reverse('async-feedback-stream'), headers=self._auth(self.other))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_invalid_filters_are_rejected(self):
+        response = await self.async_client.get(
+            reverse('async-feedback-stream') + '?max_rating=9', headers=self._auth(self.admin)
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_served_over_wsgi(self):
+        response = self.client.get(reverse('async-feedback-stream'), headers=self._auth(self.admin))
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,57 @@
+import gc
+import threading
+
+from django.test import override_settings
+from django.urls import reverse
+
+from feedback import metrics
+from feedback.metrics import MetricsRegistry
+
+from .base import FeedbackTestCase
+
+
+def _record(registry, view='feedback-questions', status=200, queries=1):
+    record = metrics._RequestRecord(None)
+    record.queries = queries
+    registry.observe_request(view, 'GET', status, 0.02, record, 100)
+
+
+class MetricsRegistryTests(FeedbackTestCase):
+    def test_shards_of_exited_threads_are_folded_into_the_totals(self):
+        registry = MetricsRegistry()
+        _record(registry)
+        threads = [threading.Thread(target=_record, args=(registry,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        del threads, thread
+        gc.collect()
+
+        self.assertEqual(len(registry._shards), 1)
+        views, _ = registry.snapshot()
+        stats = views[('feedback-questions', 'GET')]
+        self.assertEqual((stats.count, stats.queries, stats.statuses), (6, 6, {200: 6}))
+
+    def test_render_exposes_counters_and_histograms(self):
+        registry = MetricsRegistry()
+        _record(registry, queries=3)
+        _record(registry, status=404, queries=0)
+        text = registry.render()
+        self.assertIn('feedback_http_requests_total{view="feedback-questions",method="GET",status="200"} 1', text)
+        self.assertIn('feedback_http_requests_total{view="feedback-questions",method="GET",status="404"} 1', text)
+        self.assertIn('feedback_db_queries_per_request_bucket{view="feedback-questions",method="GET",le="2"} 1', text)
+        self.assertIn('feedback_db_queries_per_request_sum{view="feedback-questions",method="GET"} 3', text)
+
+
+@override_settings(FEEDBACK_METRICS_TOKEN='scrape-token')
+class MetricsEndpointTests(FeedbackTestCase):
+    def test_requests_are_counted_per_view(self):
+        employee = self.make_employee('ada')
+        self.client_for(employee).get(reverse('feedback-questions'))
+        response = self.client.get(reverse('metrics'), headers={'Authorization': 'Bearer scrape-token'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('view="feedback-questions",method="GET",status="200"', response.content.decode())
+
+    def test_scrapes_need_the_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
@@ -0,0 +1,56 @@
+from django.urls import reverse
+
+from feedback.filters import name_lookup
+from feedback.models import Department, Designation, Employee, lookup_key
+
+from .base import FeedbackTestCase
+
+
+class NameLookupTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', designation='Engineer', department='Engineering', staff=True)
+        self.lead = self.make_employee('lead', designation='Engineering Lead', department='  engineering ')
+        self.sales = self.make_employee('sales', designation='Manager', department='Sales')
+        question, = self.make_questions(1)
+        for employee in (self.admin, self.lead, self.sales):
+            self.submit(employee, self.admin, [(question, 3)])
+
+    def _submitters(self, **body):
+        response = self.client_for(self.admin).post(reverse('admin-feedback-filter'), body, format='json')
+        self.assertEqual(response.status_code, 200)
+        return {row['submitted_by'] for row in response.data['results']}
+
+    def test_keys_are_case_folded_with_whitespace_collapsed(self):
+        self.assertEqual(lookup_key('  Engineering   Lead '), 'engineering lead')
+        self.assertEqual(Designation.objects.get(name='Engineering Lead').name_key, 'engineering lead')
+
+    def test_department_spellings_share_one_row(self):
+        self.assertEqual(Department.objects.filter(key='engineering').count(), 1)
+        self.assertEqual(self.admin.department_ref_id, self.lead.department_ref_id)
+        self.assertEqual(Department.objects.get(key='engineering').name, 'Engineering')
+
+    def test_changing_the_department_text_moves_the_reference(self):
+        self.sales.department = 'Engineering'
+        self.sales.save(update_fields=['department'])
+        self.assertEqual(Employee.objects.get(pk=self.sales.pk).department_ref_id, self.admin.department_ref_id)
+
+    def test_for_names_creates_missing_departments_once(self):
+        departments = Department.for_names(['Support', 'support ', 'Sales', ''])
+        self.assertEqual(set(departments), {'support', 'sales'})
+        self.assertEqual(departments['sales'].pk, self.sales.department_ref_id)
+        self.assertEqual(Department.objects.filter(key='support').count(), 1)
+
+    def test_name_lookup_is_a_prefix_range_by_default(self):
+        keys = Designation.objects.filter(**name_lookup('name_key', 'ENGINEER')).values_list('name', flat=True)
+        self.assertEqual(sorted(keys), ['Engineer', 'Engineering Lead'])
+        exact = Designation.objects.filter(**name_lookup('name_key', 'ENGINEER', 'exact'))
+        self.assertEqual(list(exact.values_list('name', flat=True)), ['Engineer'])
+
+    def test_admin_filter_matches_prefix_or_exact(self):
+        engineers = {self.admin.id, self.lead.id}
+        self.assertEqual(self._submitters(designation='engineer'), engineers)
+        self.assertEqual(self._submitters(designation='engineer', match='exact'), {self.admin.id})
+        self.assertEqual(self._submitters(department='ENG'), engineers)
+        self.assertEqual(self._submitters(department='eng', match='exact'), set())
+        self.assertEqual(self._submitters(designation=str(self.sales.designation_id)), {self.sales.id})
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from feedback.models import FeedbackSubmission
+
+from .base import FeedbackTestCase
+
+
+class SubmissionCursorPaginationTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', staff=True)
+        self.other = self.make_employee('other')
+        question, = self.make_questions(1)
+        now = timezone.now()
+        # Pairs of submissions share a created_at, so ties must be broken by id.
+        for n in range(7):
+            self.submit(self.admin, self.other, [(question, 3)], created_at=now - timedelta(minutes=n // 2))
+        self.submit(self.other, self.admin, [(question, 5)], created_at=now)
+        self.expected = list(
+            FeedbackSubmission.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def _pages(self, client, url, method='post'):
+        ids, pages, next_url = [], [], url
+        while next_url:
+            response = client.post(next_url, {}, format='json') if method == 'post' else client.get(next_url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            ids.extend(row['id'] for row in response.data['results'])
+            next_url = response.data['next']
+        return ids, pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        client = self.client_for(self.admin)
+        ids, pages = self._pages(client, reverse('admin-feedback-filter') + '?page_size=3')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 2])
+
+    def test_previous_link_returns_the_previous_page(self):
+        client = self.client_for(self.admin)
+        first = client.post(reverse('admin-feedback-filter') + '?page_size=3', {}, format='json').data
+        second = client.post(first['next'], {}, format='json').data
+        back = client.post(second['previous'], {}, format='json').data
+        self.assertEqual([row['id'] for row in back['results']], [row['id'] for row in first['results']])
+
+    def test_invalid_cursor_is_not_found(self):
+        client = self.client_for(self.admin)
+        response = client.post(reverse('admin-feedback-filter') + '?cursor=bogus', {}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_my_feedback_lists_only_own_submissions(self):
+        client = self.client_for(self.admin)
+        ids, _ = self._pages(client, reverse('my-feedback') + '?page_size=2', method='get')
+        own = [pk for pk in self.expected if FeedbackSubmission.objects.get(pk=pk).submitted_by_id == self.admin.id]
+        self.assertEqual(ids, own)
@@ -0,0 +1,23 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from feedback.management.commands.check_query_plans import NEWEST_FIRST_WALK, Command
+
+
+class CheckQueryPlansTests(TestCase):
+    def test_endpoint_queries_use_indexes(self):
+        out = io.StringIO()
+        call_command('check_query_plans', seed=200, stdout=out)
+        self.assertIn("All endpoint query plans use indexes.", out.getvalue())
+
+    def test_scans_of_feedback_tables_are_flagged(self):
+        is_full_scan = Command()._is_full_scan
+        self.assertTrue(is_full_scan('SCAN feedback_feedbackanswer', True, ()))
+        self.assertTrue(is_full_scan('SCAN feedback_feedbacksubmission USING INDEX other_idx', True, ()))
+        self.assertTrue(is_full_scan('SCAN feedback_feedbackanswer USING COVERING INDEX answer_idx', False, ()))
+        self.assertFalse(is_full_scan('SCAN feedback_feedbackanswer USING COVERING INDEX answer_idx', True, ()))
+        self.assertFalse(is_full_scan(NEWEST_FIRST_WALK, True, (NEWEST_FIRST_WALK,)))
+        self.assertFalse(is_full_scan('SCAN feedback_designation', False, ()))
+        self.assertFalse(is_full_scan('SEARCH feedback_feedbackanswer USING INDEX answer_idx (question_id=?)', False, ()))
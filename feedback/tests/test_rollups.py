@@ -0,0 +1,105 @@
+import io
+from datetime import timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from feedback.changes import recording_deletions
+from feedback.models import FeedbackAnswer, FeedbackRatingRollup
+from feedback.rollups import ROLLUP_FIELDS, rollup_aggregates_from_answers
+
+from .base import FeedbackTestCase
+
+
+def rollup_table():
+    return {
+        (row.pop('target_employee_id'), row.pop('question_id'), row.pop('day')): row
+        for row in FeedbackRatingRollup.objects.values('target_employee_id', 'question_id', 'day', *ROLLUP_FIELDS)
+    }
+
+
+def live_aggregation():
+    return {
+        (row.pop('submission__target_employee_id'), row.pop('question_id'), row.pop('day')): row
+        for row in rollup_aggregates_from_answers()
+    }
+
+
+class RatingRollupTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', staff=True)
+        self.other = self.make_employee('other')
+        self.first, self.second = self.make_questions(2)
+        yesterday = timezone.now() - timedelta(days=1)
+        self.kept = self.submit(self.admin, self.other, [(self.first, 5), (self.second, 4)])
+        self.dropped = self.submit(self.other, self.admin, [(self.first, 2)], created_at=yesterday)
+        self.submit(self.admin, self.other, [(self.first, 2), (self.second, 1)], created_at=yesterday)
+
+    def _histogram(self, question):
+        response = self.client_for(self.admin).post(
+            reverse('admin-feedback-analytics'), {'group_by': 'question'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['source'], 'rollups')
+        return next(row['histogram'] for row in response.data['results'] if row['key'] == question.id)
+
+    def test_rollups_match_live_aggregation(self):
+        self.assertEqual(rollup_table(), live_aggregation())
+
+    def test_rebuild_reproduces_incremental_rollups(self):
+        before = rollup_table()
+        call_command('rebuild_rating_rollups', stdout=io.StringIO())
+        self.assertEqual(rollup_table(), before)
+
+    def test_deleting_a_submission_takes_its_answers_out_of_the_histogram(self):
+        self.assertEqual(self._histogram(self.first)['2'], 2)
+        self.dropped.delete()
+        self.assertEqual(self._histogram(self.first), {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1})
+        self.assertEqual(rollup_table(), live_aggregation())
+
+    def test_rows_left_without_answers_are_removed(self):
+        self.dropped.delete()
+        self.assertFalse(FeedbackRatingRollup.objects.filter(target_employee=self.admin).exists())
+
+    def test_changing_a_rating_moves_it_between_buckets(self):
+        answer = FeedbackAnswer.objects.get(submission=self.kept, question=self.first)
+        answer.rating = 3
+        answer.save()
+        self.assertEqual(self._histogram(self.first), {'1': 0, '2': 2, '3': 1, '4': 0, '5': 0})
+        self.assertEqual(rollup_table(), live_aggregation())
+
+    def test_moving_a_submission_moves_its_answers(self):
+        self.kept.created_at -= timedelta(days=3)
+        self.kept.target_employee = self.admin
+        self.kept.save()
+        self.assertEqual(rollup_table(), live_aggregation())
+
+    def test_archive_deletions_keep_their_rollups(self):
+        before = rollup_table()
+        with recording_deletions('archive'):
+            self.dropped.delete()
+        self.assertEqual(rollup_table(), before)
+
+    def test_deleting_a_question_or_employee_cascades_cleanly(self):
+        self.second.delete()
+        self.admin.delete()
+        self.assertEqual(rollup_table(), live_aggregation())
+
+    def test_answers_without_a_target_share_one_row_per_question_and_day(self):
+        for _ in range(3):
+            self.submit(self.admin, None, [(self.first, 4)])
+        row, = FeedbackRatingRollup.objects.filter(target_employee__isnull=True)
+        self.assertEqual((row.answer_count, row.rating_4), (3, 3))
+
+        FeedbackAnswer.objects.filter(submission__target_employee__isnull=True).first().delete()
+        self.assertEqual(rollup_table(), live_aggregation())
+
+    def test_migration_rebuilds_rollups_from_existing_answers(self):
+        self.submit(self.admin, None, [(self.second, 3)])
+        FeedbackRatingRollup.objects.all().delete()
+        import_module('feedback.migrations.0016_rebuild_rating_rollups').rebuild_rollups(apps, None)
+        self.assertEqual(rollup_table(), live_aggregation())
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase
+
+from feedback.models import FeedbackSubmission
+from feedback.routers import (
+    REPORTING_DB_ALIAS, ReportingRouter, reporting, reporting_alias, use_reporting_database,
+)
+
+
+class ReportingRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReportingRouter()
+
+    def _with_reporting_alias(self):
+        return mock.patch.dict(connections.databases, {REPORTING_DB_ALIAS: dict(connections.databases['default'])})
+
+    def test_reads_use_default_outside_reporting_blocks(self):
+        with self._with_reporting_alias():
+            self.assertEqual(reporting_alias(), DEFAULT_DB_ALIAS)
+            self.assertIsNone(self.router.db_for_read(FeedbackSubmission))
+
+    def test_reads_inside_reporting_blocks_use_the_reporting_alias(self):
+        with self._with_reporting_alias(), reporting():
+            self.assertEqual(reporting_alias(), REPORTING_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(FeedbackSubmission), REPORTING_DB_ALIAS)
+            self.assertEqual(self.router.db_for_write(FeedbackSubmission), DEFAULT_DB_ALIAS)
+        self.assertEqual(reporting_alias(), DEFAULT_DB_ALIAS)
+
+    def test_falls_back_to_default_without_a_reporting_database(self):
+        with reporting():
+            self.assertEqual(reporting_alias(), DEFAULT_DB_ALIAS)
+
+    def test_decorated_handlers_read_from_reporting(self):
+        @use_reporting_database
+        def handler():
+            return reporting_alias()
+
+        with self._with_reporting_alias():
+            self.assertEqual(handler(), REPORTING_DB_ALIAS)
+            self.assertEqual(reporting_alias(), DEFAULT_DB_ALIAS)
+
+    def test_only_default_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'feedback'))
+        self.assertFalse(self.router.allow_migrate(REPORTING_DB_ALIAS, 'feedback'))
@@ -0,0 +1,64 @@
+from django.urls import reverse
+
+from feedback.models import FeedbackAnswer
+
+from .base import FeedbackTestCase
+
+
+class FeedbackSearchTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', department='Engineering', staff=True)
+        self.sales = self.make_employee('sales', department='Sales')
+        self.question, = self.make_questions(1)
+        self.submit(self.admin, self.sales, [(self.question, 4, 'Great communication with the team')])
+        self.submit(self.sales, self.admin, [(self.question, 2, 'Communication could improve, communication matters')])
+        self.submit(self.sales, self.admin, [(self.question, 3, 'Reliable with deadlines')])
+
+    def _search(self, **body):
+        return self.client_for(self.admin).post(reverse('admin-feedback-search'), body, format='json')
+
+    def _comments(self, **body):
+        response = self._search(**body)
+        self.assertEqual(response.status_code, 200)
+        return [row['comment'] for row in response.data['results']]
+
+    def test_matches_are_ranked_by_relevance(self):
+        self.assertEqual(self._comments(q='communication'), [
+            'Communication could improve, communication matters',
+            'Great communication with the team',
+        ])
+
+    def test_count_is_the_total_number_of_matches(self):
+        response = self._search(q='communication', limit=1)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['count'], 2)
+        response = self._search(q='communication', department='Engineering', offset=1)
+        self.assertEqual((response.data['count'], response.data['results']), (1, []))
+
+    def test_phrase_matches_literal_text(self):
+        self.assertEqual(self._comments(q='with the', phrase=True), ['Great communication with the team'])
+        self.assertEqual(self._comments(q='deadlines with', phrase=True), [])
+
+    def test_admin_filters_apply(self):
+        self.assertEqual(self._comments(q='communication', department='Engineering'), [
+            'Great communication with the team',
+        ])
+
+    def test_invalid_query_is_a_validation_error(self):
+        response = self._search(q='"unbalanced')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('q', response.data)
+
+    def test_index_follows_comment_edits_and_deletes(self):
+        answer = FeedbackAnswer.objects.get(comment='Reliable with deadlines')
+        answer.comment = 'Always punctual'
+        answer.save()
+        self.assertEqual(self._comments(q='deadlines'), [])
+        self.assertEqual(self._comments(q='punctual'), ['Always punctual'])
+        answer.submission.delete()
+        self.assertEqual(self._comments(q='punctual'), [])
+
+    def test_requires_staff(self):
+        response = self.client_for(self.sales).post(reverse('admin-feedback-search'), {'q': 'x'}, format='json')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,40 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from feedback.models import FeedbackAnswer, FeedbackChange, FeedbackSubmission
+
+from .base import FeedbackTestCase
+from .test_rollups import live_aggregation, rollup_table
+
+
+class SeedFeedbackTests(FeedbackTestCase):
+    def _seed(self, **options):
+        options = {'employees': 20, 'questions': 4, 'submissions': 60, 'answers_per_submission': 2,
+                   'days': 30, 'batch_size': 25, **options}
+        call_command('seed_feedback', stdout=io.StringIO(), **options)
+
+    def test_seeds_reproducible_backdated_feedback(self):
+        started = timezone.now()
+        self._seed()
+        self.assertEqual(FeedbackSubmission.objects.count(), 60)
+        self.assertEqual(FeedbackAnswer.objects.count(), 120)
+        span = FeedbackSubmission.objects.aggregate(first=Min('created_at'), last=Max('created_at'))
+        self.assertLess(span['first'], started - timedelta(days=7))
+        self.assertLessEqual(span['last'], started)
+        self.assertEqual(rollup_table(), live_aggregation())
+        self.assertEqual(FeedbackChange.objects.filter(entity='submission').count(), 60)
+
+    def test_created_at_keeps_auto_now_add(self):
+        self._seed(skip_change_log=True)
+        self.assertTrue(FeedbackSubmission._meta.get_field('created_at').auto_now_add)
+        self.assertFalse(FeedbackChange.objects.exists())
+        seeded = FeedbackSubmission.objects.select_related('submitted_by', 'target_employee').first()
+        before = timezone.now()
+        submission = FeedbackSubmission.objects.create(
+            submitted_by=seeded.submitted_by, target_employee=seeded.target_employee, created_at=before - timedelta(days=9)
+        )
+        self.assertGreaterEqual(submission.created_at, before)
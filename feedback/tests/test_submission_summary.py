@@ -0,0 +1,72 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.urls import reverse
+
+from feedback.models import FeedbackAnswer, FeedbackSubmission
+
+from .base import FeedbackTestCase
+
+SUMMARY_FIELDS = ('answer_count', 'rating_sum', 'rating_min', 'rating_max', 'has_comment')
+
+
+class SubmissionSummaryTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', staff=True)
+        self.other = self.make_employee('other')
+        self.first, self.second = self.make_questions(2)
+        self.low = self.submit(self.admin, self.other, [(self.first, 1), (self.second, 4, 'steady')])
+        self.high = self.submit(self.other, self.admin, [(self.first, 5)])
+
+    def _summary(self, submission):
+        return FeedbackSubmission.objects.values_list(*SUMMARY_FIELDS).get(pk=submission.pk)
+
+    def test_created_submissions_are_summarised(self):
+        self.assertEqual(self._summary(self.low), (2, 5, 1, 4, True))
+        self.assertEqual(self._summary(self.high), (1, 5, 5, 5, False))
+
+    def test_editing_an_answer_refreshes_the_summary(self):
+        answer = FeedbackAnswer.objects.get(submission=self.high)
+        answer.rating = 2
+        answer.comment = 'late'
+        answer.save()
+        self.assertEqual(self._summary(self.high), (1, 2, 2, 2, True))
+
+    def test_adding_deleting_and_moving_answers(self):
+        FeedbackAnswer.objects.create(submission=self.high, question=self.second, rating=3)
+        self.assertEqual(self._summary(self.high), (2, 8, 3, 5, False))
+
+        moved = FeedbackAnswer.objects.get(submission=self.low, question=self.second)
+        moved.submission = self.high
+        moved.save()
+        self.assertEqual(self._summary(self.low), (1, 1, 1, 1, False))
+        self.assertEqual(self._summary(self.high), (3, 12, 3, 5, True))
+
+        FeedbackAnswer.objects.filter(submission=self.low).delete()
+        self.assertEqual(self._summary(self.low), (0, 0, None, None, False))
+
+    def test_deleting_a_question_refreshes_the_summaries_it_touched(self):
+        self.second.delete()
+        self.assertEqual(self._summary(self.low), (1, 1, 1, 1, False))
+        self.high.delete()
+        self.assertFalse(FeedbackSubmission.objects.filter(pk=self.high.pk).exists())
+
+    def test_migration_backfills_existing_rows(self):
+        FeedbackSubmission.objects.update(
+            answer_count=0, rating_sum=0, rating_min=None, rating_max=None, has_comment=False
+        )
+        import_module('feedback.migrations.0011_submission_summary').backfill_summaries(apps, None)
+        self.assertEqual(self._summary(self.low), (2, 5, 1, 4, True))
+        self.assertEqual(self._summary(self.high), (1, 5, 5, 5, False))
+
+    def test_rating_filters_read_the_summary_columns(self):
+        client = self.client_for(self.admin)
+        response = client.post(reverse('admin-feedback-filter'), {'max_average_rating': 3}, format='json')
+        self.assertEqual([row['id'] for row in response.data['results']], [self.low.id])
+        analytics = client.post(
+            reverse('admin-feedback-analytics'), {'group_by': 'question', 'max_rating': 1}, format='json'
+        ).data
+        self.assertEqual(analytics['source'], 'answers')
+        results = {row['key']: row['count'] for row in analytics['results']}
+        self.assertEqual(results, {self.first.id: 1, self.second.id: 1})
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from feedback.serializers import resolve_answer_questions
+
+from .base import FeedbackTestCase
+
+
+class ResolveAnswerQuestionsTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first, self.second = self.make_questions(2)
+        self.project, = self.make_questions(1, feedback_type='project')
+        self.questions = {q.id: q for q in (self.first, self.second, self.project)}
+
+    def test_resolves_ids_to_questions(self):
+        answers, errors = resolve_answer_questions(
+            [{'question_id': self.first.id, 'rating': 4}, {'question_id': self.second.id, 'rating': 2, 'comment': 'ok'}],
+            self.questions,
+        )
+        self.assertIsNone(errors)
+        self.assertEqual([(a['question'], a['rating'], a['comment']) for a in answers], [
+            (self.first, 4, ''), (self.second, 2, 'ok'),
+        ])
+
+    def test_errors_are_aligned_with_answers(self):
+        _, errors = resolve_answer_questions([
+            {'question_id': self.first.id, 'rating': 4},
+            {'question_id': 10 ** 6, 'rating': 4},
+            {'question_id': self.first.id, 'rating': 3},
+            {'question_id': self.project.id, 'rating': 3},
+        ], self.questions)
+        self.assertEqual(errors[0], {})
+        self.assertIn('does not exist', errors[1]['question_id'][0])
+        self.assertEqual(errors[2], {'question_id': ["Duplicate answer for this question."]})
+        self.assertEqual(errors[3], {'question_id': ['Question is not a "employee" question.']})
+
+    def test_explicit_feedback_type_is_enforced(self):
+        _, errors = resolve_answer_questions([{'question_id': self.first.id, 'rating': 4}], self.questions, 'project')
+        self.assertEqual(errors, [{'question_id': ['Question is not a "project" question.']}])
+
+
+class SubmitFeedbackValidationTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_employee('author')
+        self.target = self.make_employee('target')
+        self.questions = self.make_questions(6)
+        self.api = self.client_for(self.author)
+
+    def _submit(self, questions):
+        body = {
+            'target_employee_id': self.target.id,
+            'answers': [{'question_id': q.id, 'rating': 3} for q in questions],
+        }
+        return self.api.post(reverse('submit-feedback'), body, format='json')
+
+    def test_inactive_questions_are_rejected(self):
+        self.questions[0].is_active = False
+        self.questions[0].save()
+        response = self._submit(self.questions[:2])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('question_id', response.data['answers'][0])
+
+    def test_query_count_does_not_grow_with_answers(self):
+        self.assertEqual(self._submit(self.questions[:1]).status_code, 201)
+        with CaptureQueriesContext(connection) as one:
+            self.assertEqual(self._submit(self.questions[:1]).status_code, 201)
+        with CaptureQueriesContext(connection) as six:
+            self.assertEqual(self._submit(self.questions).status_code, 201)
+        self.assertEqual(len(six), len(one))
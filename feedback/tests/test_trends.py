@@ -0,0 +1,75 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.urls import reverse
+
+from feedback.trends import _moving, period_axis
+
+from .base import FeedbackTestCase
+
+
+def at(year, month, day):
+    return datetime(year, month, day, 12, tzinfo=dt_timezone.utc)
+
+
+class FeedbackTrendTests(FeedbackTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_employee('admin', staff=True)
+        self.engineer = self.make_employee('engineer', designation='Engineer', department='Engineering')
+        self.manager = self.make_employee('manager', designation='Manager', department='Sales')
+        self.first, self.second = self.make_questions(2)
+        self.submit(self.admin, self.engineer, [(self.first, 2), (self.second, 5)], created_at=at(2026, 1, 10))
+        self.submit(self.manager, self.engineer, [(self.first, 4)], created_at=at(2026, 1, 20))
+        self.submit(self.admin, self.engineer, [(self.first, 5)], created_at=at(2026, 3, 5))
+        self.submit(self.admin, self.manager, [(self.first, 1)], created_at=at(2026, 2, 1))
+
+    def _trend(self, **body):
+        response = self.client_for(self.admin).post(reverse('admin-feedback-trends'), body, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_monthly_series_share_an_axis_with_empty_periods(self):
+        data = self._trend(target_employee_id=self.engineer.id, window=2)
+        self.assertEqual(data['periods'], ['2026-01-01', '2026-02-01', '2026-03-01'])
+        first, second = data['questions']
+        self.assertEqual(first['question_id'], self.first.id)
+        self.assertEqual(first['answer_count'], [2, 0, 1])
+        self.assertEqual(first['mean'], [3.0, None, 5.0])
+        self.assertEqual(first['stddev'], [1.0, None, 0.0])
+        self.assertEqual(first['moving_average'], [3.0, 3.0, 5.0])
+        self.assertEqual(first['delta'], [None, None, None])
+        self.assertEqual(second['answer_count'], [1, 0, 0])
+        self.assertEqual(data['overall']['answer_count'], [3, 0, 1])
+        self.assertEqual(data['overall']['mean'], [3.667, None, 5.0])
+
+    def test_targets_can_be_selected_by_designation_or_department(self):
+        by_designation = self._trend(designation='manager')
+        self.assertEqual(by_designation['periods'], ['2026-02-01'])
+        self.assertEqual(by_designation['overall']['mean'], [1.0])
+        by_department = self._trend(department='eng', match='prefix', period='quarter')
+        self.assertEqual(by_department['periods'], ['2026-01-01'])
+        self.assertEqual(by_department['overall']['answer_count'], [4])
+
+    def test_date_and_question_filters(self):
+        data = self._trend(
+            target_employee_ids=[self.engineer.id], question_id=self.first.id, start_date='2026-01-15'
+        )
+        self.assertEqual([question['question_id'] for question in data['questions']], [self.first.id])
+        self.assertEqual(data['questions'][0]['answer_count'], [1, 0, 1])
+        self.assertEqual(data['questions'][0]['delta'], [None, None, None])
+
+    def test_no_matching_feedback_returns_an_empty_trend(self):
+        data = self._trend(target_employee_id=self.admin.id, period='week')
+        self.assertEqual((data['periods'], data['overall'], data['questions']), ([], None, []))
+
+    def test_a_target_selection_is_required(self):
+        response = self.client_for(self.admin).post(reverse('admin-feedback-trends'), {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_period_axis_and_moving_sums(self):
+        self.assertEqual(
+            period_axis('quarter', date(2025, 10, 1), date(2026, 4, 1)),
+            [date(2025, 10, 1), date(2026, 1, 1), date(2026, 4, 1)],
+        )
+        self.assertEqual(period_axis('week', date(2026, 1, 5), date(2026, 1, 19))[-1], date(2026, 1, 19))
+        self.assertEqual(_moving([1, 2, 3, 4], 2), [1, 3, 5, 7])
@@ -0,0 +1,137 @@
+import math
+from datetime import timedelta
+from itertools import accumulate
+
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth, TruncQuarter, TruncWeek
+
+from .catalogue import active_question_map
+from .filters import name_lookup
+from .models import Department, Designation, FeedbackQuestion, FeedbackRatingRollup
+
+PERIOD_TRUNCS = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+}
+
+
+def target_filter(data):
+    """Q over FeedbackRatingRollup selecting the requested target employees."""
+    q = Q()
+    if data.get('target_employee_ids'):
+        q &= Q(target_employee_id__in=data['target_employee_ids'])
+    designation = data.get('designation')
+    if designation:
+        if str(designation).isdigit():
+            q &= Q(target_employee__designation_id=int(designation))
+        else:
+            designations = Designation.objects.filter(**name_lookup('name_key', designation, data.get('match')))
+            q &= Q(target_employee__designation__in=designations)
+    if data.get('department'):
+        departments = Department.objects.filter(**name_lookup('key', data['department'], data.get('match')))
+        q &= Q(target_employee__department_ref__in=departments)
+    return q
+
+
+def _next_period(period, start):
+    if period == 'week':
+        return start + timedelta(days=7)
+    months = 1 if period == 'month' else 3
+    month = start.month - 1 + months
+    return start.replace(year=start.year + month // 12, month=month % 12 + 1)
+
+
+def period_axis(period, first, last):
+    """Every period start from `first` to `last` inclusive (both already truncated)."""
+    axis = []
+    current = first
+    while current <= last:
+        axis.append(current)
+        current = _next_period(period, current)
+    return axis
+
+
+def _moving(values, window):
+    """Trailing window sums of `values`, via prefix sums."""
+    prefix = [0, *accumulate(values)]
+    return [prefix[i + 1] - prefix[max(0, i + 1 - window)] for i in range(len(values))]
+
+
+def _series(counts, sums, sq_sums, window):
+    means = [s / n if n else None for n, s in zip(counts, sums)]
+    window_counts = _moving(counts, window)
+    window_sums = _moving(sums, window)
+    previous = [None, *means[:-1]]
+    return {
+        'answer_count': counts,
+        'mean': [round(m, 3) if m is not None else None for m in means],
+        'stddev': [
+            round(math.sqrt(max(0.0, sq / n - (s / n) ** 2)), 3) if n else None
+            for n, s, sq in zip(counts, sums, sq_sums)
+        ],
+        'moving_average': [round(s / n, 3) if n else None for n, s in zip(window_counts, window_sums)],
+        'delta': [
+            round(m - p, 3) if m is not None and p is not None else None
+            for m, p in zip(means, previous)
+        ],
+    }
+
+
+def build_trend(data):
+    """
+    Per-question rating series for the selected targets, one value per
+    period, from a single grouped query over the rating rollups. Every
+    series shares the `periods` axis; periods without answers hold null
+    means and are skipped by the moving averages.
+    """
+    period = data['period']
+    rollups = FeedbackRatingRollup.objects.filter(target_filter(data))
+    if data.get('start_date'):
+        rollups = rollups.filter(day__gte=data['start_date'])
+    if data.get('end_date'):
+        rollups = rollups.filter(day__lte=data['end_date'])
+    if data.get('question_id'):
+        rollups = rollups.filter(question_id=data['question_id'])
+
+    rows = list(
+        rollups
+        .annotate(period=PERIOD_TRUNCS[period]('day'))
+        .values('question_id', 'period')
+        .annotate(answer_count=Sum('answer_count'), rating_sum=Sum('rating_sum'), rating_sq_sum=Sum('rating_sq_sum'))
+        .order_by('question_id', 'period')
+    )
+    if not rows:
+        return {'period': period, 'periods': [], 'overall': None, 'questions': []}
+
+    axis = period_axis(period, min(row['period'] for row in rows), max(row['period'] for row in rows))
+    position = {start: index for index, start in enumerate(axis)}
+    columns = {}
+    for row in rows:
+        counts, sums, sq_sums = columns.setdefault(row['question_id'], ([0] * len(axis), [0] * len(axis), [0] * len(axis)))
+        index = position[row['period']]
+        counts[index] = row['answer_count']
+        sums[index] = row['rating_sum']
+        sq_sums[index] = row['rating_sq_sum']
+
+    questions = active_question_map()
+    missing = set(columns) - set(questions)
+    texts = {question_id: question.text for question_id, question in questions.items()}
+    if missing:
+        texts.update(FeedbackQuestion.objects.filter(id__in=missing).values_list('id', 'text'))
+
+    window = data['window']
+    overall = [
+        [sum(column[part][index] for column in columns.values()) for index in range(len(axis))]
+        for part in range(3)
+    ]
+    return {
+        'period': period,
+        'window': window,
+        'periods': [start.isoformat() for start in axis],
+        'overall': _series(*overall, window),
+        'questions': [
+            {'question_id': question_id, 'question': texts.get(question_id, ''), **_series(*column, window)}
+            for question_id, column in sorted(columns.items())
+        ],
+    }
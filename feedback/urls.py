@@ -2,11 +2,17 @@
 from django.urls import path
 from .views import (
     RegisterView, FeedbackQuestionListAPIView, SubmitFeedbackAPIView,
-    EmployeeFeedbackListAPIView, AdminFeedbackFilterAPIView, EmployeeListAPIView
+    EmployeeFeedbackListAPIView, AdminFeedbackFilterAPIView, EmployeeListAPIView,
+    AdminFeedbackExportAPIView, AdminFeedbackAnalyticsAPIView, AdminFeedbackSearchAPIView,
+    SubmitFeedbackBatchAPIView, AdminBackgroundJobListCreateAPIView, AdminBackgroundJobDetailAPIView,
+    AdminBackgroundJobDownloadAPIView, AdminFeedbackArchiveListAPIView, AdminFeedbackArchiveQueryAPIView,
+    AdminFeedbackTrendAPIView, AdminFeedbackChangeFeedAPIView
 )
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import DesignationListCreateAPIView
 from .views import CustomTokenObtainPairView
+from . import async_views
+from .views import metrics_view, slow_queries_view
 
 urlpatterns = [
     
@@ -16,8 +22,31 @@ urlpatterns = [
     path('employees/', EmployeeListAPIView.as_view(), name='employee-list'),
     path('questions/', FeedbackQuestionListAPIView.as_view(), name='feedback-questions'),
     path('feedback/submit/', SubmitFeedbackAPIView.as_view(), name='submit-feedback'),
+    path('feedback/submit/batch/', SubmitFeedbackBatchAPIView.as_view(), name='submit-feedback-batch'),
     path('feedback/my/', EmployeeFeedbackListAPIView.as_view(), name='my-feedback'),
     path('employees/', EmployeeListAPIView.as_view(), name='employee-list'),
     path('designations/', DesignationListCreateAPIView.as_view(), name='designation-list-create'),
+
+    # Async (ASGI) variants of the read endpoints
+    path('async/questions/', async_views.question_list, name='async-feedback-questions'),
+    path('async/employees/', async_views.employee_list, name='async-employee-list'),
+    path('async/designations/', async_views.designation_list, name='async-designation-list'),
+    path('async/feedback/my/', async_views.my_feedback_list, name='async-my-feedback'),
+    path('async/admin/feedback-stream/', async_views.feedback_stream, name='async-feedback-stream'),
+
     path('admin/feedback-filter/', AdminFeedbackFilterAPIView.as_view(), name='admin-feedback-filter'),  
+    path('admin/feedback-export/', AdminFeedbackExportAPIView.as_view(), name='admin-feedback-export'),
+    path('admin/feedback-analytics/', AdminFeedbackAnalyticsAPIView.as_view(), name='admin-feedback-analytics'),
+    path('admin/feedback-search/', AdminFeedbackSearchAPIView.as_view(), name='admin-feedback-search'),
+    path('admin/feedback-trends/', AdminFeedbackTrendAPIView.as_view(), name='admin-feedback-trends'),
+    path('admin/jobs/', AdminBackgroundJobListCreateAPIView.as_view(), name='admin-job-list'),
+    path('admin/jobs/<int:pk>/', AdminBackgroundJobDetailAPIView.as_view(), name='admin-job-detail'),
+    path('admin/jobs/<int:pk>/download/', AdminBackgroundJobDownloadAPIView.as_view(), name='admin-job-download'),
+    path('admin/archives/', AdminFeedbackArchiveListAPIView.as_view(), name='admin-archive-list'),
+    path('admin/archives/query/', AdminFeedbackArchiveQueryAPIView.as_view(), name='admin-archive-query'),
+    path('admin/feedback-changes/', AdminFeedbackChangeFeedAPIView.as_view(), name='admin-feedback-changes'),
+
+    # Prometheus scrape target and slow-query log
+    path('metrics', metrics_view, name='metrics'),
+    path('metrics/slow-queries', slow_queries_view, name='metrics-slow-queries'),
 ]
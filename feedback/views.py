@@ -1,36 +1,68 @@
 from django.shortcuts import render
+import hmac
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.contrib.auth.models import User, update_last_login
+from django.contrib.auth.models import User
 from django.db import IntegrityError
 from django.db.models import Q
-from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from uuid import uuid4
 from django.utils import timezone
 
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
-from .models import Designation, Employee, FeedbackQuestion, FeedbackSubmission
+from .models import BackgroundJob, Designation, FeedbackArchive, Employee, FeedbackSubmission
 from .serializers import (
     UserRegisterSerializer,
     DesignationSerializer,
     EmployeeSerializer,
     FeedbackQuestionSerializer,
     FeedbackSubmissionSerializer,
-    FeedbackFilterSerializer
+    FeedbackFilterSerializer,
+    FeedbackExportSerializer,
+    FeedbackAnalyticsSerializer,
+    FeedbackSearchSerializer,
+    FeedbackBatchSubmissionSerializer,
+    BackgroundJobSerializer,
+    BackgroundJobCreateSerializer,
+    FeedbackArchiveSerializer,
+    FeedbackArchiveQuerySerializer,
+    FeedbackTrendSerializer,
+    FeedbackChangeFeedSerializer
 )
+from .analytics import build_scorecard
+from .archive import open_archive, start_of_day
+from .authentication import last_login_buffer
+from .catalogue import DESIGNATIONS, EMPLOYEES, QUESTIONS, active_questions
+from .changes import CursorExpired, InvalidCursor, head_cursor, read_changes
+from .conditional import CatalogueETagMixin
+from .listings import build_submission_listing, listing_rows
+from .search import count_matches, phrase_query, search_answers
+from .trends import build_trend
+from .submissions import create_submissions
+from .exports import EXPORT_FORMATS
+from .jobs import enqueue_job, results_dir, uploads_dir
+from .metrics import registry as metrics_registry
+from .routers import reporting_alias, use_reporting_database
+from .filters import filter_feedback_submissions
+from .pagination import SubmissionCursorPagination
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
-        # Update last_login every time user logs in
-        update_last_login(None, self.user)
+        # Update last_login every time user logs in (written in batches)
+        last_login_buffer.record(self.user)
         return data
 
 
@@ -59,16 +91,20 @@ class RegisterView(generics.CreateAPIView):
             except IntegrityError:
                 pass
 # Feedback Questions
-class FeedbackQuestionListAPIView(generics.ListAPIView):
+class FeedbackQuestionListAPIView(CatalogueETagMixin, generics.ListAPIView):
     serializer_class = FeedbackQuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    catalogue_name = QUESTIONS
+
+    def get_feedback_type(self):
+        return self.request.query_params.get('type') or self.request.query_params.get('feedback_type') or None
+
+    def get_catalogue_variant(self):
+        return self.get_feedback_type() or ''
 
     def get_queryset(self):
-        qs = FeedbackQuestion.objects.filter(is_active=True)
-        ftype = self.request.query_params.get('type') or self.request.query_params.get('feedback_type')
-        if ftype:
-            qs = qs.filter(feedback_type=ftype)
-        return qs
+        # Served from the process-local catalogue cache, not the database.
+        return active_questions(self.get_feedback_type())
 
 
 # Submit Feedback
@@ -82,10 +118,50 @@ class SubmitFeedbackAPIView(generics.CreateAPIView):
         return ctx
 
 
+class SubmitFeedbackBatchAPIView(APIView):
+    """
+    Submit feedback for many targets at once. Valid items are written in a
+    single transaction; invalid ones are reported by index. With
+    `atomic: true`, any invalid item rejects the whole batch.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Submit several feedback submissions in one request.",
+        request_body=FeedbackBatchSubmissionSerializer,
+    )
+    def post(self, request):
+        if not hasattr(request.user, 'employee_profile'):
+            return Response(
+                {'detail': "Submitting user must have an Employee profile."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = FeedbackBatchSubmissionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entries, errors = serializer.validate_items()
+        error_list = [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
+
+        if errors and (serializer.validated_data['atomic'] or not entries):
+            return Response({'created': [], 'errors': error_list}, status=status.HTTP_400_BAD_REQUEST)
+
+        indexes = sorted(entries)
+        submissions = create_submissions(
+            request.user.employee_profile, [entries[index] for index in indexes]
+        )
+        created = [
+            {'index': index, 'id': submission.id, 'created_at': submission.created_at}
+            for index, submission in zip(indexes, submissions)
+        ]
+        response_status = status.HTTP_207_MULTI_STATUS if errors else status.HTTP_201_CREATED
+        return Response({'created': created, 'errors': error_list}, status=response_status)
+
+
 # View Feedbacks
 class EmployeeFeedbackListAPIView(generics.ListAPIView):
     serializer_class = FeedbackSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SubmissionCursorPagination
 
     def get_queryset(self):
         employee_id = self.request.query_params.get('employee_id')
@@ -98,26 +174,41 @@ class EmployeeFeedbackListAPIView(generics.ListAPIView):
             ).order_by('-created_at')
 
         return FeedbackSubmission.objects.none()
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(listing_rows(self.get_queryset()))
+        return self.get_paginated_response(build_submission_listing(page))
 # Admin Feedback Filter
 
 
 
 class AdminFeedbackFilterAPIView(APIView):
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = SubmissionCursorPagination
 
     @swagger_auto_schema(
-        operation_description="Filter feedback submissions by designation, department, and date range.",
+        operation_description=(
+            "Filter feedback submissions by designation, department, date range and rating. "
+            "Results are cursor-paginated; pass the `cursor` and `page_size` query "
+            "parameters from the previous response's next/previous links."
+        ),
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
                 "designation": openapi.Schema(
                     type=openapi.TYPE_STRING,
-                    description="Select designation (ID or name)",
-                    enum=[d.name for d in Designation.objects.all()]  # dropdown
+                    # No enum here: querying Designation at import time breaks
+                    # URLconf loading under ASGI and before migrations exist.
+                    description="Designation ID, or name (see /api/designations/)"
                 ),
                 "department": openapi.Schema(
                     type=openapi.TYPE_STRING,
-                    description="Enter department name"
+                    description="Department name"
+                ),
+                "match": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    enum=['prefix', 'exact'],
+                    description="Case-insensitive prefix (default) or exact match for designation names and departments"
                 ),
                 "start_date": openapi.Schema(
                     type=openapi.TYPE_STRING,
@@ -129,54 +220,290 @@ class AdminFeedbackFilterAPIView(APIView):
                     format=openapi.FORMAT_DATE,
                     description="Filter feedbacks created before this date (YYYY-MM-DD)"
                 ),
+                "max_average_rating": openapi.Schema(
+                    type=openapi.TYPE_NUMBER,
+                    description="Only submissions whose average rating is at most this value"
+                ),
+                "max_rating": openapi.Schema(
+                    type=openapi.TYPE_INTEGER,
+                    description="Only submissions with at least one answer rated at most this value"
+                ),
             },
             required=[],
         ),
         responses={200: FeedbackSubmissionSerializer(many=True)}
     )
+    @use_reporting_database
     def post(self, request):
-        designation = request.data.get('designation')
-        department = request.data.get('department')
-        start_date = request.data.get('start_date')
-        end_date = request.data.get('end_date')
-
-        qs = FeedbackSubmission.objects.all().select_related(
-            'submitted_by__designation', 'target_employee__designation'
-        ).prefetch_related('answers', 'answers__question')
-
-        
-        if designation:
-            if str(designation).isdigit():
-                qs = qs.filter(submitted_by__designation__id=int(designation))
-            else:
-                qs = qs.filter(submitted_by__designation__name__icontains=designation)
-
-       
-        if department:
-            qs = qs.filter(submitted_by__department__icontains=department)
-
-        
-        if start_date:
-            try:
-                sd = datetime.fromisoformat(start_date)
-                sd = timezone.make_aware(sd)
-                qs = qs.filter(created_at__gte=sd)
-            except ValueError:
-                pass
+        qs = filter_feedback_submissions(FeedbackSubmission.objects.all(), request.data)
 
-        if end_date:
-            try:
-                ed = datetime.fromisoformat(end_date)
-                ed = timezone.make_aware(ed)
-                qs = qs.filter(created_at__lte=ed)
-            except ValueError:
-                pass
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(listing_rows(qs), request, view=self)
+        return paginator.get_paginated_response(build_submission_listing(page))
+
+
+class AdminFeedbackExportAPIView(APIView):
+    """
+    Stream every submission matching the admin filters as NDJSON or CSV.
+    Rows are read in chunks and written as they are produced, so the export
+    starts immediately and memory stays flat regardless of size.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Export filtered feedback submissions with their answers as NDJSON or CSV.",
+        request_body=FeedbackExportSerializer,
+        responses={200: 'Streamed NDJSON or CSV file'}
+    )
+    @use_reporting_database
+    def post(self, request):
+        serializer = FeedbackExportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        export_format = serializer.validated_data['export_format']
+
+        # Pin the alias now: the body is streamed after this handler returns,
+        # outside the reporting routing context.
+        qs = filter_feedback_submissions(FeedbackSubmission.objects.using(reporting_alias()), request.data)
+        render_rows, content_type, extension = EXPORT_FORMATS[export_format]
+
+        response = StreamingHttpResponse(render_rows(qs), content_type=content_type)
+        stamp = timezone.now().strftime('%Y%m%d%H%M%S')
+        response['Content-Disposition'] = f'attachment; filename="feedback-{stamp}.{extension}"'
+        return response
+
+class AdminFeedbackAnalyticsAPIView(APIView):
+    """
+    Rating scorecards (mean, median, std dev, percentiles, histogram) grouped
+    by target employee, designation, department or question.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Rating statistics grouped by target employee, designation, department or question. "
+            "Accepts the same filters as the admin feedback filter. Archived feedback is not included."
+        ),
+        request_body=FeedbackAnalyticsSerializer,
+    )
+    @use_reporting_database
+    def post(self, request):
+        serializer = FeedbackAnalyticsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        scorecard = build_scorecard(serializer.validated_data['group_by'], request.data)
+        return Response(scorecard, status=status.HTTP_200_OK)
+
+class AdminFeedbackSearchAPIView(APIView):
+    """
+    Full-text search over answer comments, ranked by relevance.
+    `q` uses FTS5 query syntax ("quoted phrases", AND/OR/NOT, prefix*);
+    set `phrase` to match the text literally as one phrase. `count` is the
+    total number of matches; page through them with `limit` and `offset`.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Search feedback comments. Accepts the same filters as the admin feedback filter.",
+        request_body=FeedbackSearchSerializer,
+    )
+    @use_reporting_database
+    def post(self, request):
+        serializer = FeedbackSearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        query = phrase_query(data['q']) if data['phrase'] else data['q']
+        results = search_answers(query, request.data, limit=data['limit'], offset=data['offset'])
+        count = count_matches(query, request.data)
+        return Response({'count': count, 'results': results}, status=status.HTTP_200_OK)
+
+class AdminBackgroundJobListCreateAPIView(APIView):
+    """
+    Queue heavy work (exports, rollup rebuilds, employee imports) for
+    `manage.py run_workers` and list recent jobs.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="List the 50 most recent background jobs.",
+        responses={200: BackgroundJobSerializer(many=True)}
+    )
+    def get(self, request):
+        jobs = BackgroundJob.objects.order_by('-id')[:50]
+        return Response(BackgroundJobSerializer(jobs, many=True, context={'request': request}).data)
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Queue a background job. Exports take the admin filters and `export_format` in `params`; "
+            "imports upload `file` (CSV or JSONL) as multipart form data. Poll the returned job for progress."
+        ),
+        request_body=BackgroundJobCreateSerializer,
+        responses={202: BackgroundJobSerializer}
+    )
+    def post(self, request):
+        serializer = BackgroundJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        params = data['params']
+
+        if data['kind'] == BackgroundJob.KIND_IMPORT_EMPLOYEES:
+            upload = data['file']
+            name = f"{uuid4().hex}{Path(upload.name).suffix.lower()}"
+            with open(uploads_dir() / name, 'wb') as handle:
+                for chunk in upload.chunks():
+                    handle.write(chunk)
+            params['upload'] = name
+
+        job = enqueue_job(data['kind'], params, created_by=request.user)
+        return Response(BackgroundJobSerializer(job, context={'request': request}).data, status=status.HTTP_202_ACCEPTED)
+
+
+class AdminBackgroundJobDetailAPIView(generics.RetrieveAPIView):
+    permission_classes = [permissions.IsAdminUser]
+    queryset = BackgroundJob.objects.all()
+    serializer_class = BackgroundJobSerializer
+
+
+class AdminBackgroundJobDownloadAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(operation_description="Download the result file of a finished job.")
+    def get(self, request, pk):
+        job = BackgroundJob.objects.filter(pk=pk).first()
+        if job is None or job.status != BackgroundJob.STATUS_SUCCEEDED or not job.result_file:
+            raise NotFound("No result is available for this job.")
+        path = results_dir() / job.result_file
+        if not path.exists():
+            raise NotFound("The result file has been removed.")
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=job.result_file)
+
+class AdminFeedbackTrendAPIView(APIView):
+    """
+    Rating trends for the feedback received by one or more employees:
+    per-period mean, spread, moving average and change, per question and
+    overall. Read from the rating rollups, so archived periods are included.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Weekly, monthly or quarterly rating series per question for the selected target employees.",
+        request_body=FeedbackTrendSerializer,
+    )
+    @use_reporting_database
+    def post(self, request):
+        serializer = FeedbackTrendSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(build_trend(serializer.validated_data), status=status.HTTP_200_OK)
+
+
+class AdminFeedbackArchiveListAPIView(generics.ListAPIView):
+    """Archives created by `manage.py archive_feedback`, oldest first."""
+    permission_classes = [permissions.IsAdminUser]
+    queryset = FeedbackArchive.objects.order_by('before')
+    serializer_class = FeedbackArchiveSerializer
+
+
+class AdminFeedbackArchiveQueryAPIView(APIView):
+    """
+    Read archived submissions straight from the memory-mapped archive files.
+    Archives cover consecutive periods, so results come back in created_at
+    order; page with `offset` until `next_offset` is null.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Query archived feedback by date range, employee and question.",
+        request_body=FeedbackArchiveQuerySerializer,
+    )
+    def post(self, request):
+        serializer = FeedbackArchiveQuerySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        start = start_of_day(data['start_date']) if data.get('start_date') else None
+        end = start_of_day(data['end_date'] + timedelta(days=1)) if data.get('end_date') else None
+
+        archives = FeedbackArchive.objects.filter(state__in=FeedbackArchive.READABLE_STATES).order_by('before')
+        if start:
+            archives = archives.filter(last_created_at__gte=start)
+        if end:
+            archives = archives.filter(first_created_at__lt=end)
+
+        wanted = data['offset'] + data['limit'] + 1
+        results = []
+        for archive in archives:
+            for submission in open_archive(archive.label).iter_submissions(
+                start, end,
+                submitted_by=data.get('submitted_by_id'),
+                target_employee=data.get('target_employee_id'),
+                question=data.get('question_id'),
+            ):
+                submission['archive'] = archive.label
+                results.append(submission)
+                if len(results) >= wanted:
+                    break
+            if len(results) >= wanted:
+                break
+
+        page = results[data['offset']:data['offset'] + data['limit']]
+        has_more = len(results) > data['offset'] + data['limit']
+        return Response({
+            'next_offset': data['offset'] + data['limit'] if has_more else None,
+            'results': page,
+        }, status=status.HTTP_200_OK)
+
+class AdminFeedbackChangeFeedAPIView(APIView):
+    """
+    Submission and answer creations, updates and deletions after a cursor, oldest
+    first, for incremental syncs. Keep calling with `next_cursor` until
+    `has_more` is false; answers 410 once the cursor's changes are pruned.
+    """
+    permission_classes = [permissions.IsAdminUser]
 
-        serializer = FeedbackSubmissionSerializer(qs.order_by('-created_at'), many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    @swagger_auto_schema(
+        operation_description="Changes to feedback submissions and answers after an opaque cursor.",
+        query_serializer=FeedbackChangeFeedSerializer,
+    )
+    @use_reporting_database
+    def get(self, request):
+        serializer = FeedbackChangeFeedSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if data['latest']:
+            return Response({'results': [], 'next_cursor': head_cursor(), 'has_more': False})
+
+        try:
+            results, next_cursor, has_more = read_changes(data.get('cursor'), data['limit'])
+        except InvalidCursor as exc:
+            return Response({'cursor': [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+        except CursorExpired as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_410_GONE)
+        return Response({'results': results, 'next_cursor': next_cursor, 'has_more': has_more})
+
+# Metrics
+
+def _metrics_allowed(request):
+    """Bearer FEEDBACK_METRICS_TOKEN if one is configured, otherwise loopback clients only."""
+    token = settings.FEEDBACK_METRICS_TOKEN
+    if token:
+        header = request.headers.get('Authorization', '')
+        return hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+    return request.META.get('REMOTE_ADDR') in ('127.0.0.1', '::1')
+
+
+def metrics_view(request):
+    """Per-view latency, query and response-size metrics in Prometheus text format."""
+    if not _metrics_allowed(request):
+        return HttpResponse(status=403)
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def slow_queries_view(request):
+    """The most recent slow queries with their SQL and calling view, newest first."""
+    if not _metrics_allowed(request):
+        return JsonResponse({'detail': 'Forbidden'}, status=403)
+    return JsonResponse({'results': list(reversed(metrics_registry.slow_query_log))})
 
 # Designation API
-class DesignationListCreateAPIView(generics.ListCreateAPIView):
+class DesignationListCreateAPIView(CatalogueETagMixin, generics.ListCreateAPIView):
     """
     API to list all designations or create a new one.
     Only authenticated users can view.
@@ -185,13 +512,15 @@ class DesignationListCreateAPIView(generics.ListCreateAPIView):
     queryset = Designation.objects.all().order_by('id')
     serializer_class = DesignationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    catalogue_name = DESIGNATIONS
 
     def perform_create(self, serializer):
         if not self.request.user.is_staff:
             raise PermissionDenied("Only admin users can add designations.")
         serializer.save() 
-class EmployeeListAPIView(generics.ListAPIView):
-    queryset = Employee.objects.all()
+class EmployeeListAPIView(CatalogueETagMixin, generics.ListAPIView):
+    queryset = Employee.objects.select_related('user', 'designation').order_by('id')
     serializer_class = EmployeeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    catalogue_name = EMPLOYEES
     
\ No newline at end of file
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,7 +46,7 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'feedback.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -67,6 +68,7 @@ SWAGGER_SETTINGS = {
 
 
 MIDDLEWARE = [
+    'feedback.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -106,6 +108,42 @@ DATABASES = {
     }
 }
 
+# Production SQLite profile (FEEDBACK_DB_PROFILE=production):
+# - WAL journal so readers and the writer do not block each other, a busy
+#   timeout instead of immediate "database is locked" errors, NORMAL fsync and
+#   a memory-mapped read path, applied to every connection.
+# - Write transactions start IMMEDIATE so they queue on the busy timeout
+#   rather than failing when upgrading from a read lock.
+# - A read-only 'reporting' connection used by heavy admin endpoints (see
+#   feedback.routers). It opens the live database read-only by default, or a
+#   snapshot file given in FEEDBACK_REPORTING_DB.
+FEEDBACK_DB_PROFILE = os.environ.get('FEEDBACK_DB_PROFILE', 'development')
+
+if FEEDBACK_DB_PROFILE == 'production':
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT = 20
+
+    DATABASES['default']['OPTIONS'] = {
+        'timeout': SQLITE_BUSY_TIMEOUT,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            f'PRAGMA mmap_size={SQLITE_MMAP_SIZE};'
+        ),
+    }
+    reporting_db = os.environ.get('FEEDBACK_REPORTING_DB') or DATABASES['default']['NAME']
+    DATABASES['reporting'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{reporting_db}?mode=ro',
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'init_command': f'PRAGMA query_only=1;PRAGMA mmap_size={SQLITE_MMAP_SIZE};',
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['feedback.routers.ReportingRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -147,3 +185,24 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Where background jobs (feedback.jobs) write their result files and where
+# uploaded import files wait for a worker.
+FEEDBACK_JOB_RESULTS_DIR = Path(os.environ.get('FEEDBACK_JOB_RESULTS_DIR', BASE_DIR / 'job_results'))
+
+# Columnar archives written by `manage.py archive_feedback` (feedback.archive).
+FEEDBACK_ARCHIVE_DIR = Path(os.environ.get('FEEDBACK_ARCHIVE_DIR', BASE_DIR / 'archive'))
+
+# Request metrics (feedback.metrics), served at /api/metrics. Without a token
+# only loopback clients may scrape.
+FEEDBACK_METRICS_TOKEN = os.environ.get('FEEDBACK_METRICS_TOKEN', '')
+FEEDBACK_SLOW_QUERY_SECONDS = float(os.environ.get('FEEDBACK_SLOW_QUERY_SECONDS', '0.2'))
+
+# Change feed entries older than this are removed by prune_change_log.
+FEEDBACK_CHANGE_LOG_RETENTION_DAYS = int(os.environ.get('FEEDBACK_CHANGE_LOG_RETENTION_DAYS', '30'))
+
+# Live submission streams (feedback.live): change log poll interval,
+# keepalive interval and events buffered per client before it gets a gap.
+FEEDBACK_LIVE_POLL_SECONDS = float(os.environ.get('FEEDBACK_LIVE_POLL_SECONDS', '1.0'))
+FEEDBACK_LIVE_HEARTBEAT_SECONDS = float(os.environ.get('FEEDBACK_LIVE_HEARTBEAT_SECONDS', '15'))
+FEEDBACK_LIVE_BUFFER = int(os.environ.get('FEEDBACK_LIVE_BUFFER', '100'))